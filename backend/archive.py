@@ -0,0 +1,109 @@
+# backend/archive.py
+# Hot/cold split for finished events. Storage.archive_events() moves events
+# that started more than ARCHIVE_AFTER_DAYS ago, together with their
+# registrations, attendance and feedback, into *_archive tables in the same
+# database and deletes them from the hot tables, a batch of events per
+# transaction (migrations/0011_event_archive.py has the tables, schema_pg.sql
+# their PostgreSQL versions). Listings, check-in and the default reports then
+# only touch current events; a student's GET /registrations history still
+# includes archived registrations.
+# event_archive keeps the final counters plus the report aggregates
+# (registrations, presents) frozen at archive time, so /reports/*?archived=1
+# can add archived events without scanning their rows.
+#
+#   python archive.py --db events.db                  # archive events older than 30 days
+#   python archive.py --db postgresql://... --days 90 --dry-run
+import argparse
+import datetime
+import os
+import time
+
+import reports
+
+ARCHIVE_AFTER_DAYS = 30
+BATCH_EVENTS = 200
+
+EVENT_COLS = ("event_id", "title", "type", "description", "starts_at", "starts_at_ts", "capacity", "college_id",
+              "cancelled_flag", "features", "created_at", "registered_count", "present_count", "feedback_count",
+              "rating_count", "rating_sum")
+# hot table -> columns copied to <table>_archive
+CHILD_COLS = {
+    "registration": ("reg_id", "event_id", "student_id", "registered_at", "token", "status"),
+    "attendance": ("att_id", "event_id", "student_id", "attended_at", "present"),
+    "feedback": ("fb_id", "event_id", "student_id", "rating", "comment", "submitted_at"),
+}
+
+# archived report rows, in the shape of the live reports; CAST(... AS DOUBLE
+# PRECISION) is a REAL on SQLite and a float8 on PostgreSQL
+ARCHIVED_REPORT_SQL = {
+    "registrations": """
+      SELECT event_id, title, type, registered_count AS registrations FROM event_archive e {where}""",
+    "attendance_percentage": """
+      SELECT event_id, title, registrations, presents,
+             CAST(ROUND(100.0 * presents / NULLIF(registrations, 0), 1) AS DOUBLE PRECISION) AS attendance_pct
+      FROM event_archive e {where}""",
+    "avg_feedback": """
+      SELECT event_id, title,
+             CAST(ROUND(1.0 * rating_sum / NULLIF(rating_count, 0), 2) AS DOUBLE PRECISION) AS avg_rating,
+             feedback_count
+      FROM event_archive e {where}""",
+}
+ARCHIVED_STUDENTS_SQL = """
+SELECT lower(student_id) AS student_key, COUNT(*) AS attended_events
+FROM attendance_archive
+WHERE present = 1
+GROUP BY lower(student_id)
+"""
+# report -> the column it is ordered by (descending, NULLs last)
+REPORT_ORDER = {"registrations": "registrations", "attendance_percentage": "attendance_pct",
+                "avg_feedback": "avg_rating", "top-active-students": "attended_events"}
+
+
+def archive_batch(cur, event_ids, now):
+    """Copy event_ids and their rows to the archive tables and delete them, in the caller's transaction."""
+    marks = ",".join("?" * len(event_ids))
+    ids = tuple(event_ids)
+    cur.execute(f"""
+        INSERT INTO event_archive ({", ".join(EVENT_COLS)}, registrations, presents, archived_at)
+        SELECT {", ".join("e." + c for c in EVENT_COLS)}, x.registrations, x.presents, ?
+        FROM event e JOIN ({reports.EVENT_AGG_SQL} WHERE e.event_id IN ({marks})) x ON x.event_id = e.event_id
+    """, (now,) + ids)
+    moved = {"event": cur.rowcount}
+    for table, cols in CHILD_COLS.items():
+        cur.execute(f"INSERT INTO {table}_archive ({', '.join(cols)}) "
+                    f"SELECT {', '.join(cols)} FROM {table} WHERE event_id IN ({marks})", ids)
+        moved[table] = cur.rowcount
+        cur.execute(f"DELETE FROM {table} WHERE event_id IN ({marks})", ids)
+    # no gate syncs an archived event: drop the delta-sync rows its deletes just logged
+    cur.execute(f"DELETE FROM attendance_change WHERE event_id IN ({marks})", ids)
+    cur.execute(f"DELETE FROM event WHERE event_id IN ({marks})", ids)
+    return moved
+
+
+def sort_report(name, rows):
+    key = REPORT_ORDER[name]
+    return sorted(rows, key=lambda r: (r[key] is None, -(r[key] or 0)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move finished events into the archive tables")
+    parser.add_argument("--db", default=os.environ.get("DATABASE_URL") or os.environ.get("DB_NAME", "events.db"),
+                        help="SQLite path or postgresql:// URL")
+    parser.add_argument("--days", type=float, default=ARCHIVE_AFTER_DAYS,
+                        help="archive events that started more than this many days ago")
+    parser.add_argument("--batch", type=int, default=BATCH_EVENTS, help="events per transaction")
+    parser.add_argument("--dry-run", action="store_true", help="only count the events that are due")
+    args = parser.parse_args()
+
+    from storage import open_storage
+    store = open_storage(args.db, max_size=1)
+    store.migrate()
+    cutoff = int(time.time() - args.days * 86400)
+    print(f"cutoff: events starting before {datetime.datetime.utcfromtimestamp(cutoff).isoformat()}Z")
+    if args.dry_run:
+        print(f"{store.count_archivable(cutoff)} event(s) due")
+    else:
+        t0 = time.perf_counter()
+        totals = store.archive_events(cutoff, batch=args.batch)
+        print(f"archived {totals} in {time.perf_counter() - t0:.1f}s")
+    store.close()
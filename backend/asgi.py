@@ -0,0 +1,113 @@
+# backend/asgi.py
+# ASGI entry point for uvicorn / hypercorn (or gunicorn with uvicorn's worker):
+#
+#   uvicorn asgi:application --workers 4
+#   gunicorn -k uvicorn.workers.UvicornWorker -c gunicorn.conf.py asgi:application
+#
+# The Flask app stays synchronous. WsgiToAsgi runs each request on a worker
+# thread of its own (ThreadSensitiveContext; asgiref would otherwise run every
+# request on one shared thread), so the event loop never blocks on the
+# database. The live endpoints are served here directly instead: a waiting
+# SSE or long-poll client is a future on the event loop
+# (LiveBroker.wait_async), not a parked thread. Their headers still come from
+# the Flask app's after_request hooks (CORS), but they are not counted in
+# /metrics. asgiref and uvicorn are in reqirements.txt.
+import asyncio
+from urllib.parse import parse_qs
+
+from asgiref.sync import ThreadSensitiveContext
+from asgiref.wsgi import WsgiToAsgi
+
+import wire
+from app import create_app
+from live import parse_event_ids, sse_message
+
+flask_app = create_app()
+wsgi_application = WsgiToAsgi(flask_app)
+
+
+def response_start(scope, status, content_type, headers=()):
+    """http.response.start with the headers the Flask app adds to every response."""
+    request_headers = [(k.decode("latin-1"), v.decode("latin-1")) for k, v in scope["headers"]]
+    with flask_app.test_request_context(scope["path"], query_string=scope["query_string"].decode("latin-1"),
+                                        headers=request_headers):
+        resp = flask_app.process_response(flask_app.response_class(status=status, content_type=content_type,
+                                                                   headers=list(headers)))
+    return {"type": "http.response.start", "status": status,
+            "headers": [(k.lower().encode("latin-1"), v.encode("latin-1"))
+                        for k, v in resp.headers.items() if k.lower() != "content-length"]}
+
+
+async def send_json(scope, send, status, obj):
+    body = wire.dumps(obj)
+    start = response_start(scope, status, "application/json")
+    start["headers"].append((b"content-length", str(len(body)).encode()))
+    await send(start)
+    await send({"type": "http.response.body", "body": body})
+
+
+async def live_events(scope, send, broker, event_ids, heartbeat):
+    await send(response_start(scope, 200, "text/event-stream",
+                              {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}.items()))
+    cursor, rows = broker.snapshot(event_ids)
+    await send({"type": "http.response.body", "body": sse_message("snapshot", cursor, {"events": rows}),
+                "more_body": True})
+    while True:
+        cursor, deltas = await broker.wait_async(cursor, event_ids, timeout=heartbeat)
+        # heartbeat comments keep proxies from idling the stream out
+        body = sse_message("delta", cursor, {"events": deltas}) if deltas else b": ping\n\n"
+        await send({"type": "http.response.body", "body": body, "more_body": True})
+
+
+async def live_events_poll(scope, send, broker, event_ids, args):
+    try:
+        timeout = min(max(float(args.get("timeout", ["25"])[0]), 0.0), 55.0)
+    except ValueError:
+        return await send_json(scope, send, 400, {"error": "timeout must be a number"})
+    since = broker.parse_since(args.get("since", [""])[0])
+    if since is None:
+        # first poll, or a cursor from another worker / before a restart
+        cursor, rows = broker.snapshot(event_ids)
+        return await send_json(scope, send, 200, {"since": broker.since_token(cursor), "snapshot": True,
+                                                  "events": rows})
+    cursor, rows = await broker.wait_async(since, event_ids, timeout=timeout)
+    await send_json(scope, send, 200, {"since": broker.since_token(cursor), "events": rows})
+
+
+async def disconnected(receive):
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+async def live(scope, receive, send):
+    services = flask_app.extensions["campus"]
+    broker = services.live_broker
+    args = parse_qs(scope["query_string"].decode("latin-1"))
+    event_ids = parse_event_ids(args.get("event_id", []))
+    if scope["path"] == "/live/events":
+        handler = live_events(scope, send, broker, event_ids, services.settings["LIVE_HEARTBEAT_S"])
+    else:
+        handler = live_events_poll(scope, send, broker, event_ids, args)
+    # the first subscriber starts the broker, which reads every event
+    await asyncio.to_thread(broker.subscribe)
+    task = asyncio.ensure_future(handler)
+    gone = asyncio.ensure_future(disconnected(receive))
+    try:
+        await asyncio.wait((task, gone), return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        task.cancel()
+        gone.cancel()
+        broker.unsubscribe()
+    if task.done() and not task.cancelled():
+        task.result()  # re-raise a handler error
+
+
+LIVE_PATHS = ("/live/events", "/live/events/poll")
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "http" and scope["method"] == "GET" and scope["path"] in LIVE_PATHS:
+        await live(scope, receive, send)
+        return
+    async with ThreadSensitiveContext():
+        await wsgi_application(scope, receive, send)
@@ -0,0 +1,261 @@
+# backend/attendance.py
+# Set-based attendance ingestion for gate scanners: a whole batch of
+# registration tokens and/or student ids is resolved with one query each and
+# upserted in a single transaction.
+import datetime
+import json
+
+MAX_BATCH = 10000
+MAX_CHANGES = 5000
+
+UPSERT_SQL = """
+    INSERT INTO attendance (event_id, student_id, attended_at, present)
+    VALUES (?, ?, ?, 1)
+    ON CONFLICT(event_id, student_id) DO UPDATE SET
+        attended_at = excluded.attended_at,
+        present = 1
+"""
+
+# "IN (one bound JSON array)": a whole batch goes in as a single parameter
+JSON_LIST_SQL = {
+    "sqlite": "SELECT value FROM json_each(?)",
+    "postgres": "SELECT value FROM json_array_elements_text(CAST(? AS json))",
+}
+JSON_PAIRS_SQL = {
+    "sqlite": "SELECT json_extract(value, '$[0]'), json_extract(value, '$[1]') FROM json_each(?)",
+    "postgres": "SELECT value->>0, value->>1 FROM json_array_elements(CAST(? AS json))",
+}
+
+def _begin(cur, dialect):
+    # SQLite: take the write lock up front. PostgreSQL opens the transaction
+    # implicitly and the upsert's unique index settles concurrent gates.
+    if dialect == "sqlite":
+        cur.execute("BEGIN IMMEDIATE")
+
+
+def _ingest(cur, items, now, dialect="sqlite", resolved=None):
+    """
+    Resolve and upsert items in the caller's transaction. Each item is a dict
+    with either "token" or "event_id" + "student_id", and optionally "at"
+    (client scan time). Sets item["status"] (and event_id/student_id when
+    resolved) in place. Returns the set of event_ids that got new check-ins.
+    resolved maps tokens already settled by the gate roster (gate.py) to
+    (event_id, student_id), or None when invalid.
+    """
+    # 1) resolve the remaining tokens in one query
+    by_token = dict(resolved or {})
+    tokens = list({it["token"] for it in items
+                   if isinstance(it.get("token"), str) and it["token"] and it["token"] not in by_token})
+    if tokens:
+        cur.execute("""
+            SELECT token, event_id, student_id FROM registration
+            WHERE status = 'registered' AND token IN (%s)
+        """ % JSON_LIST_SQL[dialect], (json.dumps(tokens),))
+        for r in cur.fetchall():
+            by_token[r[0]] = (r[1], (r[2] or "").strip().lower())
+
+    # 2) check every referenced event exists, in one query
+    event_ids = list({it["event_id"] for it in items if "token" not in it and isinstance(it.get("event_id"), str)})
+    events = set()
+    if event_ids:
+        cur.execute("SELECT event_id FROM event WHERE event_id IN (%s)" % JSON_LIST_SQL[dialect], (json.dumps(event_ids),))
+        events = {r[0] for r in cur.fetchall()}
+
+    pairs = []
+    for it in items:
+        if "token" in it:
+            pair = by_token.get(it["token"]) if isinstance(it["token"], str) else None
+        else:
+            sid = it.get("student_id")
+            sid = sid.strip().lower() if isinstance(sid, str) else ""
+            pair = (it.get("event_id"), sid) if sid and it.get("event_id") in events else None
+        pairs.append(pair)
+
+    # 3) which pairs are already present, in one query
+    uniq = list({p for p in pairs if p})
+    present = set()
+    if uniq:
+        cur.execute("""
+            SELECT event_id, student_id FROM attendance
+            WHERE present = 1 AND (event_id, student_id) IN (%s)
+        """ % JSON_PAIRS_SQL[dialect], (json.dumps(uniq),))
+        present = {(r[0], r[1]) for r in cur.fetchall()}
+
+    # 4) upsert everything new with one executemany
+    to_mark = []
+    seen = set()
+    for it, pair in zip(items, pairs):
+        if pair is None:
+            it["status"] = "invalid"
+            continue
+        it["event_id"], it["student_id"] = pair
+        if pair in present or pair in seen:
+            it["status"] = "duplicate"
+        else:
+            it["status"] = "marked"
+            seen.add(pair)
+            to_mark.append((pair[0], pair[1], it.get("at") or now))
+    if to_mark:
+        cur.executemany(UPSERT_SQL, to_mark)
+    return {p[0] for p in seen}
+
+
+def ingest_batch(conn, tokens=(), event_id=None, student_ids=(), now=None, dialect="sqlite", resolved=None):
+    """
+    Mark attendance for every scan in the batch.
+
+    tokens are registration tokens (any event); student_ids are checked in to
+    event_id. Returns (results, marked_event_ids) where results has one dict
+    per input item, in input order (tokens first), with status "marked",
+    "duplicate" (already present, or repeated in this batch) or "invalid".
+    """
+    now = now or datetime.datetime.utcnow().isoformat()
+    items = [{"token": t} for t in tokens] + [{"event_id": event_id, "student_id": s} for s in student_ids]
+    cur = conn.cursor()
+    _begin(cur, dialect)
+    try:
+        event_ids = _ingest(cur, items, now, dialect, resolved)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    for it in items[len(tokens):]:
+        # report manual ids under the caller's event_id even when invalid
+        it.setdefault("event_id", event_id)
+    return items, sorted(event_ids)
+
+
+def sync_scans(conn, scans, device_id=None, now=None, dialect="sqlite", resolved=None):
+    """
+    Apply a queue of offline scans exactly once. Each scan carries a client
+    generated "key"; keys already in scan_log (or repeated within the upload)
+    are answered with the original outcome plus "replay": true, without
+    touching attendance again. Returns (results, marked_event_ids).
+    """
+    now = now or datetime.datetime.utcnow().isoformat()
+    cur = conn.cursor()
+    _begin(cur, dialect)
+    try:
+        keys = [s.get("key") for s in scans if isinstance(s.get("key"), str)]
+        logged = {}
+        if keys:
+            cur.execute("SELECT scan_key, status, event_id, student_id FROM scan_log WHERE scan_key IN (%s)"
+                        % JSON_LIST_SQL[dialect], (json.dumps(keys),))
+            logged = {r[0]: {"status": r[1], "event_id": r[2], "student_id": r[3]} for r in cur.fetchall()}
+        order = []   # (kind, key) in input order
+        fresh = {}   # key -> item to ingest
+        for s in scans:
+            key = s.get("key")
+            if not isinstance(key, str) or not key:
+                order.append(("bad", key))
+            elif key in logged:
+                order.append(("logged", key))
+            else:
+                if key not in fresh:
+                    item = {"token": s["token"]} if s.get("token") else {"event_id": s.get("event_id"), "student_id": s.get("student_id")}
+                    item["at"] = _client_time(s.get("scanned_at"))
+                    fresh[key] = item
+                order.append(("fresh", key))
+        event_ids = _ingest(cur, list(fresh.values()), now, dialect, resolved)
+        # a key another node logged since the SELECT above keeps its first outcome
+        cur.executemany("""
+            INSERT INTO scan_log (scan_key, device_id, event_id, student_id, status, scanned_at, received_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (scan_key) DO NOTHING
+        """, [(key, device_id, it.get("event_id"), it.get("student_id"), it["status"], it.get("at"), now)
+              for key, it in fresh.items()])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    results, emitted = [], set()
+    for kind, key in order:
+        if kind == "bad":
+            results.append({"key": key, "status": "invalid"})
+        elif kind == "logged":
+            results.append(dict(logged[key], key=key, replay=True))
+        else:
+            it = fresh[key]
+            r = {"key": key, "status": it["status"], "event_id": it.get("event_id"), "student_id": it.get("student_id")}
+            if key in emitted:
+                r["replay"] = True
+            emitted.add(key)
+            results.append(r)
+    return results, sorted(event_ids)
+
+
+# current attendance of the pairs in the change log, oldest change first
+CHANGES_SQL = {
+    "sqlite": """
+        SELECT c.change_id AS seq, a.att_id, c.student_id, a.attended_at, COALESCE(a.present, 0) AS present
+        FROM attendance_change c
+        LEFT JOIN attendance a ON a.event_id = c.event_id AND a.student_id = c.student_id
+        WHERE c.event_id = ? AND c.change_id > ? ORDER BY c.change_id LIMIT ?
+    """,
+    "postgres": """
+        SELECT c.txid AS seq, a.att_id, c.student_id, a.attended_at, COALESCE(a.present, 0) AS present
+        FROM attendance_change c
+        LEFT JOIN attendance a ON a.event_id = c.event_id AND a.student_id = c.student_id
+        WHERE c.event_id = ? AND c.txid >= ? AND c.txid < ? ORDER BY c.txid, c.student_id LIMIT ?
+    """,
+}
+
+
+def changes_since(conn, event_id, since, limit=MAX_CHANGES, dialect="sqlite"):
+    """
+    Attendance of every student of event_id whose check-in was added, changed
+    or removed after cursor `since` (present 0 once removed). Returns
+    (rows, cursor). The cursor follows commit order: on SQLite writers are
+    serialized and change_id is the order they committed in; on PostgreSQL it
+    is a transaction id below which every transaction has finished, so a
+    transaction still in flight is returned on a later call, not skipped. A
+    cursor ahead of the log (another database, or from before a restore)
+    starts over from 0.
+    """
+    cur = conn.cursor()
+    if dialect == "postgres":
+        cur.execute("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint AS horizon")
+        horizon = cur.fetchone()["horizon"]
+        if since > horizon:
+            since = 0
+        cur.execute(CHANGES_SQL[dialect], (event_id, since, horizon, limit + 1))
+        rows = [dict(r) for r in cur.fetchall()]
+        cursor = horizon
+        if len(rows) > limit:
+            # stop at a transaction boundary: the last transaction's rows all go out now
+            cursor = rows[limit - 1]["seq"]
+            rows = [r for r in rows if r["seq"] < cursor]
+            cur.execute(CHANGES_SQL[dialect], (event_id, cursor, cursor + 1, None))
+            rows += [dict(r) for r in cur.fetchall()]
+            cursor += 1
+    else:
+        cur.execute("SELECT COALESCE(MAX(change_id), 0) AS newest FROM attendance_change")
+        if since > cur.fetchone()["newest"]:
+            since = 0
+        cur.execute(CHANGES_SQL[dialect], (event_id, since, limit))
+        rows = [dict(r) for r in cur.fetchall()]
+        cursor = rows[-1]["seq"] if rows else since
+    for r in rows:
+        del r["seq"]
+    return rows, cursor
+
+
+def summarize(results):
+    counts = {"marked": 0, "duplicate": 0, "invalid": 0}
+    for r in results:
+        counts[r["status"]] += 1
+    return counts
+
+
+def _client_time(value):
+    """Accept an ISO-8601 client timestamp (normalized to naive UTC), else None."""
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        ts = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return ts.isoformat()
+
@@ -0,0 +1,57 @@
+# bench_attendance.py
+# Gate check-in throughput: one POST /attendance/batch with N tokens vs
+# N single POST /attendance/token calls (the latter sampled and extrapolated).
+#
+#   python bench_attendance.py --scans 5000 --single-sample 500
+import argparse
+import os
+import secrets
+import sqlite3
+import tempfile
+import time
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--scans", type=int, default=5000)
+parser.add_argument("--single-sample", type=int, default=500)
+args = parser.parse_args()
+
+os.environ["DB_NAME"] = os.path.join(tempfile.mkdtemp(), "bench.db")
+
+import init_db  # noqa: E402
+init_db.run_script(os.environ["DB_NAME"], "schema.sql")
+
+from app import create_app  # noqa: E402
+
+app = create_app()
+
+total = args.scans + args.single_sample
+conn = sqlite3.connect(os.environ["DB_NAME"])
+conn.execute("INSERT INTO event (event_id,title,type,starts_at,college_id) VALUES ('gate','Gate','Fest','2030-01-01T10:00:00','c1')")
+tokens = [secrets.token_urlsafe(12) for _ in range(total)]
+conn.executemany("INSERT INTO registration (event_id,student_id,registered_at,token,status) VALUES ('gate',?,?,?,'registered')",
+                 [(f"s{i}", "2030-01-01T00:00:00", t) for i, t in enumerate(tokens)])
+conn.commit()
+conn.close()
+
+client = app.test_client()
+client.post("/auth/signup", json={"email": "gate@x", "password": "pw", "role": "admin"})
+
+batch, singles = tokens[:args.scans], tokens[args.scans:]
+
+t0 = time.perf_counter()
+res = client.post("/attendance/batch", json={"tokens": batch})
+batch_s = time.perf_counter() - t0
+assert res.status_code == 200, res.get_data(as_text=True)
+print(f"batch: {len(batch)} scans in {batch_s * 1000:.0f} ms -> {res.json['summary']}")
+
+t0 = time.perf_counter()
+res = client.post("/attendance/batch", json={"tokens": batch})
+print(f"replay of the same batch: {(time.perf_counter() - t0) * 1000:.0f} ms -> {res.json['summary']}")
+
+if singles:
+    t0 = time.perf_counter()
+    for t in singles:
+        client.post("/attendance/token", json={"token": t})
+    per_scan = (time.perf_counter() - t0) / len(singles)
+    print(f"single: {per_scan * 1000:.2f} ms/scan -> {per_scan * args.scans * 1000:.0f} ms for {args.scans} scans "
+          f"({per_scan * args.scans / batch_s:.0f}x slower than batch)")
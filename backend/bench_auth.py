@@ -0,0 +1,66 @@
+# bench_auth.py
+# Micro-benchmark of require_session() per-request overhead:
+# users lookup every call (cache off) vs identity cache vs trusted JWT role claims.
+#
+#   python bench_auth.py --iterations 20000
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--iterations", type=int, default=20000)
+args = parser.parse_args()
+
+os.environ["DB_NAME"] = os.path.join(tempfile.mkdtemp(), "bench.db")
+
+import init_db  # noqa: E402
+init_db.run_script(os.environ["DB_NAME"], "schema.sql")
+
+import app as backend  # noqa: E402
+
+flask_app = backend.create_app()
+from werkzeug.security import generate_password_hash  # noqa: E402
+
+conn = sqlite3.connect(os.environ["DB_NAME"])
+conn.execute("INSERT INTO users (email,name,password_hash,role,created_at) VALUES ('admin@x','Admin',?,'admin','')",
+             (generate_password_hash("pw"),))
+conn.commit()
+conn.close()
+user = backend.get_user_by_email("admin@x")
+with flask_app.app_context():
+    token = backend.create_user_token(user)
+
+
+def run(label, headers=None, session_user=None):
+    with flask_app.test_request_context("/reports/registrations", headers=headers or {}):
+        if session_user is not None:
+            backend.session["user_id"] = session_user
+        assert not isinstance(backend.require_session(roles=["admin"]), tuple)
+        t0 = time.perf_counter()
+        for _ in range(args.iterations):
+            backend.require_session(roles=["admin"])
+        us = (time.perf_counter() - t0) / args.iterations * 1e6
+    print(f"{label:<42}{us:>9.1f} us/call")
+    return us
+
+
+def configure(cache_on, trust_claims):
+    backend.identity_cache.clear()
+    backend.identity_cache.max_entries = 1024 if cache_on else 0
+    flask_app.extensions["campus"].settings["JWT_TRUST_ROLE_CLAIMS"] = trust_claims
+
+
+bearer = {"Authorization": "Bearer " + token}
+print(f"require_session() x{args.iterations}")
+configure(cache_on=False, trust_claims=False)
+s_before = run("session cookie, users lookup every call", session_user=user["user_id"])
+j_before = run("JWT, users lookup every call", headers=bearer)
+configure(cache_on=True, trust_claims=False)
+s_after = run("session cookie, identity cache", session_user=user["user_id"])
+j_after = run("JWT, identity cache", headers=bearer)
+configure(cache_on=True, trust_claims=True)
+j_trust = run("JWT, trusted role claims", headers=bearer)
+print(f"\nsession: {s_before - s_after:+.1f} us saved per call ({s_before / s_after:.1f}x)")
+print(f"JWT:     {j_before - j_after:+.1f} us saved per call with cache, {j_before - j_trust:+.1f} us with trusted claims")
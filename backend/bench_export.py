@@ -0,0 +1,76 @@
+# bench_export.py
+# Streams a 1M-row registration roster through GET /export/registrations.<fmt>
+# and checks that resident memory stays under a fixed ceiling while it does.
+# Exits 1 if RSS grows by more than --ceiling-mb during the export.
+#
+#   python bench_export.py --rows 1000000 --format csv --ceiling-mb 32
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--rows", type=int, default=1000000)
+parser.add_argument("--format", choices=("csv", "ndjson"), default="csv")
+parser.add_argument("--ceiling-mb", type=float, default=32.0)
+args = parser.parse_args()
+
+
+def rss_mb():
+    # current (not peak) resident set size; Linux only
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+
+
+os.environ["DB_NAME"] = os.path.join(tempfile.mkdtemp(), "bench.db")
+
+import init_db  # noqa: E402
+init_db.run_script(os.environ["DB_NAME"], "schema.sql")
+
+# seed before the app migrates, so the bulk insert skips the per-row counter /
+# snapshot triggers; migrating then recomputes both in one pass
+t0 = time.perf_counter()
+conn = sqlite3.connect(os.environ["DB_NAME"])
+conn.execute("PRAGMA foreign_keys=OFF")
+conn.executemany("INSERT INTO event (event_id,title,type,starts_at,college_id) VALUES (?,?,'Fest','2030-01-01T10:00:00','c1')",
+                 [(f"ev{i}", f"Event {i}") for i in range(1000)])
+conn.executemany("INSERT INTO student (student_id,name,roll_no,college_id) VALUES (?,?,?,'c1')",
+                 [(f"stu{i}", f"Student {i}", f"R{i}") for i in range(50000)])
+conn.executemany("INSERT INTO registration (event_id,student_id,registered_at,token,status) "
+                 "VALUES (?,?,'2030-01-01T00:00:00',?,'registered')",
+                 ((f"ev{i % 1000}", f"stu{i % 50000}", f"tok{i}") for i in range(args.rows)))
+conn.commit()
+conn.close()
+print(f"seeded {args.rows} registrations in {time.perf_counter() - t0:.1f}s")
+
+from app import create_app  # noqa: E402
+
+app = create_app()
+
+client = app.test_client()
+client.post("/auth/signup", json={"email": "export@x", "password": "pw", "role": "admin"})
+
+before = rss_mb()
+peak = before
+nbytes = lines = 0
+t0 = time.perf_counter()
+res = client.get(f"/export/registrations.{args.format}", buffered=False)
+assert res.status_code == 200, res.status_code
+for i, chunk in enumerate(res.response):
+    nbytes += len(chunk)
+    lines += chunk.count(b"\n")
+    if i % 50 == 0:
+        peak = max(peak, rss_mb())
+res.close()
+elapsed = time.perf_counter() - t0
+peak = max(peak, rss_mb())
+data_rows = lines - (1 if args.format == "csv" else 0)
+
+print(f"streamed {data_rows} rows, {nbytes / 2 ** 20:.0f} MiB of {args.format} in {elapsed:.1f}s "
+      f"({data_rows / elapsed:,.0f} rows/s)")
+print(f"RSS before {before:.0f} MiB, peak during export {peak:.0f} MiB (+{peak - before:.1f} MiB, "
+      f"ceiling +{args.ceiling_mb:.0f} MiB)")
+if data_rows != args.rows:
+    raise SystemExit(f"expected {args.rows} rows")
+raise SystemExit(0 if peak - before <= args.ceiling_mb else 1)
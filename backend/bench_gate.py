@@ -0,0 +1,83 @@
+# bench_gate.py
+# Per-scan token validation latency at the gate: the registration-table lookup
+# (random tokens, and the fallback for anything the roster cannot settle) vs
+# a signed token checked against the preloaded in-memory roster. Also times
+# the roster preload and a POST /attendance/token round trip for each kind.
+#
+#   python bench_gate.py --registrations 20000 --scans 5000
+import argparse
+import os
+import random
+import secrets
+import sqlite3
+import tempfile
+import time
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--registrations", type=int, default=20000)
+parser.add_argument("--scans", type=int, default=5000)
+parser.add_argument("--http-scans", type=int, default=500)
+args = parser.parse_args()
+
+tmpdir = tempfile.mkdtemp()
+os.environ["DB_NAME"] = os.path.join(tmpdir, "bench.db")
+os.environ["FEEDBACK_SPOOL_DIR"] = os.path.join(tmpdir, "spool")
+
+import init_db  # noqa: E402
+init_db.run_script(os.environ["DB_NAME"], "schema.sql")
+
+import app as backend  # noqa: E402
+
+app = backend.create_app()
+
+n = args.registrations
+conn = sqlite3.connect(os.environ["DB_NAME"])
+conn.execute("INSERT INTO event (event_id,title,type,starts_at,college_id) VALUES ('gate','Gate','Fest','2030-01-01T10:00:00','c1')")
+random_tokens = [secrets.token_urlsafe(12) for _ in range(n)]
+conn.executemany("INSERT INTO registration (reg_id,event_id,student_id,registered_at,token,status) VALUES (?,'gate',?,?,?,'registered')",
+                 [(i + 1, f"r{i}", "2030-01-01T00:00:00", t) for i, t in enumerate(random_tokens)])
+signed_tokens = [backend.token_signer.sign(n + i + 1, "gate", f"s{i}") for i in range(n)]
+conn.executemany("INSERT INTO registration (reg_id,event_id,student_id,registered_at,token,status) VALUES (?,'gate',?,?,?,'registered')",
+                 [(n + i + 1, f"s{i}", "2030-01-01T00:00:00", t) for i, t in enumerate(signed_tokens)])
+conn.commit()
+conn.close()
+
+
+def report(label, lat):
+    lat.sort()
+    print(f"{label:<28} p50={lat[len(lat) // 2] * 1e6:8.1f}us  p99={lat[int(len(lat) * 0.99) - 1] * 1e6:8.1f}us  "
+          f"mean={sum(lat) / len(lat) * 1e6:8.1f}us")
+    return sum(lat) / len(lat)
+
+
+def timed(fn, tokens):
+    lat = []
+    for t in tokens:
+        t0 = time.perf_counter()
+        assert fn(t), t
+        lat.append(time.perf_counter() - t0)
+    return lat
+
+
+rng = random.Random(7)
+picks = [rng.randrange(n) for _ in range(args.scans)]
+
+t0 = time.perf_counter()
+loaded = backend.gate_rosters.preload("gate")
+print(f"roster preload: {loaded['registered']} registrations in {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+before = report("db lookup (random token)", timed(backend.store.registration_by_token, [random_tokens[i] for i in picks]))
+after = report("roster (signed token)", timed(lambda t: backend.gate_rosters.resolve([t]).get(t), [signed_tokens[i] for i in picks]))
+print(f"validation: {before / after:.0f}x faster per scan")
+
+client = app.test_client()
+client.post("/auth/signup", json={"email": "gate@x", "password": "pw", "role": "admin"})
+for label, tokens in (("POST /attendance/token random", random_tokens), ("POST /attendance/token signed", signed_tokens)):
+    lat = []
+    for i in picks[:args.http_scans]:
+        t0 = time.perf_counter()
+        res = client.post("/attendance/token", json={"token": tokens[i]})
+        lat.append(time.perf_counter() - t0)
+        assert res.status_code == 201, res.get_data(as_text=True)
+    report(label, lat)
+print("gate:", backend.gate_rosters.stats())
@@ -0,0 +1,88 @@
+# bench_json.py
+# /events at --events rows: CPU time to serialize the listing with Flask's
+# stdlib JSON provider vs wire.dumps (orjson when installed), bytes on the
+# wire per representation (objects / ?format=columns) and Content-Encoding,
+# and the full GET /events round trip with the response cache cleared.
+#
+#   python bench_json.py --events 10000
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--events", type=int, default=10000)
+parser.add_argument("--rounds", type=int, default=20)
+args = parser.parse_args()
+
+tmpdir = tempfile.mkdtemp()
+os.environ["DB_NAME"] = os.path.join(tmpdir, "bench.db")
+os.environ["FEEDBACK_SPOOL_DIR"] = os.path.join(tmpdir, "spool")
+os.environ["METRICS_ENABLED"] = "0"
+
+import init_db  # noqa: E402
+init_db.run_script(os.environ["DB_NAME"], "schema.sql")
+
+import app as backend  # noqa: E402
+import wire  # noqa: E402
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+app = backend.create_app()
+conn = sqlite3.connect(os.environ["DB_NAME"])
+conn.executemany(
+    "INSERT INTO event (event_id,title,type,description,starts_at,starts_at_ts,capacity,college_id,features,created_at) "
+    "VALUES (?,?,?,?,?,?,?,?,?,?)",
+    [(f"ev{i:06d}", f"Event {i} {('Workshop', 'Hackathon', 'Fest', 'Talk')[i % 4]}", ("Workshop", "Hackathon", "Fest", "Talk")[i % 4],
+      f"description of event {i}, with the details students ask about", f"2030-{i % 12 + 1:02d}-{i % 28 + 1:02d}T10:00:00",
+      1893492000 + i * 3600, 50 + i % 200, f"c{i % 8}", "food,certificate" if i % 3 else "", "2029-01-01T00:00:00")
+     for i in range(args.events)])
+conn.commit()
+conn.close()
+
+rows = backend.store.list_events()[0]
+columns = wire.columnar(rows, list(backend.EVENT_FIELDS))
+stdlib = DefaultJSONProvider(app)
+
+
+def cpu_ms(fn):
+    best = float("inf")
+    for _ in range(args.rounds):
+        t0 = time.process_time()
+        fn()
+        best = min(best, time.process_time() - t0)
+    return best * 1000
+
+
+print(f"{len(rows)} events, orjson {'on' if wire.orjson else 'not installed'}, "
+      f"brotli {'on' if wire.brotli else 'not installed'}")
+with app.app_context():
+    base = cpu_ms(lambda: stdlib.dumps(rows))
+    print(f"{'serialize stdlib json (jsonify before)':<40} {base:7.2f} ms cpu")
+    fast = cpu_ms(lambda: wire.dumps(rows))
+    print(f"{'serialize wire.dumps':<40} {fast:7.2f} ms cpu  ({base / fast:.1f}x)")
+    print(f"{'serialize wire.dumps ?format=columns':<40} {cpu_ms(lambda: wire.dumps(columns)):7.2f} ms cpu")
+
+print()
+for label, body in (("objects", wire.dumps(rows)), ("columns", wire.dumps(columns))):
+    for encoding in (None,) + wire.ENCODINGS:
+        out = body if encoding is None else wire.compress(body, encoding, backend.compressor.level)
+        cost = "" if encoding is None else \
+            f"  encode {cpu_ms(lambda: wire.compress(body, encoding, backend.compressor.level)):6.2f} ms cpu"
+        print(f"{label:<8} {encoding or 'identity':<9} {len(out):>9} bytes  {len(out) / len(body) * 100:5.1f}%{cost}")
+
+print()
+client = app.test_client()
+for provider, encoding in ((stdlib, None),) + tuple((wire.JSONProvider(app), e) for e in (None,) + wire.ENCODINGS):
+    app.json = provider
+    headers = {"Accept-Encoding": encoding} if encoding else {}
+    label = (encoding or "identity") + (" (stdlib json)" if provider is stdlib else "")
+    lat = []
+    for _ in range(args.rounds):
+        backend.response_cache.clear()
+        t0 = time.perf_counter()
+        res = client.get("/events", headers=headers)
+        lat.append(time.perf_counter() - t0)
+        assert res.status_code == 200
+    lat.sort()
+    print(f"GET /events {label:<24} p50 {lat[len(lat) // 2] * 1000:7.1f} ms  {len(res.data):>9} bytes")
@@ -0,0 +1,91 @@
+# bench_login.py
+# Login storm vs event browsing: --storm threads log in as fast as they can
+# while --browsers threads fetch event pages, first with hashing effectively
+# unbounded (one KDF per request thread, like hashing inline) and then on the
+# bounded hash pool. Reports browse latency and login outcomes for each.
+#
+#   python bench_login.py --storm 32 --browsers 4 --seconds 10
+import argparse
+import os
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--storm", type=int, default=32)
+parser.add_argument("--browsers", type=int, default=4)
+parser.add_argument("--seconds", type=float, default=10.0)
+parser.add_argument("--hash-workers", type=int, default=2)
+parser.add_argument("--hash-queue", type=int, default=4)
+args = parser.parse_args()
+
+os.environ["DB_NAME"] = os.path.join(tempfile.mkdtemp(), "bench.db")
+os.environ["RESPONSE_CACHE_SIZE"] = "0"     # every browse hits the database
+os.environ["LOGIN_IP_BURST"] = "0"          # throttling off: measure the pool alone
+os.environ["LOGIN_EMAIL_BURST"] = "0"
+
+import init_db  # noqa: E402
+init_db.run_script(os.environ["DB_NAME"], "schema.sql")
+
+import app as backend  # noqa: E402
+from passwords import HashPool  # noqa: E402
+from werkzeug.security import generate_password_hash  # noqa: E402
+
+flask_app = backend.create_app()
+pw_hash = generate_password_hash("pw", backend.hash_pool.method)
+conn = sqlite3.connect(os.environ["DB_NAME"])
+conn.executemany("INSERT INTO users (email,name,password_hash,role,created_at) VALUES (?,?,?,'student','')",
+                 [(f"u{i}@x", f"U{i}", pw_hash) for i in range(args.storm)])
+conn.executemany("INSERT INTO event (event_id,title,type,starts_at,college_id) VALUES (?,?,'Workshop',?,'c1')",
+                 [(f"ev{i}", f"Event {i}", f"2030-01-{i % 28 + 1:02d}T10:00:00") for i in range(200)])
+conn.commit()
+conn.close()
+
+
+def run(label, pool):
+    backend.hash_pool = pool
+    stop = threading.Event()
+    browse, logins = [], {}
+    lock = threading.Lock()
+
+    def storm(i):
+        client = flask_app.test_client()
+        while not stop.is_set():
+            code = client.post("/auth/login", json={"email": f"u{i}@x", "password": "pw"}).status_code
+            with lock:
+                logins[code] = logins.get(code, 0) + 1
+            if code == 503:
+                time.sleep(0.05)  # a real client would honour Retry-After
+
+    def browser():
+        client = flask_app.test_client()
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            client.get("/events?limit=20")
+            with lock:
+                browse.append(time.perf_counter() - t0)
+
+    threads = [threading.Thread(target=storm, args=(i,)) for i in range(args.storm)]
+    threads += [threading.Thread(target=browser) for _ in range(args.browsers)]
+    for t in threads:
+        t.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    browse.sort()
+    p50 = statistics.median(browse) * 1000
+    p95 = browse[int(len(browse) * 0.95) - 1] * 1000
+    print(f"{label:<34}{len(browse) / args.seconds:>9.0f}{p50:>9.1f}{p95:>9.1f}   "
+          + ", ".join(f"{code}: {n}" for code, n in sorted(logins.items())))
+    return p95
+
+
+print(f"{args.storm} login threads, {args.browsers} browse threads, {args.seconds:.0f}s each, {os.cpu_count()} CPUs")
+print(f"{'':<34}{'browse/s':>9}{'p50 ms':>9}{'p95 ms':>9}   login status counts")
+before = run("unbounded (hash per request)", HashPool(backend.hash_pool.method, workers=args.storm, max_queue=args.storm))
+after = run(f"pool: {args.hash_workers} workers, queue {args.hash_queue}",
+            HashPool(backend.hash_pool.method, workers=args.hash_workers, max_queue=args.hash_queue))
+print(f"\nbrowse p95 {before:.1f} ms -> {after:.1f} ms ({before / after:.1f}x)")
@@ -0,0 +1,91 @@
+# bench_metrics.py
+# Instrumentation overhead with profiling off. Two apps share one database and
+# process, one built with the metrics hooks (and timed sqlite3 connections) and
+# one without; short runs of the same request mix alternate between the two,
+# so machine noise hits both alike. The response cache is off so every request runs its SQL.
+# The fixed costs (request middleware, per-statement timing) are also timed
+# in isolation, since whole-request timings on a busy machine are noisy.
+#
+#   python bench_metrics.py --runs 100 --requests 100
+import argparse
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+import timeit
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--runs", type=int, default=100)
+parser.add_argument("--requests", type=int, default=100, help="requests per run")
+args = parser.parse_args()
+
+os.environ["DB_NAME"] = os.path.join(tempfile.mkdtemp(), "bench.db")
+os.environ["RESPONSE_CACHE_SIZE"] = "0"
+
+import init_db  # noqa: E402
+init_db.run_script(os.environ["DB_NAME"], "schema.sql")
+
+import app as backend  # noqa: E402
+
+plain_app = backend.create_app({"METRICS_ENABLED": False})
+timed_app = backend.create_app({"METRICS_ENABLED": True})
+timed_metrics = timed_app.extensions["campus"].app_metrics
+timed_conn = timed_metrics.connection_class()
+
+conn = sqlite3.connect(os.environ["DB_NAME"])
+conn.executemany("INSERT INTO event (event_id,title,type,starts_at,college_id) VALUES (?,?,'Workshop',?,?)",
+                 [(f"ev{i}", f"Event {i}", f"2030-01-{i % 28 + 1:02d}T10:00:00", f"c{i % 2 + 1}")
+                  for i in range(300)])
+conn.commit()
+conn.close()
+
+PATHS = ["/events?limit=20", "/events/ev1", "/events?college_id=c1&limit=20", "/health"]
+
+
+def run(app):
+    app.extensions["campus"].store.pool.close_all()
+    client = app.test_client()
+    for p in PATHS:
+        client.get(p)
+    t0 = time.perf_counter()
+    for i in range(args.requests):
+        client.get(PATHS[i % len(PATHS)])
+    return (time.perf_counter() - t0) / args.requests
+
+
+off, on = [], []
+for i in range(args.runs):
+    # alternate which setup goes first, so warm-up effects cancel out
+    if i % 2:
+        on.append(run(timed_app))
+        off.append(run(plain_app))
+    else:
+        off.append(run(plain_app))
+        on.append(run(timed_app))
+
+print(f"{args.runs} runs x {args.requests} requests ({', '.join(PATHS)})")
+for label, f in (("median", statistics.median), ("fastest", min)):
+    a, b = f(off), f(on)
+    print(f"  {label:<8} off {a * 1e6:7.1f} us  on {b * 1e6:7.1f} us  overhead {(b - a) * 1e6:+6.1f} us ({(b / a - 1) * 100:+.1f}%)")
+
+
+# the instrumentation's own cost, without the rest of the request around it
+def bare_wsgi(environ, start_response):
+    start_response("200 OK", [("Content-Type", "text/plain")])
+    return [b""]
+
+
+wrapped = timed_metrics.middleware(bare_wsgi)
+environ = {"REQUEST_METHOD": "GET", "PATH_INFO": "/events"}
+n = 100000
+mw_us = (timeit.timeit(lambda: wrapped(environ, lambda *a: None), number=n) -
+         timeit.timeit(lambda: bare_wsgi(environ, lambda *a: None), number=n)) / n * 1e6
+stmt_us = []
+for factory in (sqlite3.Connection, timed_conn):
+    c = sqlite3.connect(os.environ["DB_NAME"], factory=factory)
+    stmt_us.append(timeit.timeit(lambda: c.execute("SELECT title FROM event WHERE event_id = ?", ("ev1",)).fetchall(),
+                                 number=n) / n * 1e6)
+    c.close()
+print(f"  in isolation: middleware {mw_us:.1f} us/request, SQL timing {stmt_us[1] - stmt_us[0]:.1f} us/statement "
+      f"({stmt_us[0]:.1f} -> {stmt_us[1]:.1f})")
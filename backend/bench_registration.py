@@ -0,0 +1,80 @@
+# bench_registration.py
+# Concurrent registration load test: fires N simultaneous POST /events/<id>/register
+# calls at one capped event and checks that no seat is ever oversubscribed.
+#
+#   python bench_registration.py --requests 1500 --capacity 1000 --threads 200
+import argparse
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--requests", type=int, default=1500)
+parser.add_argument("--capacity", type=int, default=1000)
+parser.add_argument("--threads", type=int, default=200)
+parser.add_argument("--waitlist", action="store_true", help="ask for a waitlist spot when full")
+args = parser.parse_args()
+
+tmpdir = tempfile.mkdtemp()
+os.environ["DB_NAME"] = os.path.join(tmpdir, "bench.db")
+os.environ.setdefault("DB_POOL_SIZE", str(min(args.threads, 32)))
+
+import init_db  # noqa: E402
+init_db.run_script(os.environ["DB_NAME"], "schema.sql")
+
+from app import create_app, pool  # noqa: E402
+
+app = create_app()
+
+conn = sqlite3.connect(os.environ["DB_NAME"])
+conn.execute("INSERT INTO event (event_id,title,type,starts_at,capacity,college_id) VALUES ('load','Load','Fest','2030-01-01T10:00:00',?,'c1')",
+             (args.capacity,))
+conn.commit()
+conn.close()
+
+start_gate = threading.Barrier(min(args.threads, args.requests))
+local = threading.local()
+
+
+def one(i):
+    client = getattr(local, "client", None)
+    if client is None:
+        client = local.client = app.test_client()
+        try:
+            start_gate.wait(timeout=30)
+        except threading.BrokenBarrierError:
+            pass
+    t0 = time.perf_counter()
+    res = client.post("/events/load/register", json={"student_id": f"s{i}", "waitlist": args.waitlist})
+    return res.status_code, time.perf_counter() - t0
+
+
+t0 = time.perf_counter()
+with ThreadPoolExecutor(max_workers=args.threads) as ex:
+    results = list(ex.map(one, range(args.requests)))
+elapsed = time.perf_counter() - t0
+
+codes = {}
+for code, _ in results:
+    codes[code] = codes.get(code, 0) + 1
+lat = sorted(dt for _, dt in results)
+
+conn = sqlite3.connect(os.environ["DB_NAME"])
+registered = conn.execute("SELECT COUNT(*) FROM registration WHERE event_id='load' AND status='registered'").fetchone()[0]
+waitlisted = conn.execute("SELECT COUNT(*) FROM registration WHERE event_id='load' AND status='waitlisted'").fetchone()[0]
+counter = conn.execute("SELECT registered_count FROM event WHERE event_id='load'").fetchone()[0]
+conn.close()
+
+print(f"requests={args.requests} capacity={args.capacity} threads={args.threads}")
+print(f"status codes: {codes}")
+print(f"registered={registered} waitlisted={waitlisted} registered_count={counter}")
+print(f"elapsed={elapsed:.2f}s throughput={args.requests / elapsed:.0f} req/s "
+      f"p50={lat[len(lat) // 2] * 1000:.1f}ms p99={lat[int(len(lat) * 0.99) - 1] * 1000:.1f}ms")
+print("pool:", pool.stats())
+
+ok = registered <= args.capacity and registered == counter == min(args.capacity, args.requests)
+print("RESULT:", "OK (no oversubscription)" if ok else "FAIL")
+raise SystemExit(0 if ok else 1)
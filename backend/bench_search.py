@@ -0,0 +1,73 @@
+# bench_search.py
+# Compare event search latency: title LIKE '%term%' vs the FTS5 index.
+#
+#   python bench_search.py --sizes 10000 100000 --repeat 20
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+import migrate
+import search
+
+WORDS = ("machine learning workshop hackathon robotics seminar design music dance quiz "
+         "startup finance coding cloud security data science poetry drama chess photography "
+         "biology chemistry physics career resume networking open source web mobile").split()
+TERMS = ["robot", "data science", "hack", "poetry", "cloud secu", "zzz-nomatch"]
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+parser.add_argument("--repeat", type=int, default=20)
+args = parser.parse_args()
+
+
+def build(path, n):
+    migrate.migrate(path, log=lambda msg: None)
+    conn = sqlite3.connect(path)
+    rnd = random.Random(n)
+    # a long tail of filler words so topic words are as selective as in real descriptions
+    filler = ["".join(rnd.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rnd.randint(4, 9))) for _ in range(5000)]
+    rows = []
+    for i in range(n):
+        title = " ".join(rnd.choice(WORDS) for _ in range(2)).title() + " " + rnd.choice(filler).title()
+        desc = " ".join(rnd.choice(filler) if rnd.random() < 0.95 else rnd.choice(WORDS) for _ in range(30))
+        rows.append((f"ev{i}", title, rnd.choice(["Workshop", "Seminar", "Fest"]), desc,
+                     "2030-01-01T10:00:00", "c1", ",".join(rnd.sample(WORDS, 2))))
+    conn.executemany("INSERT INTO event (event_id,title,type,description,starts_at,college_id,features) VALUES (?,?,?,?,?,?,?)", rows)
+    conn.commit()
+    return conn
+
+
+def timed(conn, sql, params):
+    t0 = time.perf_counter()
+    for _ in range(args.repeat):
+        n = len(conn.execute(sql, params).fetchall())
+    return (time.perf_counter() - t0) / args.repeat * 1000, n
+
+
+like_sql = "SELECT event_id, title FROM event e WHERE e.title LIKE ? ORDER BY e.starts_at"
+# what LIKE would need to search descriptions too, i.e. the same scope as the FTS index
+like_all_sql = ("SELECT event_id, title FROM event e WHERE e.title LIKE ?1 OR e.description LIKE ?1 "
+                "OR e.type LIKE ?1 OR e.features LIKE ?1 ORDER BY e.starts_at")
+fts_sql = ("SELECT event_id, title FROM event e WHERE e.event_no IN "
+           "(SELECT rowid FROM event_fts WHERE event_fts MATCH ?) ORDER BY e.starts_at")
+ranked_sql = (f"SELECT e.event_id, e.title FROM event e JOIN (SELECT rowid AS fts_rowid, {search.RANK_SQL} AS score "
+              "FROM event_fts WHERE event_fts MATCH ?) s ON s.fts_rowid = e.event_no ORDER BY s.score LIMIT 50")
+
+for n in args.sizes:
+    path = os.path.join(tempfile.mkdtemp(), "search.db")
+    conn = build(path, n)
+    print(f"\n== {n} events ==")
+    print(f"{'term':<14}{'LIKE title ms':>14}{'rows':>7}{'LIKE all ms':>13}{'rows':>7}"
+          f"{'FTS ms':>9}{'rows':>7}{'FTS top50 ms':>14}")
+    for term in TERMS:
+        like_ms, like_n = timed(conn, like_sql, (f"%{term}%",))
+        all_ms, all_n = timed(conn, like_all_sql, (f"%{term}%",))
+        match = search.match_expression(term)
+        fts_ms, fts_n = timed(conn, fts_sql, (match,))
+        rank_ms, _ = timed(conn, ranked_sql, (match,))
+        print(f"{term:<14}{like_ms:>14.2f}{like_n:>7}{all_ms:>13.2f}{all_n:>7}"
+              f"{fts_ms:>9.2f}{fts_n:>7}{rank_ms:>14.2f}")
+    conn.close()
@@ -0,0 +1,129 @@
+# bench_serve.py
+# Load test of the production entry point: boots `gunicorn -c gunicorn.conf.py
+# wsgi:app` with 1, 2, 4, ... workers on a seeded temp database and drives it
+# with concurrent keep-alive clients for a fixed time, reporting requests/sec
+# and latency per worker count. Needs gunicorn (pip install gunicorn).
+#
+#   python bench_serve.py --workers 1,2,4,8 --clients 32 --seconds 10
+#   python bench_serve.py --path "/events?limit=20" --path /events/ev1
+import argparse
+import http.client
+import os
+import socket
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--workers", default="1,2,4")
+parser.add_argument("--threads", type=int, default=8, help="gunicorn threads per worker")
+parser.add_argument("--clients", type=int, default=32)
+parser.add_argument("--seconds", type=float, default=10.0)
+parser.add_argument("--path", action="append", help="GET path(s) to hit, round-robin")
+parser.add_argument("--no-cache", action="store_true", help="disable the response cache in the workers")
+args = parser.parse_args()
+paths = args.path or ["/events?limit=20", "/events?college_id=c1&limit=20", "/events/ev1"]
+
+here = os.path.dirname(os.path.abspath(__file__))
+env = dict(os.environ, DB_NAME=os.path.join(tempfile.mkdtemp(), "serve.db"),
+           GUNICORN_THREADS=str(args.threads), GUNICORN_ACCESS_LOG="",
+           GUNICORN_WORKER_CLASS="gthread")
+if args.no_cache:
+    env["RESPONSE_CACHE_SIZE"] = "0"
+
+import init_db  # noqa: E402
+import migrate  # noqa: E402
+init_db.run_script(env["DB_NAME"], os.path.join(here, "schema.sql"))
+migrate.migrate(env["DB_NAME"])
+conn = sqlite3.connect(env["DB_NAME"])
+conn.execute("INSERT INTO college VALUES ('c1','C1'), ('c2','C2')")
+conn.executemany("INSERT INTO event (event_id,title,type,starts_at,capacity,college_id) VALUES (?,?,?,?,?,?)",
+                 [(f"ev{i}", f"Event {i}", "Workshop", f"2030-01-{i % 28 + 1:02d}T10:00:00", 100, f"c{i % 2 + 1}")
+                  for i in range(500)])
+conn.commit()
+conn.close()
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_ready(port, proc, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit("gunicorn exited: " + proc.stderr.read().decode(errors="replace")[-2000:])
+        try:
+            c = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            c.request("GET", "/health")
+            if c.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise SystemExit("server did not come up")
+
+
+def client_loop(port, stop, latencies, errors):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    i = 0
+    while not stop.is_set():
+        path = paths[i % len(paths)]
+        i += 1
+        t0 = time.perf_counter()
+        try:
+            conn.request("GET", path)
+            res = conn.getresponse()
+            res.read()
+            if res.status != 200:
+                errors.append(res.status)
+                continue
+        except (OSError, http.client.HTTPException):
+            errors.append("conn")
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - t0)
+    conn.close()
+
+
+def run(workers):
+    port = free_port()
+    proc = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py",
+                             "--workers", str(workers), "--bind", f"127.0.0.1:{port}", "wsgi:app"],
+                            cwd=here, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    try:
+        wait_ready(port, proc)
+        stop, latencies, errors = threading.Event(), [], []
+        clients = [threading.Thread(target=client_loop, args=(port, stop, latencies, errors))
+                   for _ in range(args.clients)]
+        for t in clients:
+            t.start()
+        time.sleep(args.seconds)
+        stop.set()
+        for t in clients:
+            t.join()
+    finally:
+        proc.terminate()
+        proc.wait()
+    latencies.sort()
+    rps = len(latencies) / args.seconds
+    p50 = statistics.median(latencies) * 1000 if latencies else 0
+    p95 = latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else 0
+    print(f"{workers:>7} {rps:>10.0f} {p50:>9.1f} {p95:>9.1f} {len(errors):>7}")
+    return rps
+
+
+print(f"{args.clients} clients, {args.threads} threads/worker, {args.seconds:.0f}s per run, "
+      f"{os.cpu_count()} CPUs, paths: {', '.join(paths)}")
+print(f"{'workers':>7} {'req/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'errors':>7}")
+results = {w: run(w) for w in (int(x) for x in args.workers.split(","))}
+base = results[min(results)]
+if base:
+    print("scaling vs %d worker(s): " % min(results) +
+          ", ".join(f"{w}: {rps / base:.2f}x" for w, rps in results.items()))
@@ -0,0 +1,81 @@
+# bench_shards.py
+# One SQLite file vs per-college shards (storage_sharded.py): registrations
+# from concurrent threads spread over --colleges colleges (one writer lock
+# vs one per shard), then the cross-college listing and report that fan out.
+#
+#   python bench_shards.py --colleges 8 --events 40 --threads 16 --registrations 4000
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from storage import open_storage
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--colleges", type=int, default=8)
+parser.add_argument("--events", type=int, default=40, help="events per college")
+parser.add_argument("--threads", type=int, default=16)
+parser.add_argument("--registrations", type=int, default=4000)
+parser.add_argument("--reads", type=int, default=200)
+args = parser.parse_args()
+
+
+def setup(url):
+    store = open_storage(url, max_size=args.threads, shard_pool_size=args.threads)
+    store.migrate(log=lambda msg: None)
+    store.load_capabilities()
+    with store.transaction() as cur:
+        cur.executemany("INSERT INTO college (college_id, name) VALUES (?, ?)",
+                        [(f"c{c}", f"College {c}") for c in range(args.colleges)])
+        cur.executemany("INSERT INTO student (student_id, name, roll_no, college_id) VALUES (?, ?, ?, ?)",
+                        [(f"s{i}", f"S{i}", f"R{i}", f"c{i % args.colleges}") for i in range(args.registrations)])
+    for c in range(args.colleges):
+        for e in range(args.events):
+            store.create_event({"event_id": f"c{c}e{e}", "title": f"Event {e}", "type": "Talk",
+                                "starts_at": f"2030-01-{e % 28 + 1:02d}T10:00:00", "capacity": 10 ** 6,
+                                "college_id": f"c{c}", "created_at": "2030-01-01T00:00:00"})
+    return store
+
+
+def register_all(store):
+    work = [(f"c{i % args.colleges}e{i % args.events}", f"s{i}") for i in range(args.registrations)]
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            with lock:
+                if not work:
+                    return
+                event_id, student_id = work.pop()
+            store.register(event_id, student_id)
+
+    threads = [threading.Thread(target=worker) for _ in range(args.threads)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return args.registrations / (time.perf_counter() - t0)
+
+
+def timed(fn):
+    lat = []
+    for _ in range(args.reads):
+        t0 = time.perf_counter()
+        fn()
+        lat.append(time.perf_counter() - t0)
+    lat.sort()
+    return lat[len(lat) // 2] * 1000
+
+
+tmpdir = tempfile.mkdtemp()
+for label, url in (("single file", os.path.join(tmpdir, "single.db")), ("shards", "shards:" + os.path.join(tmpdir, "shards"))):
+    store = setup(url)
+    rate = register_all(store)
+    listing = timed(lambda: store.list_events(limit=50))
+    one = timed(lambda: store.list_events(college_id="c0", limit=50))
+    report = timed(lambda: store.report("registrations", fresh=True))
+    print(f"{label:<12} register {rate:8.0f}/s   list all p50 {listing:6.2f} ms   list one college p50 {one:6.2f} ms"
+          f"   registrations report p50 {report:6.2f} ms")
+    store.close()
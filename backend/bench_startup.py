@@ -0,0 +1,58 @@
+# bench_startup.py
+# Worker cold-start time: spawn N fresh interpreters at once (like gunicorn
+# booting N workers) that each build the app against the same already-current
+# database, and report how long the import took in each (framework imports
+# are timed separately so the app's own startup work stands out).
+#
+#   python bench_startup.py --workers 8 --rounds 3
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--workers", type=int, default=8)
+parser.add_argument("--rounds", type=int, default=3)
+args = parser.parse_args()
+
+here = os.path.dirname(os.path.abspath(__file__))
+env = dict(os.environ, DB_NAME=os.path.join(tempfile.mkdtemp(), "startup.db"))
+
+WORKER = """
+import time
+t0 = time.perf_counter()
+import flask, flask_cors, flask_jwt_extended
+t1 = time.perf_counter()
+import app
+app.create_app()
+print(t1 - t0, time.perf_counter() - t1)
+"""
+
+import init_db  # noqa: E402
+init_db.run_script(env["DB_NAME"], os.path.join(here, "schema.sql"))
+
+# first boot brings the database up to date; not part of the measurement
+t0 = time.perf_counter()
+subprocess.run([sys.executable, "-c", WORKER], cwd=here, env=env, check=True, capture_output=True)
+print(f"first boot (fresh database): {(time.perf_counter() - t0) * 1000:.0f} ms wall")
+
+framework, times = [], []
+for _ in range(args.rounds):
+    procs = [subprocess.Popen([sys.executable, "-c", WORKER], cwd=here, env=env,
+                              stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+             for _ in range(args.workers)]
+    for p in procs:
+        out, _ = p.communicate()
+        if p.returncode != 0:
+            raise SystemExit("worker failed to start")
+        fw, own = out.strip().splitlines()[-1].split()
+        framework.append(float(fw) * 1000)
+        times.append(float(own) * 1000)
+times.sort()
+print(f"{len(times)} boots, {args.workers} concurrent")
+print(f"  framework imports: median {statistics.median(framework):.0f} ms")
+print(f"  create_app():      median {statistics.median(times):.0f} ms, "
+      f"p95 {times[int(len(times) * 0.95) - 1]:.0f} ms, max {times[-1]:.0f} ms")
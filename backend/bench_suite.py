@@ -0,0 +1,310 @@
+# bench_suite.py
+# Repeatable benchmark of every API endpoint on a generated database (see
+# gen_data.py): each scenario (event listings with every filter, event detail,
+# /registrations, all /reports/*, registration, attendance and feedback
+# writes) runs for --seconds with --concurrency clients, and requests/sec,
+# latency percentiles and status counts are written as JSON. Request
+# parameters (events, students, tokens) are drawn from the database with a
+# fixed seed. In-process through the Flask test client by default, on a copy
+# of --db so the writes don't accumulate; --url drives a running server
+# instead (pass the server's database as --db so parameters can be sampled).
+# The response cache is off unless --cache, so every request runs its SQL.
+#
+#   python gen_data.py --db bench.db
+#   python bench_suite.py --db bench.db --out base.json
+#   python bench_suite.py --db bench.db --out new.json --compare base.json --threshold 0.2
+#   python bench_suite.py --db bench.db --only reports --concurrency 4
+#
+# With --compare, a scenario regresses when its p95 grew or its throughput
+# fell by more than --threshold (ignoring p95 changes under --min-ms), or it
+# started returning 5xx; the exit status is then 1.
+import argparse
+import datetime
+import http.client
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--db", help="database from gen_data.py (default: generate a small one)")
+parser.add_argument("--url", help="benchmark a running server, e.g. http://127.0.0.1:8000")
+parser.add_argument("--in-place", action="store_true", help="write to --db itself instead of a copy")
+parser.add_argument("--concurrency", type=int, default=8)
+parser.add_argument("--seconds", type=float, default=5.0, help="per scenario")
+parser.add_argument("--warmup", type=int, default=20, help="untimed requests per scenario")
+parser.add_argument("--only", action="append", help="run scenarios whose name contains this (repeatable)")
+parser.add_argument("--cache", action="store_true", help="leave the response cache on")
+parser.add_argument("--seed", type=int, default=1)
+parser.add_argument("--out", help="write results JSON here")
+parser.add_argument("--compare", help="baseline results JSON to compare against")
+parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative regression (0.2 = 20%%)")
+parser.add_argument("--min-ms", type=float, default=1.0, help="ignore p95 changes smaller than this")
+args = parser.parse_args()
+
+here = os.path.dirname(os.path.abspath(__file__))
+import gen_data  # noqa: E402
+
+if args.db is None:
+    if args.url:
+        raise SystemExit("--url needs --db (the server's database) to sample request parameters")
+    args.db = os.path.join(tempfile.mkdtemp(), "suite.db")
+    gen_data.generate(args.db, students=5000, events=500, registrations=50000)
+elif not args.url and not args.in_place:
+    copy = os.path.join(tempfile.mkdtemp(), "suite.db")
+    src = sqlite3.connect(args.db)
+    src.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    src.close()
+    shutil.copyfile(args.db, copy)
+    args.db = copy
+
+# ---------------- request parameters ----------------
+conn = sqlite3.connect(args.db)
+sample = random.Random(args.seed)
+counts = {t: conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0]
+          for t in ("college", "student", "event", "registration", "attendance", "feedback")}
+college_ids = [r[0] for r in conn.execute("SELECT college_id FROM college ORDER BY college_id")]
+event_ids = [r[0] for r in conn.execute("SELECT event_id FROM event ORDER BY event_id")]
+past_event_ids = [r[0] for r in conn.execute("SELECT event_id FROM event WHERE starts_at < ? ORDER BY event_id",
+                                             (datetime.datetime.utcnow().isoformat(),))] or event_ids
+student_ids = [r[0] for r in conn.execute("SELECT student_id FROM student ORDER BY student_id")]
+# students with registrations, weighted toward the busy ones as real traffic is
+registered_students = [r[0] for r in conn.execute(
+    "SELECT student_id FROM registration ORDER BY reg_id LIMIT 20000")] or student_ids
+tokens = [r[0] for r in conn.execute(
+    "SELECT token FROM registration WHERE status = 'registered' ORDER BY reg_id LIMIT 50000")]
+types = [r[0] for r in conn.execute("SELECT DISTINCT type FROM event WHERE type IS NOT NULL ORDER BY type")]
+tags = [r[0] for r in conn.execute("SELECT DISTINCT tag FROM event_feature ORDER BY tag")] or ["food"]
+conn.close()
+sample.shuffle(tokens)
+words = list(gen_data.WORDS)
+
+# ---------------- client ----------------
+if args.url:
+    target = urllib.parse.urlsplit(args.url)
+
+    class Client:
+        def __init__(self):
+            self.conn = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=60)
+
+        def request(self, method, path, body=None, headers=None):
+            headers = dict(headers or {})
+            data = None
+            if body is not None:
+                data = json.dumps(body)
+                headers["Content-Type"] = "application/json"
+            try:
+                self.conn.request(method.upper(), path, data, headers)
+                res = self.conn.getresponse()
+                return res.status, res.read(), res.headers
+            except (OSError, http.client.HTTPException):
+                self.conn.close()
+                self.conn = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=60)
+                return 0, b"", {}
+else:
+    os.environ["DB_NAME"] = args.db
+    if not args.cache:
+        os.environ["RESPONSE_CACHE_SIZE"] = "0"
+    os.environ.setdefault("SLOW_QUERY_MS", "1000")
+    import app as backend  # noqa: E402
+    flask_app = backend.create_app()
+
+    class Client:
+        def __init__(self):
+            self.client = flask_app.test_client()
+
+        def request(self, method, path, body=None, headers=None):
+            res = getattr(self.client, method)(path, json=body, headers=headers)
+            return res.status_code, res.get_data(), res.headers
+
+admin = Client()
+status, payload, _ = admin.request("post", "/auth/login", {"email": gen_data.ADMIN_EMAIL, "password": gen_data.ADMIN_PASSWORD})
+if status != 200:
+    raise SystemExit(f"admin login failed ({status}): is --db a gen_data.py database?")
+auth = {"Authorization": "Bearer " + json.loads(payload)["token"]}
+
+# real keyset cursors for the next-page scenario
+cursors = []
+for c in college_ids[:5]:
+    _, _, headers = admin.request("get", f"/events?college_id={c}&limit=20")
+    if headers.get("X-Next-Cursor"):
+        cursors.append((c, headers["X-Next-Cursor"]))
+
+# ---------------- scenarios ----------------
+# name -> fn(rng) returning (method, path, json body, needs admin)
+SCENARIOS = {
+    "events.first_page": lambda r: ("get", "/events?limit=20", None, False),
+    "events.college": lambda r: ("get", f"/events?college_id={r.choice(college_ids)}&limit=20", None, False),
+    "events.type": lambda r: ("get", f"/events?type={r.choice(types)}&limit=20", None, False),
+    "events.search": lambda r: ("get", f"/events?search={r.choice(words)}&limit=20", None, False),
+    "events.search_relevance": lambda r: ("get", f"/events?search={r.choice(words)}&sort=relevance&limit=20", None, False),
+    "events.feature": lambda r: ("get", f"/events?feature={r.choice(tags)}&limit=20", None, False),
+    "events.feature_any": lambda r: ("get", f"/events?feature={','.join(r.sample(tags, min(2, len(tags))))}"
+                                            "&feature_match=any&limit=20", None, False),
+    "events.facets": lambda r: ("get", f"/events?college_id={r.choice(college_ids)}&facets=1&limit=20", None, False),
+    "events.fields": lambda r: ("get", "/events?fields=event_id,title,starts_at&limit=50", None, False),
+    "events.next_page": lambda r: ("get", "/events?college_id=%s&limit=20&cursor=%s" % r.choice(cursors), None, False),
+    "events.all": lambda r: ("get", f"/events?college_id={r.choice(college_ids)}", None, False),
+    "event.detail": lambda r: ("get", f"/events/{r.choice(event_ids)}", None, False),
+    "registrations.student": lambda r: ("get", f"/registrations?student_id={r.choice(registered_students)}", None, False),
+    "registrations.student_page": lambda r: ("get", f"/registrations?student_id={r.choice(registered_students).upper()}"
+                                                    "&limit=10", None, False),
+    "reports.registrations": lambda r: ("get", "/reports/registrations", None, True),
+    "reports.registrations_college": lambda r: ("get", f"/reports/registrations?college_id={r.choice(college_ids)}",
+                                                None, True),
+    "reports.attendance": lambda r: ("get", "/reports/attendance_percentage", None, True),
+    "reports.attendance_event": lambda r: ("get", f"/reports/attendance_percentage?event_id={r.choice(past_event_ids)}",
+                                           None, True),
+    "reports.top_students": lambda r: ("get", "/reports/top-active-students", None, True),
+    "reports.top_students_college": lambda r: ("get", f"/reports/top-active-students?college_id={r.choice(college_ids)}",
+                                               None, True),
+    "reports.avg_feedback": lambda r: ("get", "/reports/avg_feedback", None, True),
+    "reports.avg_feedback_college": lambda r: ("get", f"/reports/avg_feedback?college_id={r.choice(college_ids)}",
+                                               None, True),
+    "write.register": lambda r: ("post", f"/events/{r.choice(event_ids)}/register",
+                                 {"student_id": r.choice(student_ids)}, False),
+    "write.attendance_manual": lambda r: ("post", f"/events/{r.choice(past_event_ids)}/attendance",
+                                          {"student_id": r.choice(student_ids)}, False),
+    "write.attendance_token": lambda r: ("post", "/attendance/token", {"token": r.choice(tokens)}, True),
+    "write.attendance_batch": lambda r: ("post", "/attendance/batch", {"tokens": r.sample(tokens, min(50, len(tokens)))},
+                                         True),
+    "write.feedback": lambda r: ("post", f"/feedback/{r.choice(past_event_ids)}",
+                                 {"student_id": r.choice(student_ids), "rating": r.randint(1, 5)}, False),
+}
+if not cursors:
+    del SCENARIOS["events.next_page"]
+if not tokens:
+    del SCENARIOS["write.attendance_token"], SCENARIOS["write.attendance_batch"]
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+
+def run(name, make):
+    warm = Client()
+    rng = random.Random(f"{args.seed}:{name}:warmup")
+    for _ in range(args.warmup):
+        method, path, body, needs_admin = make(rng)
+        warm.request(method, path, body, auth if needs_admin else None)
+
+    stop = threading.Event()
+    results = [None] * args.concurrency
+
+    def worker(i):
+        client = Client()
+        rng = random.Random(f"{args.seed}:{name}:{i}")
+        latencies, statuses = [], {}
+        while not stop.is_set():
+            method, path, body, needs_admin = make(rng)
+            t0 = time.perf_counter()
+            status, _, _ = client.request(method, path, body, auth if needs_admin else None)
+            latencies.append(time.perf_counter() - t0)
+            statuses[status] = statuses.get(status, 0) + 1
+        results[i] = (latencies, statuses)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.concurrency)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    latencies, statuses = [], {}
+    for lat, st in results:
+        latencies.extend(lat)
+        for code, n in st.items():
+            statuses[str(code)] = statuses.get(str(code), 0) + n
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "max_ms": round((latencies[-1] if latencies else 0) * 1000, 2),
+        "errors": sum(n for code, n in statuses.items() if int(code) == 0 or int(code) >= 500),
+        "statuses": dict(sorted(statuses.items())),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=here, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+names = [n for n in SCENARIOS if not args.only or any(o in n for o in args.only)]
+print(f"{len(names)} scenarios x {args.seconds:.0f}s, concurrency {args.concurrency}, "
+      f"{'server ' + args.url if args.url else 'in-process'}, cache {'on' if args.cache else 'off'}; "
+      + ", ".join(f"{t} {n:,}" for t, n in counts.items()))
+print(f"{'scenario':<32}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}   statuses")
+scenarios = {}
+for name in names:
+    res = scenarios[name] = run(name, SCENARIOS[name])
+    print(f"{name:<32}{res['rps']:>9.0f}{res['p50_ms']:>9.1f}{res['p95_ms']:>9.1f}{res['p99_ms']:>9.1f}   "
+          + ", ".join(f"{code}: {n}" for code, n in res["statuses"].items()))
+
+results = {
+    "meta": {
+        "timestamp": datetime.datetime.utcnow().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "target": args.url or "in-process",
+        "concurrency": args.concurrency,
+        "seconds": args.seconds,
+        "cache": args.cache,
+        "seed": args.seed,
+        "rows": counts,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "cpus": os.cpu_count(),
+    },
+    "scenarios": scenarios,
+}
+if args.out:
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"results written to {args.out}")
+
+if args.compare:
+    with open(args.compare, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline["meta"].get("rows") != counts or baseline["meta"].get("concurrency") != args.concurrency:
+        print("warning: baseline was run on a different dataset or concurrency")
+    print(f"\ncompared to {args.compare} ({baseline['meta'].get('commit')}), threshold {args.threshold:.0%}")
+    regressions = []
+    for name, cur in scenarios.items():
+        base = baseline["scenarios"].get(name)
+        if base is None:
+            continue
+        p95_change = cur["p95_ms"] / base["p95_ms"] - 1 if base["p95_ms"] else 0.0
+        rps_change = cur["rps"] / base["rps"] - 1 if base["rps"] else 0.0
+        reasons = []
+        if p95_change > args.threshold and cur["p95_ms"] - base["p95_ms"] >= args.min_ms:
+            reasons.append(f"p95 {base['p95_ms']:.1f} -> {cur['p95_ms']:.1f} ms")
+        if rps_change < -args.threshold / (1 + args.threshold):
+            reasons.append(f"req/s {base['rps']:.0f} -> {cur['rps']:.0f}")
+        if cur["errors"] and not base["errors"]:
+            reasons.append(f"{cur['errors']} errors")
+        flag = "REGRESSION " + "; ".join(reasons) if reasons else ""
+        print(f"  {name:<32} p95 {p95_change:+7.1%}  req/s {rps_change:+7.1%}  {flag}")
+        if reasons:
+            regressions.append(name)
+    if regressions:
+        print(f"❌ {len(regressions)} scenario(s) regressed: {', '.join(regressions)}")
+        sys.exit(1)
+    print("✅ no regressions")
@@ -0,0 +1,114 @@
+# backend/cache.py
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache bounded by entry count and per-entry TTL.
+
+    Entries can carry tags; invalidate_tags() drops every entry holding any of
+    the given tags, so writers can evict exactly the responses they affect.
+    It also bumps each tag's generation: a reader takes generation(tags)
+    before building a value and passes it to set(), which drops the value if
+    a write invalidated one of its tags in between.
+    """
+
+    def __init__(self, max_entries=512, ttl=30.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expires_at, value, tags)
+        self._by_tag = {}
+        self._generations = {}  # tag -> invalidation count
+        self._epoch = 0         # clear() count
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0,
+                       "stale_sets": 0}
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0 and self.ttl > 0
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self._stats["misses"] += 1
+                return None
+            if item[0] <= time.monotonic():
+                self._drop(key)
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._data.move_to_end(key)
+            self._stats["hits"] += 1
+            return item[1]
+
+    def generation(self, tags):
+        """Opaque token for set(generation=): changes once any of tags is invalidated."""
+        with self._lock:
+            return self._generation(tags)
+
+    def set(self, key, value, tags=(), ttl=None, generation=None):
+        if not self.enabled:
+            return
+        tags = frozenset(tags)
+        with self._lock:
+            if generation is not None and generation != self._generation(tags):
+                # built from data a write has since replaced
+                self._stats["stale_sets"] += 1
+                return
+            if key in self._data:
+                self._drop(key)
+            self._data[key] = (time.monotonic() + (ttl or self.ttl), value, tags)
+            for t in tags:
+                self._by_tag.setdefault(t, set()).add(key)
+            while len(self._data) > self.max_entries:
+                oldest = next(iter(self._data))
+                self._drop(oldest)
+                self._stats["evictions"] += 1
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+                self._stats["invalidations"] += 1
+
+    def invalidate_tags(self, tags):
+        with self._lock:
+            keys = set()
+            for t in tags:
+                keys |= self._by_tag.get(t, set())
+                self._generations[t] = self._generations.get(t, 0) + 1
+            for key in keys:
+                self._drop(key)
+            self._stats["invalidations"] += len(keys)
+        return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._stats["invalidations"] += len(self._data)
+            self._epoch += 1
+            self._data.clear()
+            self._by_tag.clear()
+
+    def stats(self):
+        with self._lock:
+            out = dict(self._stats)
+            out["entries"] = len(self._data)
+            out["max_entries"] = self.max_entries
+            out["ttl"] = self.ttl
+        return out
+
+    def _generation(self, tags):
+        return self._epoch, tuple(self._generations.get(t, 0) for t in sorted(set(tags)))
+
+    def _drop(self, key):
+        _, _, tags = self._data.pop(key)
+        for t in tags:
+            keys = self._by_tag.get(t)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[t]
@@ -0,0 +1,81 @@
+# check_migrations.py
+# Migration check for databases that already hold data: creates one from
+# schema.sql, loads registrations / attendance / feedback before the first
+# migrate() (as init_db.py + sample_data.sql or a bulk import would), migrates
+# it, and fails (exit 1) if any event counter differs from COUNT(*) over its
+# base rows or if claim_seat lets a full event take another registration.
+# It then zeroes the counters, as the old 0003 left them on such databases,
+# and checks that re-running the recount migration repairs them.
+#
+#   python check_migrations.py
+import os
+import sqlite3
+import tempfile
+
+import counters
+import init_db
+import migrate
+from registration import claim_seat
+
+db_name = os.path.join(tempfile.mkdtemp(), "migrations.db")
+init_db.run_script(db_name, "schema.sql")
+
+# every event is seeded full: capacity == its registered rows
+EVENTS, STUDENTS = 20, 30
+conn = sqlite3.connect(db_name)
+conn.execute("INSERT INTO college VALUES ('c1','C1')")
+conn.executemany("INSERT INTO student (student_id,name,roll_no,college_id) VALUES (?,?,?,'c1')",
+                 [(f"stu{i}", f"S{i}", f"R{i}") for i in range(STUDENTS)])
+conn.executemany("INSERT INTO event (event_id,title,type,starts_at,capacity,college_id) VALUES (?,?,?,?,?,'c1')",
+                 [(f"ev{e}", f"Event {e}", "Workshop", "2030-01-01T10:00:00", e % 7 + 1) for e in range(EVENTS)])
+registered = [(f"ev{e}", f"stu{s}") for e in range(EVENTS) for s in range(e % 7 + 1)]
+conn.executemany("INSERT INTO registration (event_id,student_id,registered_at,token,status) "
+                 "VALUES (?,?,'2030-01-01T00:00:00',?,'registered')",
+                 [(e, s, f"tok-{e}-{s}") for e, s in registered])
+# a cancelled registration must not count
+conn.execute("INSERT INTO registration (event_id,student_id,registered_at,token,status) "
+             "VALUES ('ev0','stu29','2030-01-01T00:00:00','tok-cancelled','cancelled')")
+conn.executemany("INSERT INTO attendance (event_id,student_id,attended_at,present) VALUES (?,?,'2030-01-01T10:05:00',?)",
+                 [(e, s, i % 3 != 0) for i, (e, s) in enumerate(registered)])
+conn.executemany("INSERT INTO feedback (event_id,student_id,rating,submitted_at) VALUES (?,?,?,'2030-01-02T00:00:00')",
+                 [(e, s, (i % 5 + 1) if i % 4 else None) for i, (e, s) in enumerate(registered)])
+conn.commit()
+conn.close()
+
+failures = []
+
+
+def check_counters(label):
+    conn = sqlite3.connect(db_name)
+    drift = counters.verify(conn)
+    conn.close()
+    for event_id, col, have, want in drift:
+        failures.append(f"{label}: {event_id} {col} stored={have} expected={want}")
+    print(f"{label}: {'ok' if not drift else f'{len(drift)} counter(s) drifted'}")
+
+
+migrate.migrate(db_name, log=lambda msg: None)
+check_counters("pre-seeded database, first migrate")
+
+conn = sqlite3.connect(db_name)
+conn.row_factory = sqlite3.Row
+for e in range(EVENTS):
+    outcome, _, _ = claim_seat(conn, f"ev{e}", "stu28")
+    if outcome != "full":
+        failures.append(f"claim_seat on full ev{e}: {outcome}, expected full")
+print(f"capacity on pre-seeded events: {'ok' if not failures else 'oversubscribed'}")
+
+# a database migrated by the old 0003 kept the zeros; 0017 recounts it
+RECOUNT = 17
+conn.execute("UPDATE event SET registered_count = 0, present_count = 0, feedback_count = 0, "
+             "rating_count = 0, rating_sum = 0")
+conn.execute("DELETE FROM schema_version WHERE version = ?", (RECOUNT,))
+conn.commit()
+conn.close()
+migrate.migrate(db_name, log=lambda msg: None)
+check_counters("zeroed counters, recount migration")
+
+for line in failures:
+    print("FAIL", line)
+print("migrations OK" if not failures else f"{len(failures)} failure(s)")
+raise SystemExit(1 if failures else 0)
@@ -0,0 +1,118 @@
+# check_query_plans.py
+# EXPLAIN QUERY PLAN regression check for the hot endpoints: drives each one
+# through the Flask test client on a seeded temp database, captures the SQL it
+# actually runs, and fails (exit 1) if any statement falls back to a full
+# table scan where an index is expected.
+#
+#   python check_query_plans.py            # summary + failures
+#   python check_query_plans.py --verbose  # print every captured plan
+import argparse
+import os
+import sqlite3
+import tempfile
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--verbose", action="store_true")
+args = parser.parse_args()
+
+os.environ["DB_NAME"] = os.path.join(tempfile.mkdtemp(), "plans.db")
+
+import init_db  # noqa: E402
+init_db.run_script(os.environ["DB_NAME"], "schema.sql")
+
+import app as backend  # noqa: E402
+import features  # noqa: E402
+import indexes  # noqa: E402
+import search  # noqa: E402
+
+flask_app = backend.create_app()
+
+# enough rows that a scan is never the cheapest plan by accident
+conn = sqlite3.connect(os.environ["DB_NAME"])
+conn.execute("INSERT INTO college VALUES ('c1','C1'), ('c2','C2')")
+conn.executemany("INSERT INTO student (student_id,name,roll_no,college_id) VALUES (?,?,?,?)",
+                 [(f"stu{i}", f"S{i}", f"R{i}", f"c{i % 2 + 1}") for i in range(500)])
+conn.executemany("INSERT INTO event (event_id,title,type,starts_at,starts_at_ts,capacity,college_id,features) "
+                 "VALUES (?,?,?,?,?,?,?,?)",
+                 [(f"ev{i}", f"Event {i}", ("Workshop", "Fest", "Seminar")[i % 3], f"2030-01-{i % 28 + 1:02d}T10:00:00",
+                   1893492000 + (i % 28) * 86400, 1000, f"c{i % 2 + 1}", "food") for i in range(200)])
+conn.executemany("INSERT INTO registration (event_id,student_id,registered_at,token,status) VALUES (?,?,?,?,'registered')",
+                 [(f"ev{i % 200}", f"stu{i % 500}", "2030-01-01T00:00:00", f"tok{i}") for i in range(2000)])
+conn.commit()
+conn.close()
+with backend.get_conn() as c:
+    for i in range(200):
+        features.set_event_tags(c, f"ev{i}", "food")
+    search.rebuild(c)
+
+# capture every statement the app sends, on fresh pooled connections
+statements = []
+backend.pool.close_all()
+backend.pool.on_connect = lambda c: c.set_trace_callback(statements.append)
+backend.response_cache.max_entries = 0   # always hit the database
+backend.identity_cache.max_entries = 0
+
+client = flask_app.test_client()
+client.post("/auth/signup", json={"email": "Plans@X", "password": "pw", "role": "admin"})
+
+# (label, method, path, json body, full scan expected)
+SCENARIOS = [
+    ("login", "post", "/auth/login", {"email": "plans@x", "password": "pw"}, False),
+    ("events: first page", "get", "/events?limit=20", None, False),
+    ("events: by college", "get", "/events?college_id=c1&limit=20", None, False),
+    ("events: by type", "get", "/events?type=Fest&limit=20", None, False),
+    ("events: next page", "get", "/events?college_id=c1&limit=20&cursor=", None, False),
+    ("events: search", "get", "/events?search=event&limit=20", None, False),
+    ("events: tag filter", "get", "/events?feature=food&limit=20", None, False),
+    ("events: time window", "get", "/events?from=2030-01-10&to=2030-01-12&limit=20", None, False),
+    ("events: upcoming by college", "get", "/events?upcoming=1&college_id=c1&limit=20", None, False),
+    ("event detail", "get", "/events/ev1", None, False),
+    ("register", "post", "/events/ev1/register", {"student_id": "stu499"}, False),
+    ("attendance: manual", "post", "/events/ev1/attendance", {"student_id": "stu1"}, False),
+    ("attendance: token", "post", "/attendance/token", {"token": "tok2"}, False),
+    ("attendance: batch", "post", "/attendance/batch", {"tokens": ["tok3", "tok4"]}, False),
+    ("attendance: delta sync", "get", "/attendance/sync?event_id=ev1&since=0", None, False),
+    ("feedback", "post", "/feedback/ev1", {"student_id": "stu1", "rating": 4}, False),
+    ("registrations: student", "get", "/registrations?student_id=STU7&limit=10", None, False),
+    ("reports: registrations by college", "get", "/reports/registrations?college_id=c1", None, False),
+    ("reports: attendance for event", "get", "/reports/attendance_percentage?event_id=ev1", None, False),
+    ("reports: feedback by college", "get", "/reports/avg_feedback?college_id=c1", None, False),
+    ("reports: top students by college", "get", "/reports/top-active-students?college_id=c1", None, False),
+    ("export: registrations for event", "get", "/export/registrations.csv?event_id=ev1", None, False),
+    # whole-table reports read every event/student by definition
+    ("reports: registrations (all)", "get", "/reports/registrations", None, True),
+    ("reports: top students (all)", "get", "/reports/top-active-students", None, True),
+]
+
+# a real keyset cursor for the "next page" scenario
+res = client.get("/events?college_id=c1&limit=20")
+SCENARIOS[4] = SCENARIOS[4][:2] + (SCENARIOS[4][2] + res.headers["X-Next-Cursor"],) + SCENARIOS[4][3:]
+
+plan_conn = sqlite3.connect(os.environ["DB_NAME"])
+failures = 0
+for label, method, path, body, scan_ok in SCENARIOS:
+    del statements[:]
+    res = getattr(client, method)(path, json=body)
+    if res.status_code >= 400:
+        print(f"!! {label}: HTTP {res.status_code} {res.get_data(as_text=True)[:120]}")
+        failures += 1
+        continue
+    bad = []
+    for sql in statements:
+        if not sql.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "WITH")):
+            continue
+        scans = indexes.full_scans(plan_conn, sql)
+        if args.verbose:
+            print(f"   {sql.strip()[:110]}")
+            for detail in indexes.explain(plan_conn, sql):
+                print(f"      {detail}")
+        if scans and not scan_ok:
+            bad.append((sql, scans))
+    print(f"{'ok' if not bad else 'FULL SCAN'}  {label}")
+    for sql, scans in bad:
+        print(f"      scan of {', '.join(scans)} in: {' '.join(sql.split())[:160]}")
+    failures += len(bad)
+
+plan_conn.close()
+print("query plans OK" if not failures else f"{failures} statement(s) regressed to full scans")
+raise SystemExit(1 if failures else 0)
@@ -0,0 +1,245 @@
+# check_storage.py
+# Storage backend contract check: drives the same API flow (events, search,
+# paging, registrations, check-in, feedback, reports, exports, archival) through the
+# Flask test client once on a fresh SQLite database and once on a fresh
+# PostgreSQL database (and with --shards on per-college SQLite shards,
+# storage_sharded.py), and fails (exit 1) if any response differs. Timestamps,
+# tokens and ids that are random by design are masked before comparing, and
+# lists whose order is only partly defined (ties in reports, relevance
+# ranking) are compared as multisets.
+#
+#   python check_storage.py                                   # embedded PostgreSQL via pgserver, if installed
+#   python check_storage.py --pg postgresql://user:pw@host/postgres
+#   python check_storage.py --shards                          # also compare the sharded layout
+#
+# --pg (or DATABASE_URL) names a server where the user may CREATE DATABASE; a
+# scratch database is created and dropped. Without PostgreSQL only the SQLite
+# run happens and the comparison is skipped.
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+MASKED = ("token", "registered_at", "attended_at", "submitted_at", "created_at", "since", "cursor")
+# shards number their rows from shard_no << 40
+SHARD_IDS = ("reg_id", "att_id", "fb_id")
+
+
+def _mask(value, masked=MASKED):
+    if isinstance(value, dict):
+        return {k: ("*" if k in masked and v is not None else _mask(v, masked)) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_mask(v, masked) for v in value]
+    return value
+
+
+def _compare(base, other, name):
+    """Print the responses of other (run on backend name) that differ from base; returns how many."""
+    failures = 0
+    for (label, b_status, b_body), (_, o_status, o_body) in zip(base, other):
+        if (b_status, b_body) != (o_status, o_body):
+            failures += 1
+            print(f"DIFF  {label}")
+            print(f"      sqlite   {b_status} {json.dumps(b_body)[:300]}")
+            print(f"      {name:<8} {o_status} {json.dumps(o_body)[:300]}")
+    return failures
+
+
+def run_flow():
+    """The API flow; returns [(label, status, body)]. Runs in a child process per backend."""
+    import app as backend
+    flask_app = backend.create_app()
+    store = backend.store
+    store.execute("INSERT INTO college (college_id, name) VALUES ('c1', 'C1'), ('c2', 'C2')")
+    for i in range(6):
+        store.execute("INSERT INTO student (student_id, name, roll_no, college_id) VALUES (?, ?, ?, ?)",
+                      (f"stu{i}", f"S{i}", f"R{i}", f"c{i % 2 + 1}"))
+    client = flask_app.test_client()
+    out = []
+
+    def call(label, method, path, body=None, unordered=False, csv_shape=False):
+        res = getattr(client, method)(path, json=body)
+        if csv_shape:
+            # raw exports carry timestamp columns: compare the header and row count
+            lines = res.get_data(as_text=True).splitlines()
+            data = [lines[0], len(lines)]
+        else:
+            data = _mask(res.get_json(silent=True))
+            if unordered and isinstance(data, list):
+                data = sorted(data, key=lambda r: json.dumps(r, sort_keys=True))
+        out.append((label, res.status_code, data))
+        return res
+
+    call("signup", "post", "/auth/signup", {"email": "Check@X", "password": "pw", "role": "admin", "name": "C"})
+    call("signup again", "post", "/auth/signup", {"email": "check@x", "password": "pw"})
+    call("login", "post", "/auth/login", {"email": "check@x", "password": "pw"})
+    events = [
+        {"event_id": "ev1", "title": "Intro Python Workshop", "type": "Workshop", "starts_at": "2030-01-01T10:00:00",
+         "capacity": 2, "college_id": "c1", "features": "food, Certificate", "description": "learn python basics"},
+        {"event_id": "ev2", "title": "Robotics Hackathon", "type": "Hackathon", "starts_at": "2030-01-02T10:00:00",
+         "college_id": "c1", "features": "food,prizes", "description": "build robots with python"},
+        {"event_id": "ev3", "title": "Music Fest", "type": "Fest", "starts_at": "2030-01-03T10:00:00",
+         "capacity": 100, "college_id": "c2", "features": "", "cancelled_flag": False},
+        {"event_id": "ev4", "title": "Chess Talk", "type": "Talk", "starts_at": "2030-01-04T10:00:00",
+         "capacity": 10, "college_id": "c2", "features": "online"},
+        {"event_id": "ev5", "title": "Past Python Meetup", "type": "Talk", "starts_at": "02/03/2020 18:00",
+         "college_id": "c1", "features": "food"},
+    ]
+    for ev in events:
+        call("create " + ev["event_id"], "post", "/events", ev)
+    call("create duplicate", "post", "/events", events[0])
+    call("events", "get", "/events")
+    call("events by college", "get", "/events?college_id=c1")
+    call("events by type", "get", "/events?type=Fest")
+    call("events search", "get", "/events?search=pyth")
+    call("events search ranked", "get", "/events?search=python&sort=relevance", unordered=True)
+    call("events tags all", "get", "/events?feature=food,certificate")
+    call("events tags any", "get", "/events?feature=food,online&feature_match=any")
+    call("events facets", "get", "/events?facets=1")
+    call("events fields", "get", "/events?fields=event_id,title")
+    page = call("events page 1", "get", "/events?limit=3")
+    call("events page 2", "get", "/events?limit=3&cursor=" + page.headers.get("X-Next-Cursor", ""))
+    call("events bad cursor", "get", "/events?limit=3&cursor=zzz")
+    call("events window", "get", "/events?from=2030-01-02&to=2030-01-03T23:59:59Z")
+    call("events upcoming", "get", "/events?upcoming=1&college_id=c1&fields=event_id")
+    call("events bad window", "get", "/events?from=soon")
+    call("event detail", "get", "/events/ev1")
+    call("event missing", "get", "/events/nope")
+    call("update event", "put", "/events/ev4", {"title": "Chess Strategy Talk", "features": "online,swag"})
+    call("updated search", "get", "/events?search=strategy")
+    call("delete event", "delete", "/events/ev3")
+    call("events after delete", "get", "/events")
+
+    for sid in ("stu0", "STU1", "stu2"):
+        call("register " + sid, "post", "/events/ev1/register", {"student_id": sid})
+    call("register waitlist", "post", "/events/ev1/register", {"student_id": "stu3", "waitlist": True})
+    call("register again", "post", "/events/ev1/register", {"student_id": "stu0"})
+    call("register missing", "post", "/events/nope/register", {"student_id": "stu0"})
+    for sid in ("stu0", "stu1", "stu4"):
+        call("register ev2 " + sid, "post", "/events/ev2/register", {"student_id": sid})
+    for sid in ("stu0", "stu2"):
+        call("register ev5 " + sid, "post", "/events/ev5/register", {"student_id": sid})
+    regs = call("registrations", "get", "/registrations?student_id=STU0&limit=1")
+    call("registrations page 2", "get", "/registrations?student_id=stu0&limit=1&cursor=" +
+         regs.headers.get("X-Next-Cursor", ""))
+    tokens = [r["token"] for r in client.get("/registrations?student_id=stu1").get_json()]
+
+    call("attendance manual", "post", "/events/ev1/attendance", {"student_id": "STU0"})
+    call("attendance token", "post", "/attendance/token", {"token": tokens[0]})
+    call("attendance bad token", "post", "/attendance/token", {"token": "nope"})
+    call("attendance batch", "post", "/attendance/batch",
+         {"tokens": tokens + ["nope"], "event_id": "ev2", "student_ids": ["stu4", "stu5", "stu4"]})
+    scans = [{"key": "k1", "event_id": "ev2", "student_id": "stu0", "scanned_at": "2030-01-02T11:00:00Z"},
+             {"key": "k2", "token": "nope"}]
+    call("sync", "post", "/attendance/sync", {"device_id": "gate1", "scans": scans, "event_id": "ev2", "since": 0})
+    call("sync replay", "post", "/attendance/sync", {"device_id": "gate1", "scans": scans})
+    call("sync changes", "get", "/attendance/sync?event_id=ev1&since=0")
+    call("attendance ev5", "post", "/attendance/batch", {"event_id": "ev5", "student_ids": ["stu0", "stu2"]})
+    call("feedback ev5", "post", "/feedback/ev5", {"student_id": "stu2", "rating": 1})
+    for sid, rating in (("stu0", 5), ("stu1", 4), ("stu4", 2), ("STU4", 3)):
+        call("feedback " + sid, "post", "/feedback/ev2", {"student_id": sid, "rating": rating, "comment": "ok"})
+    call("feedback bad rating", "post", "/feedback/ev2", {"student_id": "stu0", "rating": 9})
+    backend.feedback_queue.flush()  # write-behind: make the batch visible to the reports below
+    backend.report_folder.fold()  # what the background folder does every REPORT_FOLD_S
+
+    for name in ("registrations", "attendance_percentage", "top-active-students", "avg_feedback"):
+        call("report " + name, "get", "/reports/" + name, unordered=True)
+        call("report fresh " + name, "get", f"/reports/{name}?fresh=1", unordered=True)
+    call("report by college", "get", "/reports/registrations?college_id=c2", unordered=True)
+    call("report by event", "get", "/reports/attendance_percentage?event_id=ev2")
+    call("report top 2", "get", "/reports/top-active-students?limit=2", unordered=True)
+    for dataset in ("registrations", "attendance", "feedback"):
+        call("export " + dataset, "get", f"/export/{dataset}.csv", csv_shape=True)
+    for dataset in ("feedback", "reports/attendance_percentage", "reports/top-active-students"):
+        res = client.get(f"/export/{dataset}.ndjson")
+        rows = [_mask(json.loads(line)) for line in res.get_data(as_text=True).splitlines()]
+        out.append(("export ndjson " + dataset, res.status_code, sorted(rows, key=lambda r: json.dumps(r, sort_keys=True))))
+
+    out.append(("archive", 200, store.archive_events(int(time.time()))))
+    backend.response_cache.clear()
+    call("events after archive", "get", "/events?fields=event_id")
+    call("archived event", "get", "/events/ev5")
+    call("registrations after archive", "get", "/registrations?student_id=stu0")
+    for name in ("registrations", "attendance_percentage", "top-active-students", "avg_feedback"):
+        call("report hot " + name, "get", "/reports/" + name, unordered=True)
+        call("report archived " + name, "get", f"/reports/{name}?archived=1", unordered=True)
+    call("report archived by college", "get", "/reports/registrations?archived=1&college_id=c1", unordered=True)
+    store.close()
+    return out
+
+
+def _child(url):
+    env = dict(os.environ, DATABASE_URL=url, METRICS_ENABLED="0", FEEDBACK_SPOOL_DIR=tempfile.mkdtemp())
+    proc = subprocess.run([sys.executable, __file__, "--child"], cwd=HERE, env=env, capture_output=True, text=True)
+    if proc.returncode:
+        sys.stderr.write(proc.stderr)
+        raise SystemExit(f"flow failed on {url}")
+    return json.loads(proc.stdout.splitlines()[-1])
+
+
+@contextmanager
+def scratch_postgres(url):
+    """A fresh database on the server at url (or on an embedded pgserver); yields its URL or None."""
+    server = None
+    if not url:
+        try:
+            import pgserver
+        except ImportError:
+            yield None
+            return
+        server = pgserver.get_server(tempfile.mkdtemp(), cleanup_mode="delete")
+        url = server.get_uri()
+    import psycopg
+    from psycopg.conninfo import conninfo_to_dict, make_conninfo
+    name = "check_storage_" + uuid.uuid4().hex[:8]
+    with psycopg.connect(url, autocommit=True) as conn:
+        conn.execute(f"CREATE DATABASE {name}")
+    try:
+        info = conninfo_to_dict(url)
+        info["dbname"] = name
+        yield "postgresql://?" + make_conninfo(**info).replace(" ", "&")
+    finally:
+        with psycopg.connect(url, autocommit=True) as conn:
+            conn.execute(f"DROP DATABASE IF EXISTS {name} WITH (FORCE)")
+        if server is not None:
+            server.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pg", default=os.environ.get("DATABASE_URL", "") if
+                        os.environ.get("DATABASE_URL", "").startswith("postgres") else "",
+                        help="PostgreSQL server URL (default: embedded pgserver)")
+    parser.add_argument("--shards", action="store_true", help="also run on shards:<tmpdir> and compare")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        if not os.environ["DATABASE_URL"].startswith(("postgres", "shards:")):
+            import init_db
+            init_db.run_script(os.environ["DATABASE_URL"], "schema.sql")
+        print(json.dumps(run_flow()))
+        raise SystemExit(0)
+
+    sqlite_results = _child(os.path.join(tempfile.mkdtemp(), "check.db"))
+    print(f"sqlite: {len(sqlite_results)} responses")
+    failures = 0
+    if args.shards:
+        shard_results = _child("shards:" + tempfile.mkdtemp())
+        print(f"shards: {len(shard_results)} responses")
+        failures += _compare(_mask(sqlite_results, SHARD_IDS), _mask(shard_results, SHARD_IDS), "shards")
+    with scratch_postgres(args.pg) as pg_url:
+        if pg_url is None:
+            print("PostgreSQL not available (pass --pg or pip install pgserver); comparison skipped")
+        else:
+            pg_results = _child(pg_url)
+            print(f"postgres: {len(pg_results)} responses")
+            failures += _compare(sqlite_results, pg_results, "postgres")
+    print("storage backends agree" if not failures else f"{failures} response(s) differ")
+    raise SystemExit(1 if failures else 0)
@@ -0,0 +1,62 @@
+# backend/counters.py
+# Per-event aggregate counters kept on the event row by triggers, so listings
+# and reports read O(events) rows instead of joining the history tables. The
+# columns and triggers come from migrations/0003_event_counters.py.
+#
+#   python counters.py            # rebuild counters from base tables
+#   python counters.py --verify   # report drift without changing anything
+import argparse
+import sqlite3
+
+import migrate
+
+COUNTER_COLUMNS = ("registered_count", "present_count", "feedback_count", "rating_count", "rating_sum")
+
+# what each counter should be, recomputed from the base tables
+EXPECTED_SQL = """
+  SELECT e.event_id,
+         (SELECT COUNT(*) FROM registration r WHERE r.event_id = e.event_id AND r.status = 'registered') AS registered_count,
+         (SELECT COUNT(*) FROM attendance a WHERE a.event_id = e.event_id AND a.present = 1) AS present_count,
+         (SELECT COUNT(*) FROM feedback f WHERE f.event_id = e.event_id) AS feedback_count,
+         (SELECT COUNT(f.rating) FROM feedback f WHERE f.event_id = e.event_id) AS rating_count,
+         (SELECT COALESCE(SUM(f.rating), 0) FROM feedback f WHERE f.event_id = e.event_id) AS rating_sum
+  FROM event e
+"""
+
+
+def rebuild(conn):
+    """Recompute every counter from registration/attendance/feedback."""
+    sets = ", ".join(f"{n} = x.{n}" for n in COUNTER_COLUMNS)
+    conn.execute(f"UPDATE event SET {sets} FROM ({EXPECTED_SQL}) AS x WHERE x.event_id = event.event_id")
+    conn.commit()
+
+
+def verify(conn):
+    """Return a list of (event_id, column, stored, expected) for every drifted counter."""
+    stored = {r[0]: r[1:] for r in conn.execute("SELECT event_id, " + ", ".join(COUNTER_COLUMNS) + " FROM event")}
+    drift = []
+    for row in conn.execute(EXPECTED_SQL):
+        have = stored.get(row[0])
+        for i, n in enumerate(COUNTER_COLUMNS):
+            if have is not None and have[i] != row[i + 1]:
+                drift.append((row[0], n, have[i], row[i + 1]))
+    return drift
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild or verify per-event counters")
+    parser.add_argument("--db", default="events.db")
+    parser.add_argument("--verify", action="store_true", help="only report drift")
+    args = parser.parse_args()
+    migrate.migrate(args.db)
+    conn = sqlite3.connect(args.db)
+    if args.verify:
+        drift = verify(conn)
+        for event_id, col, have, want in drift:
+            print(f"{event_id}: {col} stored={have} expected={want}")
+        print("counters OK" if not drift else f"{len(drift)} counter(s) drifted")
+        conn.close()
+        raise SystemExit(1 if drift else 0)
+    rebuild(conn)
+    print("✅ counters rebuilt")
+    conn.close()
@@ -0,0 +1,160 @@
+# backend/db.py
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+def is_busy_error(exc):
+    code = getattr(exc, "sqlite_errorcode", None)
+    if code is not None:
+        return code in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+    msg = str(exc).lower()
+    return "locked" in msg or "busy" in msg
+
+
+def with_busy_retry(get_conn, fn, retries=5, backoff_s=0.02):
+    """
+    Run fn(conn) on a pooled connection, retrying with jittered exponential
+    backoff while the database write lock is contended (SQLITE_BUSY).
+    """
+    attempt = 0
+    while True:
+        try:
+            with get_conn() as conn:
+                return fn(conn)
+        except sqlite3.OperationalError as e:
+            attempt += 1
+            if not is_busy_error(e) or attempt > retries:
+                raise
+            time.sleep(backoff_s * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5))
+
+
+class ConnectionPool:
+    """
+    Bounded pool of SQLite connections.
+
+    A thread that already holds a connection gets the same one back, so nested
+    helpers (require_session inside a handler, query() inside a transaction)
+    share it instead of opening another. Released connections go back on a
+    LIFO idle list, so the next checkout gets a warm connection with its
+    prepared-statement cache intact. on_connect(conn), if set, runs once per
+    new connection (tracing, instrumentation); factory is the sqlite3.Connection
+    class to open, for instrumented subclasses.
+    """
+
+    def __init__(self, db_name, max_size=16, busy_timeout_ms=5000,
+                 cached_statements=256, checkout_timeout=30.0, on_connect=None,
+                 factory=sqlite3.Connection):
+        self.db_name = db_name
+        self.max_size = max_size
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cached_statements = cached_statements
+        self.checkout_timeout = checkout_timeout
+        self.on_connect = on_connect
+        self.factory = factory
+        self._idle = []
+        self._open = 0
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self._stats = {"checkouts": 0, "reused": 0, "waits": 0, "timeouts": 0, "created": 0}
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.db_name,
+            timeout=self.busy_timeout_ms / 1000.0,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+            factory=self.factory,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=%d" % int(self.busy_timeout_ms))
+        if self.on_connect is not None:
+            self.on_connect(conn)
+        return conn
+
+    def acquire(self):
+        held = getattr(self._local, "conn", None)
+        if held is not None:
+            self._local.depth += 1
+            return held
+        conn = None
+        with self._cond:
+            self._stats["checkouts"] += 1
+            deadline = None
+            while not self._idle and self._open >= self.max_size:
+                if deadline is None:
+                    self._stats["waits"] += 1
+                    deadline = time.monotonic() + self.checkout_timeout
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise PoolTimeout("no free connection after %.1fs" % self.checkout_timeout)
+                self._cond.wait(remaining)
+            if self._idle:
+                conn = self._idle.pop()
+                self._stats["reused"] += 1
+            else:
+                self._open += 1
+                self._stats["created"] += 1
+        if conn is None:
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._cond:
+                    self._open -= 1
+                    self._cond.notify()
+                raise
+        self._local.conn = conn
+        self._local.depth = 1
+        return conn
+
+    def release(self, conn):
+        self._local.depth -= 1
+        if self._local.depth > 0:
+            return
+        self._local.conn = None
+        try:
+            # never hand a half-finished transaction to the next caller
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            conn.close()
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            return
+        with self._cond:
+            self._idle.append(conn)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def stats(self):
+        with self._cond:
+            out = dict(self._stats)
+            out["open"] = self._open
+            out["idle"] = len(self._idle)
+            out["in_use"] = self._open - len(self._idle)
+            out["max_size"] = self.max_size
+        return out
+
+    def close_all(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+        for conn in idle:
+            conn.close()
@@ -0,0 +1,93 @@
+# backend/export.py
+# Streaming CSV / NDJSON exports. Rows are pulled from the cursor in batches
+# and encoded as they go, so memory stays flat however many rows there are.
+import csv
+import io
+import json
+
+BATCH_SIZE = 1000
+FORMATS = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+# a leading = + - @ makes spreadsheets evaluate the cell as a formula
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_safe(value):
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def stream_rows(store, sql, params=(), fmt="csv", batch_size=BATCH_SIZE):
+    """
+    Generator of encoded chunks for the rows of sql, read through
+    store.stream(). The pooled connection is held only while the generator
+    runs and is released when it finishes or the client goes away (the WSGI
+    server closes the generator).
+    """
+    batches = store.stream(sql, params, batch_size)
+    try:
+        cols = next(batches)
+        buf = io.StringIO()
+        writer = csv.writer(buf) if fmt == "csv" else None
+        if writer:
+            writer.writerow(cols)
+        for rows in batches:
+            if writer:
+                writer.writerows([_csv_safe(v) for v in row] for row in rows)
+            else:
+                for row in rows:
+                    buf.write(json.dumps(dict(zip(cols, row)), default=str))
+                    buf.write("\n")
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate()
+        tail = buf.getvalue()
+        if tail:
+            yield tail.encode("utf-8")
+    finally:
+        batches.close()
+
+
+# ---------------- roster queries ----------------
+# (sql, params) for the raw exports; filters only when given.
+
+def _where(filters):
+    clauses = [sql for sql, value in filters if value]
+    params = tuple(value for _, value in filters if value)
+    return ("WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def registrations_sql(event_id=None, college_id=None):
+    where, params = _where([("r.event_id = ?", event_id), ("e.college_id = ?", college_id)])
+    return f"""
+      SELECT r.reg_id, r.event_id, e.title AS event_title, r.student_id, s.name AS student_name,
+             s.roll_no, r.status, r.registered_at
+      FROM registration r
+      LEFT JOIN event e ON e.event_id = r.event_id
+      LEFT JOIN student s ON lower(s.student_id) = lower(r.student_id)
+      {where}
+      ORDER BY r.reg_id
+    """, params
+
+
+def attendance_sql(event_id=None, college_id=None):
+    where, params = _where([("a.event_id = ?", event_id), ("e.college_id = ?", college_id)])
+    return f"""
+      SELECT a.att_id, a.event_id, e.title AS event_title, a.student_id, a.attended_at, a.present
+      FROM attendance a
+      LEFT JOIN event e ON e.event_id = a.event_id
+      {where}
+      ORDER BY a.att_id
+    """, params
+
+
+def feedback_sql(event_id=None, college_id=None):
+    where, params = _where([("f.event_id = ?", event_id), ("e.college_id = ?", college_id)])
+    return f"""
+      SELECT f.fb_id, f.event_id, e.title AS event_title, f.student_id, f.rating, f.comment, f.submitted_at
+      FROM feedback f
+      LEFT JOIN event e ON e.event_id = f.event_id
+      {where}
+      ORDER BY f.fb_id
+    """, params
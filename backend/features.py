@@ -0,0 +1,48 @@
+# backend/features.py
+# Normalized event feature tags: one event_feature row per (event, tag),
+# indexed on tag, so feature filters and facet counts run in SQL.
+# event.features stays the source text; set_event_tags() re-derives the rows
+# whenever it is written. The table and its delete trigger come from
+# migrations/0005_feature_tags.py.
+
+
+def parse_tags(features):
+    """'Food, Certificate,,food' -> ['certificate', 'food']"""
+    if not features:
+        return []
+    return sorted({t.strip().lower() for t in str(features).split(",") if t.strip()})
+
+
+def parse_filter(values):
+    """Tags from ?feature= (repeated and/or comma-separated)."""
+    tags = []
+    for v in values:
+        for t in parse_tags(v):
+            if t not in tags:
+                tags.append(t)
+    return tags
+
+
+def set_event_tags(conn, event_id, features):
+    """Replace the tag rows for one event (caller commits)."""
+    conn.execute("DELETE FROM event_feature WHERE event_id = ?", (event_id,))
+    conn.executemany("INSERT INTO event_feature (event_id, tag) VALUES (?, ?)",
+                     [(event_id, t) for t in parse_tags(features)])
+
+
+def filter_clause(tags, match_all=True):
+    """WHERE fragment (on alias e) selecting events with all/any of the tags."""
+    marks = ",".join("?" * len(tags))
+    if match_all and len(tags) > 1:
+        sql = (f"e.event_id IN (SELECT event_id FROM event_feature WHERE tag IN ({marks}) "
+               f"GROUP BY event_id HAVING COUNT(*) = ?)")
+        return sql, list(tags) + [len(tags)]
+    return f"e.event_id IN (SELECT event_id FROM event_feature WHERE tag IN ({marks}))", list(tags)
+
+
+def facets_sql(where):
+    """Tag counts over the events matched by the given WHERE fragments."""
+    sql = "SELECT f.tag, COUNT(*) AS count FROM event_feature f JOIN event e ON e.event_id = f.event_id"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    return sql + " GROUP BY f.tag ORDER BY count DESC, f.tag ASC"
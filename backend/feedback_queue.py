@@ -0,0 +1,240 @@
+# backend/feedback_queue.py
+# Write-behind buffer for POST /feedback. A burst of ratings when an event
+# ends used to be hundreds of single-row INSERTs, each taking SQLite's write
+# lock in between registrations and check-ins. Now a submission is validated,
+# appended to a local spool file and queued in memory, and one flusher thread
+# per process writes the queue as a single executemany transaction whenever
+# max_batch rows are waiting or flush_interval seconds have passed.
+#
+# Feedback is one row per (event_id, student_id): resubmitting replaces the
+# rating and comment (the newest submitted_at wins), and the counter
+# triggers move event.feedback_count / rating_sum in the same transaction.
+# Because a row can be applied twice without harm, a crash only ever repeats
+# work: spool files left behind by a dead process are replayed at start.
+#
+# A batch that fails with one of the `transient` errors (database locked or
+# down) waits for the next round as a whole. Any other failure is the rows':
+# the batch is split in halves until the failing rows are isolated, so one bad
+# row never holds back the rest. A row that fails on its own max_attempts
+# times goes to the dead-letter file <spool_dir>/feedback-dead.jsonl, with a
+# log line, and is not retried.
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+UPSERT_SQL = """
+    INSERT INTO feedback (event_id, student_id, rating, comment, submitted_at)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(event_id, student_id) DO UPDATE SET
+        rating = excluded.rating,
+        comment = excluded.comment,
+        submitted_at = excluded.submitted_at
+    WHERE feedback.submitted_at IS NULL OR excluded.submitted_at >= feedback.submitted_at
+"""
+
+MAX_COMMENT = 2000
+
+
+class FeedbackQueueFull(Exception):
+    retry_after = 1
+
+
+class FeedbackQueue:
+    """
+    write_batch(rows) stores a list of (event_id, student_id, rating, comment,
+    submitted_at) tuples in one transaction and returns their event ids;
+    on_flush(event_ids) runs after each committed batch (cache invalidation);
+    transient is the storage's transient_errors.
+    """
+
+    def __init__(self, write_batch, spool_dir, max_batch=200, flush_interval=0.5, max_pending=20000,
+                 fsync=False, on_flush=None, max_attempts=3, transient=()):
+        self.write_batch = write_batch
+        self.spool_dir = spool_dir
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.fsync = fsync  # also survive power loss, at one fsync per submission
+        self.on_flush = on_flush
+        self.max_attempts = max_attempts
+        self.transient = tuple(transient)
+        self._attempts = {}  # row -> times it failed on its own
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._queue = []
+        self._spool = None      # open spool file receiving new submissions
+        self._spool_seq = 0
+        self._owner = None      # "<pid>-<start time>": names this process's spool files
+        self._done_files = []   # spool files whose rows are all in _queue
+        self._thread = None
+        self._stats = {"queued": 0, "flushed": 0, "batches": 0, "replayed": 0, "rejected": 0, "errors": 0,
+                       "dead_lettered": 0}
+
+    # ---------------- producers ----------------
+    def submit(self, event_id, student_id, rating, comment, submitted_at):
+        row = (event_id, student_id, rating, comment, submitted_at)
+        line = json.dumps(row) + "\n"
+        with self._cond:
+            if self._thread is None:
+                self._start()
+            if len(self._queue) >= self.max_pending:
+                self._stats["rejected"] += 1
+                raise FeedbackQueueFull(f"{len(self._queue)} feedback rows waiting")
+            if self._spool is None:
+                self._spool = open(self._spool_path(), "a", encoding="utf-8")
+            self._spool.write(line)
+            self._spool.flush()
+            if self.fsync:
+                os.fsync(self._spool.fileno())
+            self._queue.append(row)
+            self._stats["queued"] += 1
+            if len(self._queue) >= self.max_batch:
+                self._cond.notify()
+
+    def start(self):
+        with self._cond:
+            if self._thread is None:
+                self._start()
+
+    def _spool_path(self):
+        self._spool_seq += 1
+        return os.path.join(self.spool_dir, f"feedback-{self._owner}-{self._spool_seq}.spool")
+
+    def _start(self):
+        # after fork: the worker's own pid, plus its start time in case a pid is reused
+        self._owner = f"{os.getpid()}-{time.time_ns() // 1000000:x}"
+        os.makedirs(self.spool_dir, exist_ok=True)
+        self._replay_orphans()
+        self._thread = threading.Thread(target=self._run, name="feedback-flusher", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _replay_orphans(self):
+        """Queue the rows of spool files whose process is gone (claimed by renaming, so only one worker replays each)."""
+        for fname in sorted(os.listdir(self.spool_dir)):
+            parts = fname[:-len(".spool")].split("-")
+            if not (fname.startswith("feedback-") and fname.endswith(".spool") and len(parts) == 4 and parts[1].isdigit()):
+                continue
+            pid, owner = int(parts[1]), f"{parts[1]}-{parts[2]}"
+            if owner == self._owner or (pid != os.getpid() and _alive(pid)):
+                continue
+            mine = self._spool_path()
+            try:
+                os.rename(os.path.join(self.spool_dir, fname), mine)
+            except FileNotFoundError:
+                continue  # another worker claimed it
+            with open(mine, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self._queue.append(tuple(json.loads(line)))
+                        self._stats["replayed"] += 1
+                    except ValueError:
+                        pass  # torn last line from the crash
+            self._done_files.append(mine)
+
+    # ---------------- flusher ----------------
+    def _run(self):
+        while True:
+            with self._cond:
+                if len(self._queue) < self.max_batch:
+                    self._cond.wait(self.flush_interval)
+            try:
+                self.flush()
+            except Exception:
+                time.sleep(self.flush_interval)  # database locked / down: keep the rows and retry
+
+    def flush(self):
+        """Write everything queued so far (one transaction unless a row fails); returns the number of rows written."""
+        with self._flush_lock:
+            with self._cond:
+                if not self._queue:
+                    return 0
+                rows, self._queue = self._queue, []
+                if self._spool is not None:
+                    self._spool.close()
+                    self._done_files.append(self._spool.name)
+                    self._spool = None
+                files, self._done_files = self._done_files, []
+            event_ids, failed = set(), []
+            written = self._write(rows, event_ids, failed)
+            retry = [row for row, error in failed
+                     if isinstance(error, self.transient) or not self._dead_letter(row, error)]
+            if retry:
+                # the spool files still hold these rows
+                with self._cond:
+                    self._queue[:0] = retry
+                    self._done_files[:0] = files
+                    self._stats["errors"] += 1
+            else:
+                for path in files:
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+            with self._cond:
+                self._stats["flushed"] += written
+                self._stats["batches"] += 1
+        if self.on_flush and event_ids:
+            self.on_flush(sorted(event_ids))
+        transient = [error for _, error in failed if isinstance(error, self.transient)]
+        if transient:
+            raise transient[0]  # the flusher backs off before the next round
+        return written
+
+    def _write(self, rows, event_ids, failed):
+        """Write rows, halving a batch the rows make fail; returns the number written, (row, error) of the rest go to failed."""
+        try:
+            event_ids.update(self.write_batch(rows))
+        except Exception as e:
+            if len(rows) == 1 or isinstance(e, self.transient):
+                failed.extend((row, e) for row in rows)
+                return 0
+            half = len(rows) // 2
+            return self._write(rows[:half], event_ids, failed) + self._write(rows[half:], event_ids, failed)
+        for row in rows:
+            self._attempts.pop(row, None)
+        return len(rows)
+
+    def _dead_letter(self, row, error):
+        """Count a failure of row on its own; at max_attempts move it to the dead-letter file (True)."""
+        attempts = self._attempts.get(row, 0) + 1
+        if attempts < self.max_attempts:
+            self._attempts[row] = attempts
+            return False
+        self._attempts.pop(row, None)
+        path = os.path.join(self.spool_dir, "feedback-dead.jsonl")
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"row": row, "error": f"{type(error).__name__}: {error}", "attempts": attempts,
+                                "at": time.time()}) + "\n")
+        log.error("feedback row %r dropped after %d attempt(s) (%s: %s); kept in %s",
+                  row, attempts, type(error).__name__, error, path)
+        with self._cond:
+            self._stats["dead_lettered"] += 1
+        return True
+
+    def close(self):
+        """Best-effort final flush (at exit); anything left stays in the spool for the next start."""
+        try:
+            self.flush()
+        except Exception:
+            pass
+
+    def stats(self):
+        with self._cond:
+            return dict(self._stats, pending=len(self._queue), max_batch=self.max_batch,
+                        flush_interval=self.flush_interval)
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -0,0 +1,174 @@
+# backend/gate.py
+# Check-in without a database read per scan. Registration tokens are signed:
+# "1.<payload>.<mac>", where payload is base64url of reg_id / event_id /
+# student_id and mac a truncated HMAC-SHA256 over it, so a gate can tell who a
+# token belongs to from the token alone. Whether the registration still
+# counts comes from a per-event roster (reg_id -> status) loaded once before
+# doors open (or on the first scan for the event) and held in memory.
+#
+# Random tokens issued before signing (secrets.token_urlsafe, never a "."),
+# signed tokens the roster does not know yet (registered on another node
+# since it was loaded) and signed tokens whose MAC does not check out here
+# (signed under a key since retired, or otherwise unreadable) are left to the
+# registration-table lookup as before: only that lookup rejects a token.
+# Ids are joined with SEP inside the payload, so ids containing it are
+# refused when events and registrations are created (valid_id).
+import base64
+import hashlib
+import hmac
+import threading
+import time
+from collections import OrderedDict
+
+VERSION = "1"
+MAC_BYTES = 12
+SEP = "\x1f"
+
+
+def _b64(raw):
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _unb64(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def is_signed(token):
+    return isinstance(token, str) and token.startswith(VERSION + ".")
+
+
+def valid_id(value):
+    """Whether value can be carried in a token payload (no SEP)."""
+    return SEP not in value
+
+
+def peek(token):
+    """(reg_id, event_id, student_id) from a signed token's payload, unverified: for routing only."""
+    if not is_signed(token) or token.count(".") != 2:
+        return None
+    try:
+        reg_id, event_id, student_id = _unb64(token.split(".")[1]).decode().split(SEP)
+        return int(reg_id), event_id, student_id
+    except (ValueError, UnicodeError):
+        return None
+
+
+class TokenSigner:
+    """
+    keys: secrets, newest first. Tokens are signed with keys[0] and accepted
+    under any of them, so a key can be rotated without voiding issued tokens.
+    """
+
+    def __init__(self, keys):
+        self.keys = [k.encode() if isinstance(k, str) else k for k in keys if k]
+        if not self.keys:
+            raise ValueError("TokenSigner needs at least one key")
+
+    def _mac(self, key, payload):
+        return _b64(hmac.new(key, payload.encode("ascii"), hashlib.sha256).digest()[:MAC_BYTES])
+
+    def sign(self, reg_id, event_id, student_id):
+        payload = _b64(SEP.join((str(reg_id), event_id, student_id)).encode())
+        return f"{VERSION}.{payload}.{self._mac(self.keys[0], payload)}"
+
+    def verify(self, token):
+        """(reg_id, event_id, student_id) for a genuine signed token, else None."""
+        if not is_signed(token):
+            return None
+        parts = token.split(".")
+        if len(parts) != 3:
+            return None
+        payload, mac = parts[1], parts[2]
+        try:
+            if not any(hmac.compare_digest(self._mac(k, payload), mac) for k in self.keys):
+                return None
+            reg_id, event_id, student_id = _unb64(payload).decode().split(SEP)
+            return int(reg_id), event_id, student_id
+        except (ValueError, UnicodeError):
+            return None
+
+
+class GateRosters:
+    """
+    Per-event registration rosters for signed-token check-in. load(event_id)
+    returns {reg_id: status} for the event's registrations; a roster is
+    reloaded after ttl seconds so status changes made elsewhere show up, and
+    at most max_events rosters are kept (least recently scanned dropped).
+    """
+
+    def __init__(self, signer, load, ttl=300.0, max_events=256):
+        self.signer = signer
+        self.load = load
+        self.ttl = ttl
+        self.max_events = max_events
+        self._rosters = OrderedDict()  # event_id -> (loaded_at, {reg_id: status})
+        self._lock = threading.Lock()
+        self._stats = {"accepted": 0, "rejected": 0, "unverified": 0, "unknown": 0, "loads": 0}
+
+    def preload(self, event_id):
+        """Load (or reload) event_id's roster; returns {"registered": n, "revoked": m}."""
+        roster = self.load(event_id)
+        with self._lock:
+            self._stats["loads"] += 1
+            self._rosters[event_id] = (time.monotonic(), roster)
+            self._rosters.move_to_end(event_id)
+            while len(self._rosters) > self.max_events:
+                self._rosters.popitem(last=False)
+        registered = sum(1 for s in roster.values() if s == "registered")
+        return {"registered": registered, "revoked": len(roster) - registered}
+
+    def _roster(self, event_id):
+        with self._lock:
+            item = self._rosters.get(event_id)
+            if item is not None and time.monotonic() - item[0] < self.ttl:
+                self._rosters.move_to_end(event_id)
+                return item[1]
+        self.preload(event_id)
+        with self._lock:
+            return self._rosters[event_id][1]
+
+    def resolve(self, tokens):
+        """
+        {token: (event_id, student_id)} for the signed tokens that are
+        registered, {token: None} for revoked ones. Tokens missing from the
+        result (unsigned, not verifiable with the current keys, or not in the
+        roster) need the database.
+        """
+        out = {}
+        for token in tokens:
+            if not is_signed(token) or token in out:
+                continue
+            claim = self.signer.verify(token)
+            if claim is None:
+                self._count("unverified")
+                continue
+            reg_id, event_id, student_id = claim
+            status = self._roster(event_id).get(reg_id)
+            if status is None:
+                self._count("unknown")
+            elif status == "registered":
+                out[token] = (event_id, student_id)
+                self._count("accepted")
+            else:
+                out[token] = None
+                self._count("rejected")
+        return out
+
+    def note(self, token, status):
+        """Record a registration made by this process in its event's roster, if loaded."""
+        claim = self.signer.verify(token)
+        if claim is None:
+            return
+        with self._lock:
+            item = self._rosters.get(claim[1])
+            if item is not None:
+                item[1][claim[0]] = status
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, events=len(self._rosters),
+                        registrations=sum(len(r) for _, r in self._rosters.values()))
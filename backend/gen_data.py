@@ -0,0 +1,212 @@
+# backend/gen_data.py
+# Synthetic campus database at realistic scale, for benchmarks and query-plan
+# checks: schema.sql via init_db.run_script, the migrations, then bulk inserts
+# of colleges, students, events, registrations, attendance and feedback.
+# Event popularity is skewed (a few events draw most registrations) and most
+# students register within their own college. The same --seed gives the same
+# rows, with dates relative to the day it runs. Triggers and secondary indexes are dropped for the load and put
+# back afterwards; the derived tables (counters, search index, tags, report
+# snapshots) are then rebuilt once instead of per row.
+#
+#   python gen_data.py --db bench.db --students 200000 --events 20000 --registrations 2000000
+#
+# An admin user bench-admin@example.com / bench is created for the reports.
+import argparse
+import datetime
+import os
+import random
+import sqlite3
+import time
+
+import counters
+import features
+import init_db
+import migrate
+import reports
+import search
+
+SCHEMA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schema.sql")
+ADMIN_EMAIL = "bench-admin@example.com"
+ADMIN_PASSWORD = "bench"
+
+EVENT_TYPES = ("Workshop", "Seminar", "Fest", "Hackathon", "Talk", "Sports")
+TAGS = ("food", "certificate", "prizes", "online", "networking", "swag")
+WORDS = ("intro", "advanced", "python", "robotics", "design", "music", "startup", "data", "cloud",
+         "photography", "debate", "chess", "quiz", "finance", "ai", "security", "yoga", "film")
+CHUNK = 50000
+BULK_TABLES = ("college", "student", "event", "registration", "attendance", "feedback", "event_feature")
+
+
+def _chunks(rows, size=CHUNK):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _load(conn, sql, rows, label, log):
+    t0 = time.perf_counter()
+    n = 0
+    for chunk in _chunks(rows):
+        conn.executemany(sql, chunk)
+        n += len(chunk)
+    conn.commit()
+    elapsed = time.perf_counter() - t0
+    log(f"  {label:<14}{n:>10,} rows  {elapsed:6.1f}s  ({n / max(elapsed, 1e-9):,.0f}/s)")
+    return n
+
+
+def _iso(ts):
+    return datetime.datetime.utcfromtimestamp(ts).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def generate(db, colleges=10, students=20000, events=2000, registrations=200000,
+             attendance_rate=0.7, feedback_rate=0.3, seed=42, log=print):
+    """Build db from scratch. Returns {table: rows inserted}."""
+    if os.path.exists(db):
+        raise FileExistsError(f"{db} already exists")
+    rng = random.Random(seed)
+    init_db.run_script(db, SCHEMA)
+    migrate.migrate(db, log=lambda msg: None)
+
+    conn = sqlite3.connect(db)
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("PRAGMA cache_size=-200000")
+    # put back verbatim after the load
+    saved = conn.execute(
+        "SELECT type, name, sql FROM sqlite_master WHERE sql IS NOT NULL AND "
+        f"(type = 'trigger' OR (type = 'index' AND tbl_name IN ({','.join('?' * len(BULK_TABLES))})))",
+        BULK_TABLES).fetchall()
+    for kind, name, _ in saved:
+        conn.execute(f"DROP {kind.upper()} {name}")
+    conn.commit()
+
+    log(f"generating {db} (seed {seed})")
+    counts = {}
+    now = time.time() // 86400 * 86400  # dates are relative to today (UTC)
+    college_ids = [f"c{i + 1}" for i in range(colleges)]
+    counts["college"] = _load(conn, "INSERT INTO college (college_id, name) VALUES (?, ?)",
+                              ((c, f"College {c[1:]}") for c in college_ids), "college", log)
+
+    by_college = {c: [] for c in college_ids}
+    student_rows = []
+    for i in range(students):
+        sid, college = f"stu{i:07d}", college_ids[i % colleges]
+        by_college[college].append(sid)
+        student_rows.append((sid, f"Student {i}", f"R{i:07d}", college))
+    counts["student"] = _load(conn, "INSERT INTO student (student_id, name, roll_no, college_id) VALUES (?, ?, ?, ?)",
+                              student_rows, "student", log)
+    del student_rows
+
+    # Zipf-ish popularity: event i gets weight 1/(i+1)^0.8 of the registrations
+    weights = [1.0 / (i + 1) ** 0.8 for i in range(events)]
+    rng.shuffle(weights)
+    total_w = sum(weights)
+    per_event = [min(students, int(registrations * w / total_w)) for w in weights]
+    for i in rng.choices(range(events), k=max(0, registrations - sum(per_event))):
+        if per_event[i] < students:
+            per_event[i] += 1
+
+    event_rows, event_info = [], []
+    for i in range(events):
+        eid, college = f"ev{i:07d}", college_ids[i % colleges]
+        starts = now + rng.uniform(-365, 180) * 86400
+        title = " ".join(rng.sample(WORDS, 2)).title() + f" {EVENT_TYPES[i % len(EVENT_TYPES)]} {i}"
+        tags = ",".join(rng.sample(TAGS, rng.randint(0, 3)))
+        # most events have room for everyone registered; some are uncapped
+        capacity = None if rng.random() < 0.2 else per_event[i] + rng.randint(0, 50)
+        cancelled = 1 if rng.random() < 0.02 else 0
+        event_rows.append((eid, title, EVENT_TYPES[i % len(EVENT_TYPES)], f"{title}: {' '.join(rng.sample(WORDS, 6))}",
+                           _iso(starts), capacity, college, cancelled, tags, _iso(starts - 30 * 86400), int(starts)))
+        event_info.append((eid, college, starts))
+    counts["event"] = _load(conn, "INSERT INTO event (event_id, title, type, description, starts_at, capacity, "
+                            "college_id, cancelled_flag, features, created_at, starts_at_ts) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            event_rows, "event", log)
+    counts["event_feature"] = _load(conn, "INSERT INTO event_feature (event_id, tag) VALUES (?, ?)",
+                                    ((r[0], t) for r in event_rows for t in features.parse_tags(r[8])),
+                                    "event_feature", log)
+    del event_rows
+
+    attended = []  # (event_id, student_id, event start) of present students
+
+    def registration_rows():
+        reg_no = 0
+        for (eid, college, starts), n in zip(event_info, per_event):
+            if not n:
+                continue
+            # ~80% from the event's own college, the rest from anywhere
+            local = min(len(by_college[college]), int(n * 0.8))
+            picked = rng.sample(by_college[college], local)
+            seen = set(picked)
+            while len(picked) < n:
+                sid = f"stu{rng.randrange(students):07d}"
+                if sid not in seen:
+                    seen.add(sid)
+                    picked.append(sid)
+            past = starts < now
+            for sid in picked:
+                reg_no += 1
+                status = "cancelled" if rng.random() < 0.03 else "registered"
+                if status == "registered" and past and rng.random() < attendance_rate:
+                    attended.append((eid, sid, starts))
+                yield (eid, sid, _iso(starts - rng.uniform(1, 30) * 86400), f"t{reg_no:x}.{rng.getrandbits(48):012x}", status)
+
+    counts["registration"] = _load(conn, "INSERT INTO registration (event_id, student_id, registered_at, token, status) "
+                                   "VALUES (?, ?, ?, ?, ?)", registration_rows(), "registration", log)
+    counts["attendance"] = _load(conn, "INSERT INTO attendance (event_id, student_id, attended_at, present) VALUES (?, ?, ?, 1)",
+                                 ((eid, sid, _iso(starts + rng.uniform(0, 3600))) for eid, sid, starts in attended),
+                                 "attendance", log)
+    counts["feedback"] = _load(conn, "INSERT INTO feedback (event_id, student_id, rating, comment, submitted_at) "
+                               "VALUES (?, ?, ?, ?, ?)",
+                               ((eid, sid, rng.choices((1, 2, 3, 4, 5), (1, 2, 4, 8, 6))[0],
+                                 " ".join(rng.sample(WORDS, 3)) if rng.random() < 0.3 else None,
+                                 _iso(starts + rng.uniform(3600, 86400 * 3)))
+                                for eid, sid, starts in attended if rng.random() < feedback_rate),
+                               "feedback", log)
+    del attended
+
+    from werkzeug.security import generate_password_hash
+    conn.execute("INSERT INTO users (email, name, password_hash, role, created_at) VALUES (?, ?, ?, 'admin', ?)",
+                 (ADMIN_EMAIL, "Bench Admin", generate_password_hash(ADMIN_PASSWORD), _iso(now)))
+    conn.commit()
+
+    t0 = time.perf_counter()
+    for _, _, sql in saved:
+        conn.execute(sql)
+    conn.commit()
+    counters.rebuild(conn)
+    if search.index_present(conn):
+        search.rebuild(conn)
+    reports.rebuild(conn)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.close()
+    log(f"  indexes, triggers, derived tables rebuilt in {time.perf_counter() - t0:.1f}s")
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic campus events database")
+    parser.add_argument("--db", default="bench.db")
+    parser.add_argument("--colleges", type=int, default=10)
+    parser.add_argument("--students", type=int, default=20000)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--registrations", type=int, default=200000)
+    parser.add_argument("--attendance-rate", type=float, default=0.7, help="share of past registrations checked in")
+    parser.add_argument("--feedback-rate", type=float, default=0.3, help="share of attendees leaving feedback")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--force", action="store_true", help="overwrite an existing --db")
+    args = parser.parse_args()
+    if args.force:
+        for suffix in ("", "-wal", "-shm", ".migrate.lock"):
+            if os.path.exists(args.db + suffix):
+                os.remove(args.db + suffix)
+    t0 = time.perf_counter()
+    generate(args.db, args.colleges, args.students, args.events, args.registrations,
+             args.attendance_rate, args.feedback_rate, args.seed)
+    print(f"✅ {args.db} generated in {time.perf_counter() - t0:.1f}s")
@@ -0,0 +1,37 @@
+# backend/gunicorn.conf.py
+# gunicorn -c gunicorn.conf.py wsgi:app
+#
+# Multi-process, multi-thread serving. Each worker process has its own
+# connection pool, caches and live broker; threads share them. Long-lived
+# /live/events streams and long-polls hold a thread each under gthread, so
+# deployments with many live clients should serve asgi.py instead, where a
+# waiting client holds no thread:
+#
+#   gunicorn -k uvicorn.workers.UvicornWorker -c gunicorn.conf.py asgi:application
+import multiprocessing
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.environ.get("GUNICORN_THREADS", "8"))
+worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", "1000"))  # gevent only
+# SSE responses heartbeat every LIVE_HEARTBEAT_S, well inside this
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = 30
+keepalive = 5
+# recycle workers now and then so a slow leak can't grow unbounded
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "10000"))
+max_requests_jitter = max_requests // 10
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG", "-") or None  # empty disables
+errorlog = "-"
+
+
+def on_starting(server):
+    # migrate once in the master, so booting workers find a current schema
+    from storage import open_storage
+    store = open_storage(os.environ.get("DATABASE_URL") or os.environ.get("DB_NAME", "events.db"), max_size=1)
+    try:
+        store.migrate(log=server.log.info)
+    finally:
+        store.close()
@@ -0,0 +1,41 @@
+# backend/indexes.py
+# Helpers that flag full table scans in EXPLAIN QUERY PLAN output (see
+# check_query_plans.py). The secondary indexes themselves are created by
+# migrations (0007_indexes.py and later).
+#
+#   python indexes.py --db events.db   # migrate, then list the secondary indexes
+import argparse
+import re
+import sqlite3
+
+import migrate
+
+# "SCAN t" with no index: a full table scan. Virtual tables (FTS, json_each)
+# and materialized subqueries report their own wording and are not flagged.
+_FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+def explain(conn, sql, params=()):
+    """EXPLAIN QUERY PLAN rows as a list of detail strings."""
+    return [r[3] for r in conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()]
+
+
+def full_scans(conn, sql, params=()):
+    """Names (or aliases) of tables the plan reads with a full table scan."""
+    scans = []
+    for detail in explain(conn, sql, params):
+        m = _FULL_SCAN.match(detail)
+        if m:
+            scans.append(m.group(1))
+    return scans
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Migrate a database and list its secondary indexes")
+    parser.add_argument("--db", default="events.db")
+    args = parser.parse_args()
+    migrate.migrate(args.db)
+    conn = sqlite3.connect(args.db)
+    names = [r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='index' AND name LIKE 'idx_%' ORDER BY name")]
+    print("✅ indexes:", ", ".join(names))
+    conn.close()
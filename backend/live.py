@@ -0,0 +1,263 @@
+# backend/live.py
+# Live seat / check-in counts for subscribers (SSE and long-poll).
+#
+# One watcher thread per process asks the source which events' counters
+# changed since its last look and re-reads only those: on SQLite, triggers
+# append the event id to live_change (the newest 10000 rows are kept, see
+# migrations/0016_live_change.py); on PostgreSQL, a trigger sends NOTIFY
+# event_live at commit. Either way commits from other workers and nodes are
+# seen too. A source that can't tell answers None and the whole table is
+# re-read once: the first scan, a reconnect, or a watcher that fell behind
+# the pruned log. Scans run at most max_rate times a second, which coalesces
+# a burst of writes into at most max_rate updates per second per event.
+#
+# Subscribers wait with a cursor. wait() blocks on a Condition, so under a
+# WSGI server it holds the request's thread. wait_async() parks a future on
+# the event loop and holds no thread; asgi.py serves the live endpoints with it.
+import asyncio
+import json
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+LIVE_FIELDS = ("registered_count", "present_count", "cancelled_flag")
+STATE_SQL = "SELECT event_id, " + ", ".join(LIVE_FIELDS) + " FROM event"
+CHANGES_SQL = "SELECT change_id, event_id FROM live_change WHERE change_id > ? ORDER BY change_id"
+# longest event_id IN (...) list per state() query
+STATE_CHUNK = 500
+
+
+def parse_event_ids(values):
+    """The ids in ?event_id=a,b&event_id=c as a set, or None for every event."""
+    ids = {i.strip() for v in values for i in v.split(",") if i.strip()}
+    return ids or None
+
+
+def sse_message(kind, seq, data):
+    return f"event: {kind}\nid: {seq}\ndata: {json.dumps(data)}\n\n".encode("utf-8")
+
+
+class SQLiteLiveSource:
+    """Counter state and the live_change log, read from a dedicated connection."""
+
+    def __init__(self, db_name):
+        self.db_name = db_name
+        self._conn = None
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_name, check_same_thread=False)
+        return self._conn
+
+    def changed(self, since):
+        """
+        (cursor, event ids changed after since). The ids are None when they
+        are unknown: no cursor yet, or rows after since were already pruned.
+        """
+        conn = self._connection()
+        if since is None:
+            return conn.execute("SELECT COALESCE(MAX(change_id), 0) FROM live_change").fetchone()[0], None
+        rows = conn.execute(CHANGES_SQL, (since,)).fetchall()
+        if not rows:
+            return since, set()
+        # writers are serialized, so change ids are gapless unless pruned
+        return rows[-1][0], ({r[1] for r in rows} if rows[0][0] == since + 1 else None)
+
+    def state(self, event_ids=None):
+        """{event_id: tuple(LIVE_FIELDS)} for event_ids, or for every event."""
+        conn = self._connection()
+        if event_ids is None:
+            return {r[0]: tuple(r[1:]) for r in conn.execute(STATE_SQL)}
+        ids = list(event_ids)
+        out = {}
+        for i in range(0, len(ids), STATE_CHUNK):
+            chunk = ids[i:i + STATE_CHUNK]
+            sql = STATE_SQL + " WHERE event_id IN (" + ",".join("?" * len(chunk)) + ")"
+            out.update((r[0], tuple(r[1:])) for r in conn.execute(sql, chunk))
+        return out
+
+
+def _release(waiter):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class LiveBroker:
+    def __init__(self, source, max_rate=4.0):
+        # source: changed(cursor) -> (cursor, changed event ids or None), state(event_ids=None)
+        self.source = source
+        self.max_rate = max_rate
+        self._cond = threading.Condition()
+        self._wake = threading.Event()
+        self._state = {}                 # event_id -> tuple(LIVE_FIELDS)
+        self._changed = OrderedDict()    # event_id -> seq of its last change, oldest first
+        self._seq = 0
+        self._subscribers = 0
+        self._waiters = set()            # (loop, future) of wait_async() callers
+        self._thread = None
+        self._cursor = None              # the source's change cursor
+        self._resync = False             # re-read everything on the next scan
+        self._stats = {"scans": 0, "full_scans": 0, "published": 0, "subscribers": 0}
+        # long-poll cursors are "<instance>.<seq>"; another process's cursor means resnapshot
+        self.instance = secrets.token_hex(4)
+
+    # ---- writers ----
+    def kick(self):
+        """Hint that something was written; the watcher rescans on its next tick."""
+        if self._thread is not None:
+            self._wake.set()
+
+    # ---- subscribers ----
+    def subscribe(self):
+        """Register a subscriber; returns the cursor to pass to wait()."""
+        with self._cond:
+            if self._thread is None:
+                self._start()
+            self._subscribers += 1
+            return self._seq
+
+    def unsubscribe(self):
+        with self._cond:
+            self._subscribers -= 1
+
+    def snapshot(self, event_ids=None):
+        with self._cond:
+            return self._seq, [self._payload(eid, 0) for eid in self._state
+                               if event_ids is None or eid in event_ids]
+
+    def since_token(self, cursor):
+        """The long-poll ?since= value for cursor."""
+        return f"{self.instance}.{cursor}"
+
+    def parse_since(self, since):
+        """The cursor in a ?since= value, or None if it is missing or from another process."""
+        instance, _, seq = (since or "").partition(".")
+        return int(seq) if instance == self.instance and seq.isdigit() else None
+
+    def wait(self, cursor, event_ids=None, timeout=15.0):
+        """
+        Block until something newer than cursor is published (or timeout).
+        Returns (new cursor, [delta, ...]) with at most one delta per event.
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if not self._cond.wait_for(lambda: self._seq > cursor, deadline - time.monotonic()):
+                    return cursor, []
+                cursor, out = self._deltas(cursor, event_ids)
+                if out:
+                    return cursor, out
+
+    async def wait_async(self, cursor, event_ids=None, timeout=15.0):
+        """wait() for coroutines: waits on a future of the running loop instead of blocking a thread."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            with self._cond:
+                if self._seq > cursor:
+                    cursor, out = self._deltas(cursor, event_ids)
+                    if out:
+                        return cursor, out
+                waiter = loop.create_future()
+                self._waiters.add((loop, waiter))
+            try:
+                await asyncio.wait_for(waiter, deadline - loop.time())
+            except asyncio.TimeoutError:
+                return cursor, []
+            finally:
+                with self._cond:
+                    self._waiters.discard((loop, waiter))
+
+    def stats(self):
+        with self._cond:
+            out = dict(self._stats)
+            out["subscribers"] = self._subscribers
+            out["seq"] = self._seq
+            out["max_rate"] = self.max_rate
+        return out
+
+    # ---- watcher ----
+    def _deltas(self, cursor, event_ids):
+        # call holding _cond: (newest seq, one delta per event changed after cursor)
+        out = []
+        for eid, seq in reversed(self._changed.items()):
+            if seq <= cursor:
+                break
+            if event_ids is None or eid in event_ids:
+                out.append(self._payload(eid, seq))
+        out.reverse()
+        return self._seq, out
+
+    def _payload(self, event_id, seq):
+        values = self._state.get(event_id)
+        if values is None:
+            return {"event_id": event_id, "deleted": True, "seq": seq}
+        out = dict(zip(LIVE_FIELDS, values))
+        out["event_id"] = event_id
+        out["seq"] = seq
+        return out
+
+    def _start(self):
+        # baseline in the caller so the first subscriber's snapshot is complete;
+        # the cursor comes first, so anything written meanwhile is seen again
+        self._cursor, _ = self.source.changed(None)
+        self._state = self.source.state()
+        self._thread = threading.Thread(target=self._run, name="live-broker", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        interval = 1.0 / self.max_rate
+        last = 0.0
+        while True:
+            self._wake.wait(interval)
+            self._wake.clear()
+            # never scan more than max_rate times a second
+            delay = last + interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            last = time.monotonic()
+            # keep scanning with no subscribers too, so the next one's snapshot is current
+            try:
+                self._scan()
+            except Exception:
+                # locked, mid-migration or reconnecting; changes may have been
+                # consumed without being read, so re-read everything next tick
+                self._resync = True
+
+    def _scan(self):
+        cursor, ids = self.source.changed(self._cursor)
+        if self._resync:
+            ids = None
+        if ids is not None and not ids:
+            self._cursor = cursor
+            return
+        fresh = self.source.state(ids)
+        self._cursor, self._resync = cursor, False
+        with self._cond:
+            self._stats["scans"] += 1
+            if ids is None:
+                self._stats["full_scans"] += 1
+                moved = [eid for eid, v in fresh.items() if self._state.get(eid) != v]
+                moved += [eid for eid in self._state if eid not in fresh]
+            else:
+                moved = [eid for eid in ids if self._state.get(eid) != fresh.get(eid)]
+            if not moved:
+                return
+            for eid in moved:
+                if eid in fresh:
+                    self._state[eid] = fresh[eid]
+                else:
+                    self._state.pop(eid, None)
+                self._seq += 1
+                self._changed.pop(eid, None)
+                self._changed[eid] = self._seq
+            self._stats["published"] += len(moved)
+            self._cond.notify_all()
+            for loop, waiter in self._waiters:
+                try:
+                    loop.call_soon_threadsafe(_release, waiter)
+                except RuntimeError:
+                    pass  # that loop is closed
+            self._waiters.clear()
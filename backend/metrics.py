@@ -0,0 +1,324 @@
+# backend/metrics.py
+# Request and SQL instrumentation, exposed in Prometheus text format:
+# per-endpoint latency histograms, per-request SQL statement count and time
+# (via an instrumented sqlite3 connection class), slow-query logging with the
+# query plan, and header-triggered cProfile of single requests.
+import bisect
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sqlite3
+import threading
+import time
+
+from flask import request
+
+log = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _EndpointStats:
+    __slots__ = ("latency", "sql_s", "queries", "statuses")
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.sql_s = Histogram(LATENCY_BUCKETS)
+        self.queries = Histogram(COUNT_BUCKETS)
+        self.statuses = {}
+
+
+class _RequestStats:
+    __slots__ = ("started", "rule", "queries", "sql_s", "profile")
+
+    def __init__(self, started):
+        self.started = started
+        self.rule = None
+        self.queries = 0
+        self.sql_s = 0.0
+        self.profile = None
+
+
+class _Body:
+    """
+    The response iterable, calling done() once the body has been sent (or the
+    server closed it early): a streamed response's latency and the SQL it runs
+    while being iterated count toward its request.
+    """
+
+    def __init__(self, body, done):
+        self._body = body
+        self._done = done
+
+    def __iter__(self):
+        yield from self._body
+        self._finish()
+
+    def close(self):
+        try:
+            close = getattr(self._body, "close", None)
+            if close is not None:
+                close()
+        finally:
+            self._finish()
+
+    def _finish(self):
+        done, self._done = self._done, None
+        if done is not None:
+            done()
+
+
+class Metrics:
+    """
+    Counters and histograms for one process. init_app(app) wraps the app in
+    the request middleware; connection_class() is the sqlite3.Connection
+    subclass the pool opens so every statement is timed. A statement slower than
+    slow_query_ms is logged with its EXPLAIN QUERY PLAN (once a minute per
+    statement). A request carrying `X-Profile: <profile_token>` is run under
+    cProfile; the top functions are logged and, with profile_dir set, the
+    .prof file is kept for pstats/snakeviz. server_timing adds a
+    Server-Timing header (app and SQL time) to every response.
+    """
+
+    def __init__(self, slow_query_ms=100.0, profile_token="", profile_dir=None, server_timing=False):
+        self.slow_query_s = slow_query_ms / 1000.0
+        self.server_timing = server_timing
+        self.profile_token = profile_token
+        self.profile_dir = profile_dir
+        self._lock = threading.Lock()
+        self._counters = {}   # (name, labels) -> value
+        self._endpoints = {}  # (endpoint rule, method) -> _EndpointStats
+        self._slow_logged = {}
+        self._profiling = threading.Lock()  # cProfile can't run two profilers at once
+        self._local = threading.local()
+
+    # ---------------- recording ----------------
+    def inc(self, name, labels=(), value=1):
+        with self._lock:
+            key = (name, labels)
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def record_sql(self, conn, sql, params, elapsed):
+        req = getattr(self._local, "req", None)
+        if req is not None:
+            req.queries += 1
+            req.sql_s += elapsed
+        if elapsed >= self.slow_query_s:
+            self._slow_query(conn, sql, params, elapsed)
+
+    def _slow_query(self, conn, sql, params, elapsed):
+        self.inc("sql_slow_queries_total")
+        now = time.monotonic()
+        with self._lock:
+            if now - self._slow_logged.get(sql, -60.0) < 60.0:
+                return
+            self._slow_logged[sql] = now
+            if len(self._slow_logged) > 1000:
+                self._slow_logged.clear()
+        plan = []
+        if params is not None:
+            try:
+                # a plain cursor, so the EXPLAIN isn't timed and counted itself
+                cur = sqlite3.Cursor(conn)
+                plan = [r[3] for r in cur.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()]
+            except sqlite3.Error:
+                pass
+        log.warning("slow query (%.1f ms): %s\n  plan: %s", elapsed * 1000, " ".join(sql.split()),
+                    "; ".join(plan) or "n/a")
+
+    # ---------------- sqlite instrumentation ----------------
+    def connection_class(self):
+        metrics = self
+        local = self._local
+        cursor_execute = sqlite3.Cursor.execute
+        cursor_executemany = sqlite3.Cursor.executemany
+        perf_counter = time.perf_counter
+
+        # execute() covers preparing the statement and stepping to the first
+        # row (where sorting/aggregation happens); later fetches aren't timed.
+        class TimedCursor(sqlite3.Cursor):
+            # record_sql() inlined: this runs for every statement
+            def execute(self, sql, params=()):
+                t0 = perf_counter()
+                try:
+                    return cursor_execute(self, sql, params)
+                finally:
+                    elapsed = perf_counter() - t0
+                    req = getattr(local, "req", None)
+                    if req is not None:
+                        req.queries += 1
+                        req.sql_s += elapsed
+                    if elapsed >= metrics.slow_query_s:
+                        metrics._slow_query(self.connection, sql, params, elapsed)
+
+            def executemany(self, sql, seq):
+                t0 = perf_counter()
+                try:
+                    return cursor_executemany(self, sql, seq)
+                finally:
+                    metrics.record_sql(self.connection, sql, None, perf_counter() - t0)
+
+        class TimedConnection(sqlite3.Connection):
+            # Connection.execute() would bypass the cursor subclass's execute()
+            def cursor(self, factory=TimedCursor):
+                return sqlite3.Connection.cursor(self, factory)
+
+            def execute(self, sql, params=()):
+                return TimedCursor(self).execute(sql, params)
+
+            def executemany(self, sql, seq):
+                return TimedCursor(self).executemany(sql, seq)
+
+        return TimedConnection
+
+    # ---------------- request middleware ----------------
+    def init_app(self, app):
+        # WSGI middleware rather than before/after_request hooks: cheaper per
+        # request. The one hook just notes which route matched, for the labels.
+        app.wsgi_app = self.middleware(app.wsgi_app)
+        app.before_request(self._note_rule)
+
+    def _note_rule(self):
+        req = getattr(self._local, "req", None)
+        if req is not None and request.url_rule is not None:
+            req.rule = request.url_rule.rule
+
+    def middleware(self, wsgi_app):
+        local = self._local
+        perf_counter = time.perf_counter
+
+        def instrumented(environ, start_response):
+            req = local.req = _RequestStats(perf_counter())
+            if self.profile_token and environ.get("HTTP_X_PROFILE") == self.profile_token:
+                if self._profiling.acquire(blocking=False):
+                    req.profile = cProfile.Profile()
+                    req.profile.enable()
+            status = []
+
+            def _start_response(status_line, headers, exc_info=None):
+                status.append(status_line)
+                if self.server_timing:
+                    headers.append(("Server-Timing", 'app;dur=%.1f, sql;dur=%.1f;desc="%d queries"' % (
+                        (perf_counter() - req.started) * 1000, req.sql_s * 1000, req.queries)))
+                if req.profile is not None:
+                    headers.extend(self._finish_profile(req, environ))
+                return start_response(status_line, headers, exc_info)
+
+            def finish():
+                local.req = None
+                if req.profile is not None:
+                    self._finish_profile(req, environ)
+                self._record_request(req, environ, status[0] if status else "500")
+
+            try:
+                body = wsgi_app(environ, _start_response)
+            except BaseException:
+                finish()
+                raise
+            return _Body(body, finish)
+
+        return instrumented
+
+    def _record_request(self, req, environ, status_line):
+        elapsed = time.perf_counter() - req.started
+        key = (req.rule or "<unmatched>", environ.get("REQUEST_METHOD", ""))
+        stats = self._endpoints.get(key)
+        with self._lock:
+            if stats is None:
+                stats = self._endpoints.setdefault(key, _EndpointStats())
+            stats.latency.observe(elapsed)
+            stats.sql_s.observe(req.sql_s)
+            stats.queries.observe(req.queries)
+            code = status_line[:3]
+            stats.statuses[code] = stats.statuses.get(code, 0) + 1
+
+    def _finish_profile(self, req, environ):
+        """Stop the request's profiler, log the top functions, maybe save it. Returns extra headers."""
+        profile, req.profile = req.profile, None
+        profile.disable()
+        self._profiling.release()
+        elapsed = time.perf_counter() - req.started
+        method, path = environ.get("REQUEST_METHOD", ""), environ.get("PATH_INFO", "")
+        out = io.StringIO()
+        stats = pstats.Stats(profile, stream=out)
+        stats.sort_stats("cumulative").print_stats(25)
+        log.info("profile %s %s (%.1f ms, %d queries):\n%s", method, path, elapsed * 1000, req.queries, out.getvalue())
+        if not self.profile_dir:
+            return []
+        os.makedirs(self.profile_dir, exist_ok=True)
+        name = "%s.%s.%dms.%d.prof" % (method, path.strip("/").replace("/", ".") or "root", elapsed * 1000, time.time())
+        stats.dump_stats(os.path.join(self.profile_dir, name))
+        return [("X-Profile-File", name)]
+
+    # ---------------- exposition ----------------
+    def render(self, gauges=None):
+        """
+        Prometheus text format. gauges is {section: {key: number}} (the /health
+        stats dicts); numeric values come out as `<section>_<key>` gauges.
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            hists = {}
+            for (endpoint, method), st in self._endpoints.items():
+                labels = (("endpoint", endpoint), ("method", method))
+                for name, h in (("http_request_duration_seconds", st.latency),
+                                ("http_request_sql_seconds", st.sql_s),
+                                ("http_request_sql_queries", st.queries)):
+                    hists[(name, labels)] = (list(h.counts), h.sum, h.count, h.buckets)
+                for code, n in st.statuses.items():
+                    counters[("http_requests_total", labels + (("status", str(code)),))] = n
+        counters = sorted(counters.items())
+        hists = sorted(hists.items(), key=lambda kv: kv[0])
+        lines, typed = [], set()
+        for (name, labels), value in counters:
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name}{_labels(labels)} {_num(value)}")
+        for (name, labels), (counts, total, count, buckets) in hists:
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} histogram")
+            cumulative = 0
+            for bound, n in zip(buckets, counts):
+                cumulative += n
+                lines.append(f"{name}_bucket{_labels(labels + (('le', _num(bound)),))} {cumulative}")
+            lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {count}")
+            lines.append(f"{name}_sum{_labels(labels)} {_num(total)}")
+            lines.append(f"{name}_count{_labels(labels)} {count}")
+        for section, values in (gauges or {}).items():
+            for key, value in sorted(values.items()):
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                name = f"{section}_{key}"
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {_num(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join('%s="%s"' % (k, str(v).replace("\\", "\\\\").replace('"', '\\"')) for k, v in labels) + "}"
+
+
+def _num(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
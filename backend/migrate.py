@@ -0,0 +1,148 @@
+# backend/migrate.py
+# Versioned schema migrations. Every migrations/NNNN_name.py defines up(conn)
+# and carries its own SQL (never imports the modules whose schema it sets up),
+# so an applied version stays what it was; change the schema with a new
+# migration, not by editing an old one. Applied versions are recorded in
+# schema_version, so a database that is already current costs one SELECT at
+# worker boot. Only one process applies migrations at a time (lock file next
+# to the database); the others wait and then find nothing left to do.
+#
+#   python migrate.py --db events.db            # apply pending migrations
+#   python migrate.py --db events.db --status   # list applied / pending
+import argparse
+import datetime
+import importlib.util
+import os
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+VERSION_SQL = """
+CREATE TABLE IF NOT EXISTS schema_version (
+  version INTEGER PRIMARY KEY,
+  name TEXT NOT NULL,
+  applied_at TEXT NOT NULL
+);
+"""
+
+_FILE_RE = re.compile(r"^(\d{4})_(\w+)\.py$")
+
+
+class MigrationError(Exception):
+    pass
+
+
+def discover(path=MIGRATIONS_DIR):
+    """[(version, name, file path)] sorted by version."""
+    found = []
+    for fname in os.listdir(path):
+        m = _FILE_RE.match(fname)
+        if m:
+            found.append((int(m.group(1)), m.group(2), os.path.join(path, fname)))
+    found.sort()
+    for a, b in zip(found, found[1:]):
+        if a[0] == b[0]:
+            raise MigrationError(f"duplicate migration version {a[0]:04d}: {a[1]}, {b[1]}")
+    return found
+
+
+def applied_versions(conn):
+    try:
+        return {r[0] for r in conn.execute("SELECT version FROM schema_version")}
+    except sqlite3.OperationalError:
+        return set()  # no schema_version table yet
+
+
+def pending(conn, migrations=None):
+    done = applied_versions(conn)
+    return [m for m in (migrations or discover()) if m[0] not in done]
+
+
+def _load(version, path):
+    spec = importlib.util.spec_from_file_location(f"migration_{version:04d}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@contextmanager
+def migration_lock(db_name, timeout=60.0):
+    """Exclusive lock on <db>.migrate.lock, held while migrations run."""
+    deadline = time.monotonic() + timeout
+    with open(db_name + ".migrate.lock", "a+") as f:
+        while True:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise MigrationError(f"could not take the migration lock within {timeout:.0f}s")
+                time.sleep(0.05)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def migrate(db_name, log=print):
+    """
+    Apply pending migrations in version order; returns the versions applied.
+    Migrations must be idempotent: a crash between up() and recording the
+    version simply runs that migration again next time.
+    """
+    migrations = discover()
+    conn = sqlite3.connect(db_name, timeout=30)
+    try:
+        if not pending(conn, migrations):
+            return []
+        with migration_lock(db_name):
+            conn.executescript(VERSION_SQL)
+            applied = []
+            # re-check under the lock: another worker may have just finished
+            for version, name, path in pending(conn, migrations):
+                t0 = time.perf_counter()
+                _load(version, path).up(conn)
+                conn.execute("INSERT INTO schema_version (version, name, applied_at) VALUES (?, ?, ?)",
+                             (version, name, datetime.datetime.utcnow().isoformat()))
+                conn.commit()
+                log(f"applied {version:04d}_{name} in {(time.perf_counter() - t0) * 1000:.0f} ms")
+                applied.append(version)
+            return applied
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply or list schema migrations")
+    parser.add_argument("--db", default=os.environ.get("DB_NAME", "events.db"))
+    parser.add_argument("--status", action="store_true", help="list migrations without applying")
+    args = parser.parse_args()
+    if args.status:
+        conn = sqlite3.connect(args.db)
+        try:
+            when = dict(conn.execute("SELECT version, applied_at FROM schema_version").fetchall())
+        except sqlite3.OperationalError:
+            when = {}
+        conn.close()
+        for version, name, _ in discover():
+            print(f"{version:04d}_{name:<28} {when.get(version, 'pending')}")
+    else:
+        done = migrate(args.db)
+        print(f"✅ {len(done)} migration(s) applied" if done else "✅ schema is current")
@@ -0,0 +1,23 @@
+"""Columns and tables older databases got from the hand-run migrate_*.py scripts."""
+
+
+def _add_column(conn, table, name, definition):
+    cols = [r[1] for r in conn.execute(f"PRAGMA table_info({table})")]
+    if name not in cols:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {definition}")
+
+
+def up(conn):
+    # was migrate_add_registration_token.py
+    _add_column(conn, "registration", "token", "token TEXT")
+    # was ensure_schema() in app.py
+    _add_column(conn, "event", "features", "features TEXT")
+    # was migrate_add_users_and_tokens.py
+    conn.executescript("""
+    CREATE TABLE IF NOT EXISTS auth_tokens (
+      token TEXT PRIMARY KEY,
+      user_id INTEGER,
+      created_at TEXT,
+      FOREIGN KEY (user_id) REFERENCES users(user_id)
+    );
+    """)
@@ -0,0 +1,106 @@
+"""Trigger-maintained per-event counters, recomputed from the base tables."""
+
+COLUMNS = [
+    ("registered_count", "registered_count INTEGER NOT NULL DEFAULT 0"),
+    ("present_count", "present_count INTEGER NOT NULL DEFAULT 0"),
+    ("feedback_count", "feedback_count INTEGER NOT NULL DEFAULT 0"),
+    ("rating_count", "rating_count INTEGER NOT NULL DEFAULT 0"),
+    ("rating_sum", "rating_sum INTEGER NOT NULL DEFAULT 0"),
+]
+
+TRIGGERS_SQL = """
+CREATE TRIGGER IF NOT EXISTS trg_registration_count_ins AFTER INSERT ON registration
+WHEN NEW.status = 'registered'
+BEGIN
+  UPDATE event SET registered_count = registered_count + 1 WHERE event_id = NEW.event_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_registration_count_del AFTER DELETE ON registration
+WHEN OLD.status = 'registered'
+BEGIN
+  UPDATE event SET registered_count = registered_count - 1 WHERE event_id = OLD.event_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_registration_count_upd AFTER UPDATE OF status, event_id ON registration
+BEGIN
+  UPDATE event SET registered_count = registered_count - 1 WHERE event_id = OLD.event_id AND OLD.status = 'registered';
+  UPDATE event SET registered_count = registered_count + 1 WHERE event_id = NEW.event_id AND NEW.status = 'registered';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_attendance_count_ins AFTER INSERT ON attendance
+WHEN NEW.present = 1
+BEGIN
+  UPDATE event SET present_count = present_count + 1 WHERE event_id = NEW.event_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_attendance_count_del AFTER DELETE ON attendance
+WHEN OLD.present = 1
+BEGIN
+  UPDATE event SET present_count = present_count - 1 WHERE event_id = OLD.event_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_attendance_count_upd AFTER UPDATE OF present, event_id ON attendance
+BEGIN
+  UPDATE event SET present_count = present_count - 1 WHERE event_id = OLD.event_id AND OLD.present = 1;
+  UPDATE event SET present_count = present_count + 1 WHERE event_id = NEW.event_id AND NEW.present = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_feedback_count_ins AFTER INSERT ON feedback
+BEGIN
+  UPDATE event SET feedback_count = feedback_count + 1,
+                   rating_count = rating_count + (NEW.rating IS NOT NULL),
+                   rating_sum = rating_sum + COALESCE(NEW.rating, 0)
+  WHERE event_id = NEW.event_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_feedback_count_del AFTER DELETE ON feedback
+BEGIN
+  UPDATE event SET feedback_count = feedback_count - 1,
+                   rating_count = rating_count - (OLD.rating IS NOT NULL),
+                   rating_sum = rating_sum - COALESCE(OLD.rating, 0)
+  WHERE event_id = OLD.event_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_feedback_count_upd AFTER UPDATE OF rating, event_id ON feedback
+BEGIN
+  UPDATE event SET feedback_count = feedback_count - 1,
+                   rating_count = rating_count - (OLD.rating IS NOT NULL),
+                   rating_sum = rating_sum - COALESCE(OLD.rating, 0)
+  WHERE event_id = OLD.event_id;
+  UPDATE event SET feedback_count = feedback_count + 1,
+                   rating_count = rating_count + (NEW.rating IS NOT NULL),
+                   rating_sum = rating_sum + COALESCE(NEW.rating, 0)
+  WHERE event_id = NEW.event_id;
+END;
+"""
+
+# what each counter should be, recomputed from the base tables (one grouped
+# pass per table; the per-event indexes only arrive in 0007)
+EXPECTED_SQL = """
+  SELECT e.event_id,
+         COALESCE(r.registered_count, 0) AS registered_count,
+         COALESCE(a.present_count, 0) AS present_count,
+         COALESCE(f.feedback_count, 0) AS feedback_count,
+         COALESCE(f.rating_count, 0) AS rating_count,
+         COALESCE(f.rating_sum, 0) AS rating_sum
+  FROM event e
+  LEFT JOIN (SELECT event_id, COUNT(*) AS registered_count FROM registration
+             WHERE status = 'registered' GROUP BY event_id) r ON r.event_id = e.event_id
+  LEFT JOIN (SELECT event_id, COUNT(*) AS present_count FROM attendance
+             WHERE present = 1 GROUP BY event_id) a ON a.event_id = e.event_id
+  LEFT JOIN (SELECT event_id, COUNT(*) AS feedback_count, COUNT(rating) AS rating_count,
+                    SUM(rating) AS rating_sum FROM feedback GROUP BY event_id) f ON f.event_id = e.event_id
+"""
+
+
+def up(conn):
+    cols = [r[1] for r in conn.execute("PRAGMA table_info(event)")]
+    for name, definition in COLUMNS:
+        if name not in cols:
+            conn.execute(f"ALTER TABLE event ADD COLUMN {definition}")
+    conn.executescript(TRIGGERS_SQL)
+    # always: schema.sql already has the columns, and rows loaded before the
+    # triggers existed left them at 0
+    sets = ", ".join(f"{name} = x.{name}" for name, _ in COLUMNS)
+    conn.execute(f"UPDATE event SET {sets} FROM ({EXPECTED_SQL}) AS x WHERE x.event_id = event.event_id")
+    conn.commit()
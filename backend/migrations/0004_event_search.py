@@ -0,0 +1,45 @@
+"""FTS5 index over events; skipped on SQLite builds without FTS5 (listing falls back to LIKE)."""
+import sqlite3
+
+SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS event_fts USING fts5(
+  event_id UNINDEXED, title, description, type, features,
+  tokenize = 'unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_event_fts_ins AFTER INSERT ON event
+BEGIN
+  INSERT INTO event_fts (event_id, title, description, type, features)
+  VALUES (NEW.event_id, NEW.title, NEW.description, NEW.type, NEW.features);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_event_fts_del AFTER DELETE ON event
+BEGIN
+  DELETE FROM event_fts WHERE event_id = OLD.event_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_event_fts_upd AFTER UPDATE OF event_id, title, description, type, features ON event
+BEGIN
+  DELETE FROM event_fts WHERE event_id = OLD.event_id;
+  INSERT INTO event_fts (event_id, title, description, type, features)
+  VALUES (NEW.event_id, NEW.title, NEW.description, NEW.type, NEW.features);
+END;
+"""
+
+BACKFILL_SQL = """
+INSERT INTO event_fts (event_id, title, description, type, features)
+SELECT event_id, title, description, type, features FROM event
+"""
+
+
+def up(conn):
+    try:
+        conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS temp._fts5_probe USING fts5(x)")
+        conn.execute("DROP TABLE IF EXISTS temp._fts5_probe")
+    except sqlite3.OperationalError:
+        return  # no FTS5 in this SQLite build
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='event_fts'").fetchone()
+    conn.executescript(SQL)
+    if not exists:
+        conn.execute(BACKFILL_SQL)
+    conn.commit()
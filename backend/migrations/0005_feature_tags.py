@@ -0,0 +1,31 @@
+"""Normalized event_feature rows, parsed once from event.features."""
+
+SQL = """
+CREATE TABLE IF NOT EXISTS event_feature (
+  event_id TEXT NOT NULL,
+  tag TEXT NOT NULL,
+  PRIMARY KEY (event_id, tag)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_event_feature_tag ON event_feature(tag, event_id);
+
+CREATE TRIGGER IF NOT EXISTS trg_event_feature_del AFTER DELETE ON event
+BEGIN
+  DELETE FROM event_feature WHERE event_id = OLD.event_id;
+END;
+"""
+
+
+def _tags(features):
+    # 'Food, Certificate,,food' -> ['certificate', 'food']
+    return sorted({t.strip().lower() for t in str(features).split(",") if t.strip()})
+
+
+def up(conn):
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='event_feature'").fetchone()
+    conn.executescript(SQL)
+    if not exists:
+        rows = conn.execute("SELECT event_id, features FROM event WHERE features IS NOT NULL AND features != ''").fetchall()
+        conn.executemany("INSERT OR IGNORE INTO event_feature (event_id, tag) VALUES (?, ?)",
+                         [(r[0], t) for r in rows for t in _tags(r[1])])
+    conn.commit()
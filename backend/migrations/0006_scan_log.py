@@ -0,0 +1,18 @@
+"""Idempotency log for offline attendance scan queues."""
+
+SQL = """
+CREATE TABLE IF NOT EXISTS scan_log (
+  scan_key TEXT PRIMARY KEY,
+  device_id TEXT,
+  event_id TEXT,
+  student_id TEXT,
+  status TEXT NOT NULL,
+  scanned_at TEXT,
+  received_at TEXT
+);
+"""
+
+
+def up(conn):
+    conn.executescript(SQL)
+    conn.commit()
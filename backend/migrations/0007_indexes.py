@@ -0,0 +1,39 @@
+"""Secondary indexes for the hot query shapes (see indexes.py)."""
+
+SQL = """
+-- attendance delta sync: WHERE event_id = ? AND att_id > ? ORDER BY att_id
+CREATE INDEX IF NOT EXISTS idx_att_event ON attendance(event_id);
+-- top-active-students joins attendance on student_id COLLATE NOCASE
+CREATE INDEX IF NOT EXISTS idx_att_student_nocase ON attendance(student_id COLLATE NOCASE, present);
+
+-- seat claims look up (event_id, student_id); counters rebuild counts by event
+CREATE INDEX IF NOT EXISTS idx_reg_event_student ON registration(event_id, student_id);
+-- GET /registrations: lower(student_id) = lower(?) ORDER BY registered_at DESC, reg_id DESC
+CREATE INDEX IF NOT EXISTS idx_reg_student_lower ON registration(lower(student_id), registered_at, reg_id);
+
+CREATE INDEX IF NOT EXISTS idx_feedback_event ON feedback(event_id);
+
+-- event listings are ordered by (starts_at, event_id), optionally per college/type
+CREATE INDEX IF NOT EXISTS idx_event_starts ON event(starts_at, event_id);
+CREATE INDEX IF NOT EXISTS idx_event_college_starts ON event(college_id, starts_at, event_id);
+CREATE INDEX IF NOT EXISTS idx_event_type_starts ON event(type, starts_at, event_id);
+
+CREATE INDEX IF NOT EXISTS idx_student_college ON student(college_id);
+
+-- login / password reset compare lower(email)
+CREATE INDEX IF NOT EXISTS idx_users_email_lower ON users(lower(email));
+
+-- attendance upserts (ON CONFLICT target)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_att_event_student ON attendance(event_id, student_id);
+"""
+
+
+def up(conn):
+    # the unique attendance index cannot be built over legacy duplicate rows;
+    # keep the latest row per (event_id, student_id)
+    conn.execute("""
+        DELETE FROM attendance WHERE att_id NOT IN
+          (SELECT MAX(att_id) FROM attendance GROUP BY event_id, student_id)
+    """)
+    conn.executescript(SQL)
+    conn.commit()
@@ -0,0 +1,93 @@
+"""Report snapshot tables and their change log (see reports.py), built once on creation."""
+import datetime
+
+SNAPSHOT_SQL = """
+CREATE TABLE IF NOT EXISTS report_change (
+  change_id INTEGER PRIMARY KEY AUTOINCREMENT,
+  event_id TEXT,
+  student_key TEXT
+);
+
+CREATE TABLE IF NOT EXISTS report_event (
+  event_id TEXT PRIMARY KEY,
+  registrations INTEGER NOT NULL DEFAULT 0,
+  presents INTEGER NOT NULL DEFAULT 0,
+  refreshed_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS report_student (
+  student_key TEXT PRIMARY KEY,
+  attended_events INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_report_student_attended ON report_student(attended_events);
+CREATE INDEX IF NOT EXISTS idx_student_nocase ON student(student_id COLLATE NOCASE);
+
+CREATE TRIGGER IF NOT EXISTS trg_report_event_ins AFTER INSERT ON event
+BEGIN
+  INSERT INTO report_change (event_id) VALUES (NEW.event_id);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_report_event_del AFTER DELETE ON event
+BEGIN
+  INSERT INTO report_change (event_id) VALUES (OLD.event_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_report_reg_ins AFTER INSERT ON registration
+BEGIN
+  INSERT INTO report_change (event_id) VALUES (NEW.event_id);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_report_reg_del AFTER DELETE ON registration
+BEGIN
+  INSERT INTO report_change (event_id) VALUES (OLD.event_id);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_report_reg_upd AFTER UPDATE OF event_id, student_id, status ON registration
+BEGIN
+  INSERT INTO report_change (event_id) VALUES (OLD.event_id), (NEW.event_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_report_att_ins AFTER INSERT ON attendance
+BEGIN
+  INSERT INTO report_change (event_id, student_key) VALUES (NEW.event_id, lower(NEW.student_id));
+END;
+CREATE TRIGGER IF NOT EXISTS trg_report_att_del AFTER DELETE ON attendance
+BEGIN
+  INSERT INTO report_change (event_id, student_key) VALUES (OLD.event_id, lower(OLD.student_id));
+END;
+CREATE TRIGGER IF NOT EXISTS trg_report_att_upd AFTER UPDATE OF event_id, student_id, present ON attendance
+BEGIN
+  INSERT INTO report_change (event_id, student_key)
+  VALUES (OLD.event_id, lower(OLD.student_id)), (NEW.event_id, lower(NEW.student_id));
+END;
+"""
+
+# per-event aggregates; presents only count students registered for the event
+EVENT_AGG_SQL = """
+SELECT e.event_id,
+       (SELECT COUNT(*) FROM registration r
+         WHERE r.event_id = e.event_id AND r.status = 'registered') AS registrations,
+       (SELECT COUNT(*) FROM attendance a
+         WHERE a.event_id = e.event_id AND a.present = 1
+           AND EXISTS (SELECT 1 FROM registration r
+                        WHERE r.event_id = a.event_id AND r.status = 'registered'
+                          AND lower(r.student_id) = lower(a.student_id))) AS presents
+FROM event e
+"""
+
+# per-student attended events (case-insensitive student ids)
+STUDENT_AGG_SQL = """
+SELECT lower(a.student_id) AS student_key, COUNT(*) AS attended_events
+FROM attendance a
+WHERE a.present = 1
+GROUP BY lower(a.student_id)
+"""
+
+
+def up(conn):
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='report_event'").fetchone()
+    conn.executescript(SNAPSHOT_SQL)
+    if not exists:
+        now = datetime.datetime.utcnow().isoformat()
+        conn.execute("INSERT INTO report_event (event_id, registrations, presents, refreshed_at) "
+                     f"SELECT x.event_id, x.registrations, x.presents, ? FROM ({EVENT_AGG_SQL}) x", (now,))
+        conn.execute(f"INSERT INTO report_student (student_key, attended_events) {STUDENT_AGG_SQL}")
+        conn.execute("DELETE FROM report_change")
+    conn.commit()
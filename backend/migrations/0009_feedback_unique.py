@@ -0,0 +1,12 @@
+"""One feedback row per (event_id, student_id): keep the newest, add the unique index (see feedback_queue.py)."""
+
+SQL = """
+UPDATE feedback SET student_id = lower(trim(student_id)) WHERE student_id != lower(trim(student_id));
+DELETE FROM feedback WHERE fb_id NOT IN (SELECT MAX(fb_id) FROM feedback GROUP BY event_id, student_id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_feedback_event_student ON feedback(event_id, student_id);
+"""
+
+
+def up(conn):
+    conn.executescript(SQL)
+    conn.commit()
@@ -0,0 +1,49 @@
+"""Normalized event start time (starts_at_ts, Unix seconds) for time-window listings (see timewindow.py)."""
+import datetime
+
+# tried after ISO 8601 (with "T" or " ", optional seconds / fraction / offset / "Z")
+LEGACY_FORMATS = ("%Y/%m/%d %H:%M:%S", "%Y/%m/%d %H:%M", "%Y/%m/%d",
+                  "%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M", "%d/%m/%Y",
+                  "%d-%m-%Y %H:%M", "%d-%m-%Y", "%d %b %Y %H:%M", "%d %b %Y", "%b %d %Y %H:%M", "%b %d %Y")
+
+SQL = """
+CREATE INDEX IF NOT EXISTS idx_event_starts_ts ON event(starts_at_ts, event_id);
+CREATE INDEX IF NOT EXISTS idx_event_college_starts_ts ON event(college_id, starts_at_ts, event_id);
+"""
+
+
+def _to_epoch(value):
+    # Unix seconds for a starts_at value (ISO 8601 or one of LEGACY_FORMATS), else None
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if not isinstance(value, str) or not value.strip():
+        return None
+    text = value.strip()
+    try:
+        ts = datetime.datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        ts = None
+        for fmt in LEGACY_FORMATS:
+            try:
+                ts = datetime.datetime.strptime(text, fmt)
+                break
+            except ValueError:
+                continue
+        if ts is None:
+            return None
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=datetime.timezone.utc)
+    return int(ts.timestamp())
+
+
+def up(conn):
+    cols = [r[1] for r in conn.execute("PRAGMA table_info(event)")]
+    if "starts_at_ts" not in cols:
+        conn.execute("ALTER TABLE event ADD COLUMN starts_at_ts INTEGER")
+    rows = conn.execute("SELECT event_id, starts_at FROM event WHERE starts_at_ts IS NULL").fetchall()
+    values = [(_to_epoch(r[1]), r[0]) for r in rows]
+    conn.executemany("UPDATE event SET starts_at_ts = ? WHERE event_id = ?", [v for v in values if v[0] is not None])
+    conn.executescript(SQL)
+    conn.commit()
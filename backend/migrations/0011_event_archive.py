@@ -0,0 +1,63 @@
+"""Archive tables for finished events and their rows (see archive.py)."""
+
+SQL = """
+CREATE TABLE IF NOT EXISTS event_archive (
+  event_id TEXT NOT NULL,
+  title TEXT,
+  type TEXT,
+  description TEXT,
+  starts_at TEXT,
+  starts_at_ts INTEGER,
+  capacity INTEGER,
+  college_id TEXT,
+  cancelled_flag INTEGER,
+  features TEXT,
+  created_at TEXT,
+  registered_count INTEGER,
+  present_count INTEGER,
+  feedback_count INTEGER,
+  rating_count INTEGER,
+  rating_sum INTEGER,
+  registrations INTEGER,
+  presents INTEGER,
+  archived_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_event_archive_event ON event_archive(event_id);
+CREATE INDEX IF NOT EXISTS idx_event_archive_college ON event_archive(college_id);
+
+CREATE TABLE IF NOT EXISTS registration_archive (
+  reg_id INTEGER PRIMARY KEY,
+  event_id TEXT,
+  student_id TEXT,
+  registered_at TEXT,
+  token TEXT,
+  status TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_registration_archive_event ON registration_archive(event_id);
+CREATE INDEX IF NOT EXISTS idx_registration_archive_student ON registration_archive(lower(student_id));
+
+CREATE TABLE IF NOT EXISTS attendance_archive (
+  att_id INTEGER PRIMARY KEY,
+  event_id TEXT,
+  student_id TEXT,
+  attended_at TEXT,
+  present INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_attendance_archive_event ON attendance_archive(event_id);
+CREATE INDEX IF NOT EXISTS idx_attendance_archive_student ON attendance_archive(lower(student_id)) WHERE present = 1;
+
+CREATE TABLE IF NOT EXISTS feedback_archive (
+  fb_id INTEGER PRIMARY KEY,
+  event_id TEXT,
+  student_id TEXT,
+  rating INTEGER,
+  comment TEXT,
+  submitted_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_feedback_archive_event ON feedback_archive(event_id);
+"""
+
+
+def up(conn):
+    conn.executescript(SQL)
+    conn.commit()
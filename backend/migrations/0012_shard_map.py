@@ -0,0 +1,19 @@
+"""Routing tables for DATABASE_URL=shards:<dir> (see storage_sharded.py); unused on a single database."""
+
+SQL = """
+CREATE TABLE IF NOT EXISTS college_shard (
+  shard_no INTEGER PRIMARY KEY AUTOINCREMENT,
+  college_id TEXT NOT NULL UNIQUE,
+  created_at TEXT
+);
+CREATE TABLE IF NOT EXISTS event_shard (
+  event_id TEXT PRIMARY KEY,
+  college_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_event_shard_college ON event_shard(college_id);
+"""
+
+
+def up(conn):
+    conn.executescript(SQL)
+    conn.commit()
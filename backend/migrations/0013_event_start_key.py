@@ -0,0 +1,15 @@
+"""Listing indexes on (COALESCE(starts_at, ''), event_id): events without a start time stay pageable."""
+
+SQL = """
+DROP INDEX IF EXISTS idx_event_starts;
+DROP INDEX IF EXISTS idx_event_college_starts;
+DROP INDEX IF EXISTS idx_event_type_starts;
+CREATE INDEX IF NOT EXISTS idx_event_start_key ON event(COALESCE(starts_at, ''), event_id);
+CREATE INDEX IF NOT EXISTS idx_event_college_start_key ON event(college_id, COALESCE(starts_at, ''), event_id);
+CREATE INDEX IF NOT EXISTS idx_event_type_start_key ON event(type, COALESCE(starts_at, ''), event_id);
+"""
+
+
+def up(conn):
+    conn.executescript(SQL)
+    conn.commit()
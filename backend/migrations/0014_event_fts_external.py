@@ -0,0 +1,43 @@
+"""event_fts as an external-content index keyed by event.rowid, so updates and deletes touch one entry instead of scanning the index."""
+
+SQL = """
+DROP TRIGGER IF EXISTS trg_event_fts_ins;
+DROP TRIGGER IF EXISTS trg_event_fts_del;
+DROP TRIGGER IF EXISTS trg_event_fts_upd;
+DROP TABLE IF EXISTS event_fts;
+
+CREATE VIRTUAL TABLE event_fts USING fts5(
+  title, description, type, features,
+  content = 'event', content_rowid = 'rowid',
+  tokenize = 'unicode61 remove_diacritics 2'
+);
+INSERT INTO event_fts (event_fts) VALUES ('rebuild');
+
+CREATE TRIGGER trg_event_fts_ins AFTER INSERT ON event
+BEGIN
+  INSERT INTO event_fts (rowid, title, description, type, features)
+  VALUES (NEW.rowid, NEW.title, NEW.description, NEW.type, NEW.features);
+END;
+
+CREATE TRIGGER trg_event_fts_del AFTER DELETE ON event
+BEGIN
+  INSERT INTO event_fts (event_fts, rowid, title, description, type, features)
+  VALUES ('delete', OLD.rowid, OLD.title, OLD.description, OLD.type, OLD.features);
+END;
+
+CREATE TRIGGER trg_event_fts_upd AFTER UPDATE OF title, description, type, features ON event
+BEGIN
+  INSERT INTO event_fts (event_fts, rowid, title, description, type, features)
+  VALUES ('delete', OLD.rowid, OLD.title, OLD.description, OLD.type, OLD.features);
+  INSERT INTO event_fts (rowid, title, description, type, features)
+  VALUES (NEW.rowid, NEW.title, NEW.description, NEW.type, NEW.features);
+END;
+"""
+
+
+def up(conn):
+    # nothing to convert on SQLite builds without FTS5 (0004 skipped the index)
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='event_fts'").fetchone() is None:
+        return
+    conn.executescript(SQL)
+    conn.commit()
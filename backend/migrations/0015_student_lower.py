@@ -0,0 +1,10 @@
+"""Expression index on student(lower(student_id)) for the exports' case-insensitive student join."""
+
+SQL = """
+CREATE INDEX IF NOT EXISTS idx_student_lower ON student(lower(student_id));
+"""
+
+
+def up(conn):
+    conn.executescript(SQL)
+    conn.commit()
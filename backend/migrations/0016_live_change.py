@@ -0,0 +1,37 @@
+"""live_change: ids of events whose live counts changed, so the live broker re-reads only those (live.py)."""
+
+SQL = """
+CREATE TABLE IF NOT EXISTS live_change (
+  change_id INTEGER PRIMARY KEY,
+  event_id TEXT NOT NULL
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_live_change_ins AFTER INSERT ON event
+BEGIN
+  INSERT INTO live_change (event_id) VALUES (NEW.event_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_live_change_del AFTER DELETE ON event
+BEGIN
+  INSERT INTO live_change (event_id) VALUES (OLD.event_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_live_change_upd AFTER UPDATE OF registered_count, present_count, cancelled_flag ON event
+WHEN NEW.registered_count IS NOT OLD.registered_count OR NEW.present_count IS NOT OLD.present_count
+  OR NEW.cancelled_flag IS NOT OLD.cancelled_flag
+BEGIN
+  INSERT INTO live_change (event_id) VALUES (NEW.event_id);
+END;
+
+-- keep the newest 10000 rows; a watcher further behind re-reads every event
+CREATE TRIGGER IF NOT EXISTS trg_live_change_prune AFTER INSERT ON live_change
+WHEN NEW.change_id % 1000 = 0
+BEGIN
+  DELETE FROM live_change WHERE change_id <= NEW.change_id - 10000;
+END;
+"""
+
+
+def up(conn):
+    conn.executescript(SQL)
+    conn.commit()
@@ -0,0 +1,27 @@
+"""Recompute the event counters once: 0003 used to skip it when schema.sql had already created the columns."""
+
+SQL = """
+UPDATE event SET registered_count = x.registered_count, present_count = x.present_count,
+                 feedback_count = x.feedback_count, rating_count = x.rating_count, rating_sum = x.rating_sum
+FROM (
+  SELECT e.event_id,
+         COALESCE(r.registered_count, 0) AS registered_count,
+         COALESCE(a.present_count, 0) AS present_count,
+         COALESCE(f.feedback_count, 0) AS feedback_count,
+         COALESCE(f.rating_count, 0) AS rating_count,
+         COALESCE(f.rating_sum, 0) AS rating_sum
+  FROM event e
+  LEFT JOIN (SELECT event_id, COUNT(*) AS registered_count FROM registration
+             WHERE status = 'registered' GROUP BY event_id) r ON r.event_id = e.event_id
+  LEFT JOIN (SELECT event_id, COUNT(*) AS present_count FROM attendance
+             WHERE present = 1 GROUP BY event_id) a ON a.event_id = e.event_id
+  LEFT JOIN (SELECT event_id, COUNT(*) AS feedback_count, COUNT(rating) AS rating_count,
+                    SUM(rating) AS rating_sum FROM feedback GROUP BY event_id) f ON f.event_id = e.event_id
+) AS x
+WHERE x.event_id = event.event_id
+"""
+
+
+def up(conn):
+    conn.execute(SQL)
+    conn.commit()
@@ -0,0 +1,87 @@
+"""event.event_no: a stable INTEGER PRIMARY KEY for event_fts to key on (an implicit rowid may be renumbered by VACUUM)."""
+
+# event rebuilt with event_no aliasing the rowid; event_id stays the key every
+# other table references, now through a UNIQUE constraint
+TABLE_SQL = """
+CREATE TABLE event_new (
+  event_no INTEGER PRIMARY KEY,
+  event_id TEXT NOT NULL UNIQUE,
+  title TEXT NOT NULL,
+  type TEXT,
+  description TEXT,
+  starts_at TEXT,
+  capacity INTEGER,
+  college_id TEXT,
+  cancelled_flag INTEGER DEFAULT 0,
+  features TEXT, -- comma-separated tags / "features"
+  created_at TEXT,
+  -- per-event counters, maintained by triggers
+  registered_count INTEGER NOT NULL DEFAULT 0,
+  present_count INTEGER NOT NULL DEFAULT 0,
+  feedback_count INTEGER NOT NULL DEFAULT 0,
+  rating_count INTEGER NOT NULL DEFAULT 0,
+  rating_sum INTEGER NOT NULL DEFAULT 0,
+  starts_at_ts INTEGER
+);
+"""
+
+COLUMNS = ("event_id", "title", "type", "description", "starts_at", "capacity", "college_id", "cancelled_flag",
+           "features", "created_at", "registered_count", "present_count", "feedback_count", "rating_count",
+           "rating_sum", "starts_at_ts")
+
+FTS_SQL = """
+CREATE VIRTUAL TABLE event_fts USING fts5(
+  title, description, type, features,
+  content = 'event', content_rowid = 'event_no',
+  tokenize = 'unicode61 remove_diacritics 2'
+);
+INSERT INTO event_fts (event_fts) VALUES ('rebuild');
+
+CREATE TRIGGER trg_event_fts_ins AFTER INSERT ON event
+BEGIN
+  INSERT INTO event_fts (rowid, title, description, type, features)
+  VALUES (NEW.event_no, NEW.title, NEW.description, NEW.type, NEW.features);
+END;
+
+CREATE TRIGGER trg_event_fts_del AFTER DELETE ON event
+BEGIN
+  INSERT INTO event_fts (event_fts, rowid, title, description, type, features)
+  VALUES ('delete', OLD.event_no, OLD.title, OLD.description, OLD.type, OLD.features);
+END;
+
+CREATE TRIGGER trg_event_fts_upd AFTER UPDATE OF title, description, type, features ON event
+BEGIN
+  INSERT INTO event_fts (event_fts, rowid, title, description, type, features)
+  VALUES ('delete', OLD.event_no, OLD.title, OLD.description, OLD.type, OLD.features);
+  INSERT INTO event_fts (rowid, title, description, type, features)
+  VALUES (NEW.event_no, NEW.title, NEW.description, NEW.type, NEW.features);
+END;
+"""
+
+
+def up(conn):
+    if "event_no" in [r[1] for r in conn.execute("PRAGMA table_info(event)")]:
+        return
+    # the other indexes and triggers on event go with the old table; recreate them as they are
+    dependents = [r[0] for r in conn.execute(
+        "SELECT sql FROM sqlite_master WHERE tbl_name = 'event' AND type IN ('index', 'trigger') "
+        "AND sql IS NOT NULL AND name NOT LIKE 'trg_event_fts_%' ORDER BY type, name")]
+    has_fts = conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='event_fts'").fetchone()
+    cols = ", ".join(COLUMNS)
+    # the documented table rebuild: foreign keys off, one transaction; event_id
+    # values are copied unchanged, so every reference still resolves. The
+    # legacy rename leaves the counter triggers on registration / attendance /
+    # feedback, which name event, alone instead of failing on the dropped table.
+    conn.execute("PRAGMA foreign_keys = OFF")
+    conn.execute("PRAGMA legacy_alter_table = ON")
+    conn.executescript("BEGIN;\n"
+                       "DROP TABLE IF EXISTS event_new;\n"
+                       "DROP TABLE IF EXISTS event_fts;\n"
+                       + TABLE_SQL +
+                       f"INSERT INTO event_new (event_no, {cols}) SELECT rowid, {cols} FROM event ORDER BY rowid;\n"
+                       "DROP TABLE event;\n"
+                       "ALTER TABLE event_new RENAME TO event;\n"
+                       + "".join(sql + ";\n" for sql in dependents)
+                       + (FTS_SQL if has_fts else "")
+                       + "COMMIT;")
+    conn.execute("PRAGMA legacy_alter_table = OFF")
@@ -0,0 +1,50 @@
+"""attendance_change: one row per (event, student) whose attendance changed, in commit order, for gate delta sync."""
+
+SQL = """
+CREATE TABLE IF NOT EXISTS attendance_change (
+  change_id INTEGER PRIMARY KEY AUTOINCREMENT,
+  event_id TEXT NOT NULL,
+  student_id TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_attendance_change_pair ON attendance_change(event_id, student_id);
+CREATE INDEX IF NOT EXISTS idx_attendance_change_event ON attendance_change(event_id, change_id);
+
+-- each change replaces the pair's older row, so the log holds one row per pair,
+-- and AUTOINCREMENT keeps every new change_id above any id a gate has seen
+-- (not REPLACE: an upsert's ON CONFLICT would override it inside the trigger)
+CREATE TRIGGER IF NOT EXISTS trg_attendance_change_ins AFTER INSERT ON attendance
+BEGIN
+  DELETE FROM attendance_change WHERE event_id = NEW.event_id AND student_id = NEW.student_id;
+  INSERT INTO attendance_change (event_id, student_id)
+  SELECT NEW.event_id, NEW.student_id WHERE NEW.event_id IS NOT NULL AND NEW.student_id IS NOT NULL;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_attendance_change_upd
+AFTER UPDATE OF event_id, student_id, attended_at, present ON attendance
+BEGIN
+  DELETE FROM attendance_change WHERE event_id = OLD.event_id AND student_id = OLD.student_id;
+  INSERT INTO attendance_change (event_id, student_id)
+  SELECT OLD.event_id, OLD.student_id WHERE OLD.event_id IS NOT NULL AND OLD.student_id IS NOT NULL;
+  DELETE FROM attendance_change WHERE event_id = NEW.event_id AND student_id = NEW.student_id;
+  INSERT INTO attendance_change (event_id, student_id)
+  SELECT NEW.event_id, NEW.student_id WHERE NEW.event_id IS NOT NULL AND NEW.student_id IS NOT NULL;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_attendance_change_del AFTER DELETE ON attendance
+BEGIN
+  DELETE FROM attendance_change WHERE event_id = OLD.event_id AND student_id = OLD.student_id;
+  INSERT INTO attendance_change (event_id, student_id)
+  SELECT OLD.event_id, OLD.student_id WHERE OLD.event_id IS NOT NULL AND OLD.student_id IS NOT NULL;
+END;
+
+-- existing rows keep their att_id as change_id, so a gate's att_id cursor
+-- from before this migration still means "everything up to here"
+INSERT OR IGNORE INTO attendance_change (change_id, event_id, student_id)
+SELECT att_id, event_id, student_id FROM attendance WHERE event_id IS NOT NULL AND student_id IS NOT NULL
+ORDER BY att_id;
+"""
+
+
+def up(conn):
+    conn.executescript(SQL)
+    conn.commit()
@@ -0,0 +1,83 @@
+# backend/paging.py
+# Keyset (cursor) pagination and field projection for list endpoints.
+import base64
+import json
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+
+class PagingError(ValueError):
+    pass
+
+
+def encode_cursor(values):
+    raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor, size):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except Exception:
+        raise PagingError("invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise PagingError("invalid cursor")
+    return values
+
+
+def parse_page_args(args):
+    """
+    Read limit/cursor from request args. Returns (limit, cursor) where limit is
+    None when the caller asked for neither (old unpaginated behavior).
+    """
+    limit = args.get("limit")
+    cursor = args.get("cursor") or None
+    if limit is None and cursor is None:
+        return None, None
+    try:
+        limit = int(limit) if limit is not None else DEFAULT_LIMIT
+    except ValueError:
+        raise PagingError("limit must be an integer")
+    if limit < 1:
+        raise PagingError("limit must be positive")
+    return min(limit, MAX_LIMIT), cursor
+
+
+def parse_fields(args, field_map):
+    """Requested output fields (in field_map order), or all of them when not given."""
+    raw = args.get("fields")
+    if not raw:
+        return list(field_map)
+    wanted = [f.strip() for f in raw.split(",") if f.strip()]
+    unknown = [f for f in wanted if f not in field_map]
+    if unknown:
+        raise PagingError("unknown field(s): " + ", ".join(unknown))
+    return [f for f in field_map if f in wanted]
+
+
+def select_list(field_map, fields, required=()):
+    """SELECT column list for the requested fields plus any required (key) fields."""
+    names = list(fields) + [f for f in required if f not in fields]
+    return ", ".join(f"{field_map[n]} AS {n}" for n in names)
+
+
+def finish_page(rows, limit, key_fields):
+    """
+    Trim a limit+1 fetch to the page and build the next cursor from the last
+    row's key. Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    if limit is None or len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor([rows[-1][k] for k in key_fields])
+
+
+def project(rows, fields):
+    """Drop helper columns (keys, filter inputs) the caller did not ask for."""
+    keep = set(fields)
+    for r in rows:
+        for k in [k for k in r if k not in keep]:
+            del r[k]
+    return rows
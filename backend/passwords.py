@@ -0,0 +1,145 @@
+# backend/passwords.py
+# Password hashing off the request threads: a small bounded pool runs the KDF
+# (scrypt / pbkdf2 release the GIL inside hashlib, so threads hash in
+# parallel), and requests that find it full are turned away at once.
+import logging
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+log = logging.getLogger(__name__)
+
+
+class HashPoolBusy(Exception):
+    """The hashing queue is full (or a job waited too long); answer 503 + Retry-After."""
+
+    def __init__(self, retry_after):
+        super().__init__("password hashing is saturated")
+        self.retry_after = retry_after
+
+
+class HashPool:
+    """
+    At most `workers` hashes run at once and at most `max_queue` more wait for
+    a worker; anything beyond that raises HashPoolBusy without hashing, as
+    does a job still unfinished after wait_timeout seconds. `method` is a
+    werkzeug hash method ("scrypt", "scrypt:65536:8:1", "pbkdf2:sha256:600000");
+    rehash_if_needed() upgrades hashes made with other parameters.
+    """
+
+    def __init__(self, method="scrypt", workers=2, max_queue=16, wait_timeout=5.0):
+        self.method = method
+        self.workers = workers
+        self.max_queue = max_queue
+        self.wait_timeout = wait_timeout
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._method_tag = None
+        self._avg_s = 0.1  # moving average of one hash, for Retry-After
+        self._stats = {"hashed": 0, "verified": 0, "rehashed": 0, "rejected": 0, "timeouts": 0, "in_flight": 0}
+
+    def _pool(self):
+        # created on first use, i.e. after gunicorn has forked the worker
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="hash")
+            return self._executor
+
+    def _timed(self, fn, *args):
+        t0 = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._avg_s = 0.8 * self._avg_s + 0.2 * (time.perf_counter() - t0)
+
+    def _submit(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._stats["rejected"] += 1
+            raise HashPoolBusy(self.retry_after())
+        try:
+            fut = self._pool().submit(self._timed, fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._stats["in_flight"] += 1
+        fut.add_done_callback(self._done)
+        return fut
+
+    def _done(self, _fut):
+        with self._lock:
+            self._stats["in_flight"] -= 1
+        self._slots.release()
+
+    def _run(self, stat, fn, *args):
+        fut = self._submit(fn, *args)
+        try:
+            out = fut.result(timeout=self.wait_timeout)
+        except FutureTimeout:
+            fut.cancel()
+            with self._lock:
+                self._stats["timeouts"] += 1
+            raise HashPoolBusy(self.retry_after())
+        with self._lock:
+            self._stats[stat] += 1
+        return out
+
+    def hash(self, password):
+        return self._run("hashed", generate_password_hash, password, self.method)
+
+    def verify(self, stored_hash, password):
+        return self._run("verified", check_password_hash, stored_hash, password)
+
+    def _method_prefix(self):
+        if self._method_tag is None:
+            # werkzeug fills in default parameters, so ask it what `method` expands to
+            self._method_tag = generate_password_hash("", self.method).split("$", 1)[0]
+        return self._method_tag
+
+    def rehash_if_needed(self, stored_hash, password, save):
+        """
+        If stored_hash was made with other parameters than `method`, hash
+        password again in the background and call save(new_hash) from the
+        pool. Skipped when the pool is busy; the next successful login tries
+        again. Returns True if a rehash was queued.
+        """
+        prefix = stored_hash.split("$", 1)[0]
+        if self._method_tag is not None and prefix == self._method_tag:
+            return False
+
+        def job():
+            if prefix == self._method_prefix():
+                return
+            new_hash = generate_password_hash(password, self.method)
+            try:
+                save(new_hash)
+            except Exception:
+                log.exception("saving rehashed password failed")
+                return
+            with self._lock:
+                self._stats["rehashed"] += 1
+        try:
+            self._submit(job)
+        except HashPoolBusy:
+            return False
+        return True
+
+    def retry_after(self):
+        """Seconds until the current backlog should have drained (at least 1)."""
+        with self._lock:
+            backlog = self._stats["in_flight"] + 1
+            avg = self._avg_s
+        return max(1, math.ceil(backlog * avg / self.workers))
+
+    def stats(self):
+        with self._lock:
+            out = dict(self._stats)
+            out["avg_ms"] = round(self._avg_s * 1000, 1)
+        out.update(method=self.method, workers=self.workers, max_queue=self.max_queue)
+        return out
@@ -0,0 +1,71 @@
+# backend/ratelimit.py
+import math
+import threading
+import time
+from collections import OrderedDict
+
+
+class RateLimiter:
+    """
+    Token buckets keyed by string (client IP, account email): each key may
+    spend `burst` requests at once and regains `rate` per second. Only the
+    max_keys most recently seen keys are tracked, so memory stays bounded.
+    Per process, like the caches; with N workers a key's budget is up to N x.
+    """
+
+    def __init__(self, rate, burst, max_keys=100000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key -> (tokens, updated_at)
+        self._lock = threading.Lock()
+        self._stats = {"allowed": 0, "limited": 0}
+
+    @property
+    def enabled(self):
+        return self.rate > 0 and self.burst > 0
+
+    def _refill(self, key, now):
+        tokens, updated = self._buckets.pop(key, (self.burst, now))
+        return min(self.burst, tokens + (now - updated) * self.rate)
+
+    def blocked(self, key):
+        """Seconds until key has a token again, without spending one (0 if it has one now)."""
+        if not self.enabled:
+            return 0
+        now = time.monotonic()
+        with self._lock:
+            if key not in self._buckets:
+                return 0
+            tokens = self._refill(key, now)
+            self._buckets[key] = (tokens, now)
+            if tokens >= 1:
+                return 0
+            self._stats["limited"] += 1
+        return math.ceil((1 - tokens) / self.rate)
+
+    def hit(self, key):
+        """Spend one token for key. Returns 0 if allowed, else seconds until one is available."""
+        if not self.enabled:
+            return 0
+        now = time.monotonic()
+        with self._lock:
+            tokens = self._refill(key, now)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0
+                self._stats["allowed"] += 1
+            else:
+                wait = math.ceil((1 - tokens) / self.rate)
+                self._stats["limited"] += 1
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def stats(self):
+        with self._lock:
+            out = dict(self._stats)
+            out["keys"] = len(self._buckets)
+        out.update(rate=self.rate, burst=self.burst)
+        return out
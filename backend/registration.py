@@ -0,0 +1,77 @@
+# backend/registration.py
+import datetime
+import secrets
+
+from db import with_busy_retry
+
+MAX_BUSY_RETRIES = 5
+
+
+def claim_seat(conn, event_id, student_id, waitlist=False, dialect="sqlite", sign_token=None):
+    """
+    Register student_id for event_id inside a single IMMEDIATE transaction.
+
+    The write lock is taken up front, so the capacity check and the
+    registration insert cannot interleave with another registration
+    (event.registered_count is bumped by the registration insert trigger).
+    Returns (outcome, token, status) where outcome is one of "registered",
+    "waitlisted", "already", "not_found", "cancelled", "full".
+    On PostgreSQL the event row is locked instead (FOR UPDATE), so only
+    registrations for the same event queue behind each other.
+    sign_token(reg_id, event_id, student_id) issues the token (gate.py);
+    without it the token is random.
+    """
+    cur = conn.cursor()
+    if dialect == "sqlite":
+        cur.execute("BEGIN IMMEDIATE")
+    lock = " FOR UPDATE" if dialect == "postgres" else ""
+    try:
+        cur.execute("SELECT capacity, cancelled_flag, registered_count FROM event WHERE event_id = ?" + lock, (event_id,))
+        ev = cur.fetchone()
+        if ev is None:
+            conn.rollback()
+            return "not_found", None, None
+        if ev["cancelled_flag"]:
+            conn.rollback()
+            return "cancelled", None, None
+        cur.execute("SELECT token, status FROM registration WHERE event_id = ? AND student_id = ?",
+                    (event_id, student_id))
+        existing = cur.fetchone()
+        if existing:
+            conn.rollback()
+            return "already", existing["token"], existing["status"]
+        if ev["capacity"] is None or ev["registered_count"] < ev["capacity"]:
+            status = "registered"
+        elif waitlist:
+            status = "waitlisted"
+        else:
+            conn.rollback()
+            return "full", None, None
+        if sign_token is None:
+            token = secrets.token_urlsafe(12)
+            cur.execute("INSERT INTO registration (event_id,student_id,registered_at,token,status) VALUES (?,?,?,?,?)",
+                        (event_id, student_id, _now_iso(), token, status))
+        else:
+            # the signed token carries reg_id, so it is set once the row exists
+            cur.execute("INSERT INTO registration (event_id,student_id,registered_at,status) VALUES (?,?,?,?)" +
+                        (" RETURNING reg_id" if dialect == "postgres" else ""),
+                        (event_id, student_id, _now_iso(), status))
+            reg_id = cur.fetchone()[0] if dialect == "postgres" else cur.lastrowid
+            token = sign_token(reg_id, event_id, student_id)
+            cur.execute("UPDATE registration SET token = ? WHERE reg_id = ?", (token, reg_id))
+        conn.commit()
+        return status, token, status
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def register(get_conn, event_id, student_id, waitlist=False, retries=MAX_BUSY_RETRIES, sign_token=None):
+    """claim_seat with bounded, jittered retry when the write lock is contended."""
+    return with_busy_retry(get_conn, lambda conn: claim_seat(conn, event_id, student_id, waitlist=waitlist,
+                                                             sign_token=sign_token),
+                           retries=retries)
+
+
+def _now_iso():
+    return datetime.datetime.utcnow().isoformat()
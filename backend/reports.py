@@ -0,0 +1,273 @@
+# backend/reports.py
+# Precomputed report snapshots: per-event (registrations, presents among the
+# registered) and per-student (attended events). Triggers append the keys
+# touched by every registration/attendance/event write to report_change;
+# refresh() recomputes just those keys, so dashboard reads never aggregate
+# the history tables. Recomputing per key (rather than +1/-1 in triggers)
+# keeps joined aggregates like "present AND registered" exact under any
+# update or delete.
+#
+# Report reads only read the snapshots. A ReportFolder thread per process
+# folds the change log every few seconds, MAX_CHANGES rows per write
+# transaction; a backlog past MAX_BACKLOG (no app running to fold it) is
+# replaced by one full rebuild, so report_change stays bounded. The tables and
+# triggers come from migrations/0008_report_snapshots.py.
+#
+#   python reports.py             # rebuild every snapshot from base tables
+#   python reports.py --verify    # reconcile snapshots against a live recompute
+import argparse
+import datetime
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+import migrate
+
+MAX_CHANGES = 20000
+MAX_BACKLOG = 500000
+
+log = logging.getLogger(__name__)
+
+# live per-event aggregates; presents only count students registered for the event
+EVENT_AGG_SQL = """
+SELECT e.event_id,
+       (SELECT COUNT(*) FROM registration r
+         WHERE r.event_id = e.event_id AND r.status = 'registered') AS registrations,
+       (SELECT COUNT(*) FROM attendance a
+         WHERE a.event_id = e.event_id AND a.present = 1
+           AND EXISTS (SELECT 1 FROM registration r
+                        WHERE r.event_id = a.event_id AND r.status = 'registered'
+                          AND lower(r.student_id) = lower(a.student_id))) AS presents
+FROM event e
+"""
+
+# live per-student attended events (case-insensitive student ids)
+STUDENT_AGG_SQL = """
+SELECT lower(a.student_id) AS student_key, COUNT(*) AS attended_events
+FROM attendance a
+WHERE a.present = 1
+GROUP BY lower(a.student_id)
+"""
+
+
+# ---------------- report queries ----------------
+# (sql, params) builders shared by the /reports/* JSON endpoints and the
+# streaming /export/reports/* downloads. Filters are only emitted when given:
+# "(? IS NULL OR col = ?)" keeps the planner off the index.
+
+def registrations_sql(college_id=None):
+    where, params = ("WHERE e.college_id = ?", (college_id,)) if college_id else ("", ())
+    return f"""
+      SELECT e.event_id, e.title, e.type, e.registered_count AS registrations
+      FROM event e
+      {where}
+      ORDER BY registrations DESC
+    """, params
+
+
+def attendance_sql(event_id=None, live=False):
+    """From report_event, or with live=True recomputed from the base tables."""
+    if live:
+        where, params = ("WHERE e.event_id = ?", (event_id,)) if event_id else ("", ())
+        source = f"({EVENT_AGG_SQL} {where})"
+    else:
+        where, params = ("WHERE event_id = ?", (event_id,)) if event_id else ("", ())
+        source = f"(SELECT * FROM report_event {where})"
+    return f"""
+      SELECT e.event_id, e.title, x.registrations, x.presents,
+             ROUND(100.0 * x.presents / NULLIF(x.registrations, 0), 1) AS attendance_pct
+      FROM {source} x JOIN event e ON e.event_id = x.event_id
+      ORDER BY attendance_pct DESC
+    """, params
+
+
+def avg_feedback_sql(college_id=None):
+    where, params = ("WHERE e.college_id = ?", (college_id,)) if college_id else ("", ())
+    return f"""
+      SELECT e.event_id, e.title,
+             ROUND(1.0 * e.rating_sum / NULLIF(e.rating_count, 0), 2) AS avg_rating,
+             e.feedback_count
+      FROM event e
+      {where}
+      ORDER BY avg_rating DESC
+    """, params
+
+
+def students_sql(college_id=None):
+    """Every student with their attended-event count, most active first."""
+    where, params = ("WHERE s.college_id = ?", (college_id,)) if college_id else ("", ())
+    return f"""
+      SELECT s.student_id, s.name, s.roll_no, COALESCE(rs.attended_events, 0) AS attended_events
+      FROM student s LEFT JOIN report_student rs ON rs.student_key = lower(s.student_id)
+      {where}
+      ORDER BY attended_events DESC
+    """, params
+
+
+def pending(conn):
+    return conn.execute("SELECT COUNT(*) FROM report_change").fetchone()[0]
+
+
+def refresh(conn, limit=MAX_CHANGES, max_backlog=MAX_BACKLOG):
+    """Fold up to limit pending change-log rows into the snapshots. Returns the number applied."""
+    cur = conn.cursor()
+    # both ends of the queue come straight off the rowid b-tree
+    first, last = cur.execute("SELECT MIN(change_id), MAX(change_id) FROM report_change").fetchone()
+    if first is None:
+        return 0
+    if last - first >= max_backlog:
+        cur.execute("BEGIN IMMEDIATE")
+        rebuild(conn)
+        return last - first + 1
+    cur.execute("BEGIN IMMEDIATE")
+    try:
+        rows = cur.execute("SELECT change_id, event_id, student_key FROM report_change WHERE change_id > 0 "
+                           "ORDER BY change_id LIMIT ?",
+                           (limit,)).fetchall()
+        if rows:
+            events = json.dumps(sorted({r[1] for r in rows if r[1] is not None}))
+            students = json.dumps(sorted({r[2] for r in rows if r[2] is not None}))
+            _refresh_events(cur, events)
+            _refresh_students(cur, students)
+            cur.execute("DELETE FROM report_change WHERE change_id <= ?", (rows[-1][0],))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return len(rows)
+
+
+class ReportFolder:
+    """
+    Folds the change log in the background: refresh() (a storage's
+    refresh_reports) every interval seconds, repeated while it returns full
+    batches. on_fold(n) runs after a round that applied changes (cache
+    invalidation).
+    """
+
+    def __init__(self, refresh, interval=2.0, on_fold=None):
+        self.refresh = refresh
+        self.interval = interval
+        self.on_fold = on_fold
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stats = {"folds": 0, "changes": 0, "errors": 0}
+
+    def start(self):
+        with self._lock:
+            if self._thread is None and self.interval > 0:
+                self._thread = threading.Thread(target=self._run, name="report-folder", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.fold()
+            except Exception:
+                log.exception("report fold failed")
+                with self._lock:
+                    self._stats["errors"] += 1
+
+    def fold(self):
+        """Fold everything pending now; returns the number of changes applied."""
+        total = 0
+        while True:
+            applied = self.refresh()
+            total += applied
+            if applied < MAX_CHANGES:
+                break
+        if total:
+            with self._lock:
+                self._stats["folds"] += 1
+                self._stats["changes"] += total
+            if self.on_fold:
+                self.on_fold(total)
+        return total
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, interval=self.interval)
+
+
+def _refresh_events(cur, keys_json):
+    now = datetime.datetime.utcnow().isoformat()
+    cur.execute("DELETE FROM report_event WHERE event_id IN (SELECT value FROM json_each(?))", (keys_json,))
+    cur.execute(f"""
+        INSERT INTO report_event (event_id, registrations, presents, refreshed_at)
+        SELECT x.event_id, x.registrations, x.presents, ?
+        FROM ({EVENT_AGG_SQL} WHERE e.event_id IN (SELECT value FROM json_each(?))) x
+    """, (now, keys_json))
+
+
+def _refresh_students(cur, keys_json):
+    cur.execute("DELETE FROM report_student WHERE student_key IN (SELECT value FROM json_each(?))", (keys_json,))
+    cur.execute("""
+        INSERT INTO report_student (student_key, attended_events)
+        SELECT k.value, COUNT(*)
+        FROM json_each(?) k
+        JOIN attendance a ON a.student_id = k.value COLLATE NOCASE AND a.present = 1
+        GROUP BY k.value
+    """, (keys_json,))
+
+
+def rebuild(conn):
+    """Recompute every snapshot from the base tables and clear the change log."""
+    now = datetime.datetime.utcnow().isoformat()
+    conn.execute("DELETE FROM report_event")
+    conn.execute(f"INSERT INTO report_event (event_id, registrations, presents, refreshed_at) "
+                 f"SELECT x.event_id, x.registrations, x.presents, ? FROM ({EVENT_AGG_SQL}) x", (now,))
+    conn.execute("DELETE FROM report_student")
+    conn.execute(f"INSERT INTO report_student (student_key, attended_events) {STUDENT_AGG_SQL}")
+    conn.execute("DELETE FROM report_change")
+    conn.commit()
+
+
+def verify(conn):
+    """
+    Return (kind, key, column, snapshot, live) for every snapshot value that
+    differs from a live recompute. Call after refresh(): pending changes are
+    not drift.
+    """
+    drift = []
+    snap = {r[0]: r[1:] for r in conn.execute("SELECT event_id, registrations, presents FROM report_event")}
+    for event_id, regs, presents in conn.execute(EVENT_AGG_SQL):
+        have = snap.pop(event_id, None)
+        if have is None:
+            drift.append(("event", event_id, "row", None, "missing"))
+            continue
+        if have[0] != regs:
+            drift.append(("event", event_id, "registrations", have[0], regs))
+        if have[1] != presents:
+            drift.append(("event", event_id, "presents", have[1], presents))
+    drift.extend(("event", event_id, "row", "stale", None) for event_id in snap)
+    snap = dict(conn.execute("SELECT student_key, attended_events FROM report_student"))
+    for key, attended in conn.execute(STUDENT_AGG_SQL):
+        have = snap.pop(key, None)
+        if have != attended:
+            drift.append(("student", key, "attended_events", have, attended))
+    drift.extend(("student", key, "attended_events", have, None) for key, have in snap.items())
+    return drift
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild or reconcile report snapshots")
+    parser.add_argument("--db", default="events.db")
+    parser.add_argument("--verify", action="store_true", help="only report drift")
+    args = parser.parse_args()
+    migrate.migrate(args.db)
+    conn = sqlite3.connect(args.db)
+    if args.verify:
+        applied = refresh(conn)
+        drift = verify(conn)
+        for kind, key, col, have, want in drift:
+            print(f"{kind} {key}: {col} snapshot={have} live={want}")
+        print(f"folded {applied} pending change(s); " +
+              ("snapshots OK" if not drift else f"{len(drift)} value(s) drifted"))
+        conn.close()
+        raise SystemExit(1 if drift else 0)
+    rebuild(conn)
+    print("✅ report snapshots rebuilt")
+    conn.close()
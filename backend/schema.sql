@@ -33,7 +33,13 @@ CREATE TABLE IF NOT EXISTS event (
   college_id TEXT,
   cancelled_flag INTEGER DEFAULT 0,
   features TEXT, -- comma-separated tags / "features"
-  created_at TEXT
+  created_at TEXT,
+  -- per-event counters, maintained by triggers (see counters.py)
+  registered_count INTEGER NOT NULL DEFAULT 0,
+  present_count INTEGER NOT NULL DEFAULT 0,
+  feedback_count INTEGER NOT NULL DEFAULT 0,
+  rating_count INTEGER NOT NULL DEFAULT 0,
+  rating_sum INTEGER NOT NULL DEFAULT 0
 );
 
 CREATE TABLE IF NOT EXISTS registration (
@@ -0,0 +1,317 @@
+-- backend/schema_pg.sql
+-- PostgreSQL schema for storage_pg.py: the tables of schema.sql plus what the
+-- SQLite migrations add (counters, feature tags, scan log, indexes), with the
+-- triggers in PL/pgSQL and a tsvector table in place of FTS5. Every statement
+-- is idempotent; storage_pg.py applies the file whenever its checksum is new.
+--
+-- Text keys use COLLATE "C" so ORDER BY and keyset cursors compare bytes the
+-- way SQLite does. Foreign keys are declared in schema.sql but SQLite never
+-- enforced them (registrations name students that may not be on file), so
+-- only the event-owned rows below cascade.
+
+CREATE TABLE IF NOT EXISTS users (
+  user_id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+  email TEXT UNIQUE NOT NULL,
+  name TEXT,
+  password_hash TEXT NOT NULL,
+  role TEXT NOT NULL DEFAULT 'student',
+  created_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_users_email_lower ON users (lower(email));
+
+CREATE TABLE IF NOT EXISTS college (
+  college_id TEXT COLLATE "C" PRIMARY KEY,
+  name TEXT
+);
+
+CREATE TABLE IF NOT EXISTS student (
+  student_id TEXT COLLATE "C" PRIMARY KEY,
+  name TEXT,
+  roll_no TEXT,
+  college_id TEXT COLLATE "C"
+);
+CREATE INDEX IF NOT EXISTS idx_student_college ON student (college_id);
+CREATE INDEX IF NOT EXISTS idx_student_lower ON student (lower(student_id));
+
+CREATE TABLE IF NOT EXISTS event (
+  event_id TEXT COLLATE "C" PRIMARY KEY,
+  title TEXT NOT NULL,
+  type TEXT COLLATE "C",
+  description TEXT,
+  starts_at TEXT COLLATE "C",
+  capacity INTEGER,
+  college_id TEXT COLLATE "C",
+  cancelled_flag INTEGER DEFAULT 0,
+  features TEXT,
+  created_at TEXT,
+  registered_count INTEGER NOT NULL DEFAULT 0,
+  present_count INTEGER NOT NULL DEFAULT 0,
+  feedback_count INTEGER NOT NULL DEFAULT 0,
+  rating_count INTEGER NOT NULL DEFAULT 0,
+  rating_sum INTEGER NOT NULL DEFAULT 0
+);
+-- listings order by (COALESCE(starts_at, ''), event_id) so events without a start time can be paged past
+DROP INDEX IF EXISTS idx_event_starts;
+DROP INDEX IF EXISTS idx_event_college_starts;
+DROP INDEX IF EXISTS idx_event_type_starts;
+CREATE INDEX IF NOT EXISTS idx_event_start_key ON event ((COALESCE(starts_at, '')), event_id);
+CREATE INDEX IF NOT EXISTS idx_event_college_start_key ON event (college_id, (COALESCE(starts_at, '')), event_id);
+CREATE INDEX IF NOT EXISTS idx_event_type_start_key ON event (type, (COALESCE(starts_at, '')), event_id);
+-- normalized start time for time-window listings; storage_pg.py backfills it (see timewindow.py)
+ALTER TABLE event ADD COLUMN IF NOT EXISTS starts_at_ts BIGINT;
+CREATE INDEX IF NOT EXISTS idx_event_starts_ts ON event (starts_at_ts, event_id);
+CREATE INDEX IF NOT EXISTS idx_event_college_starts_ts ON event (college_id, starts_at_ts, event_id);
+
+CREATE TABLE IF NOT EXISTS registration (
+  reg_id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+  event_id TEXT COLLATE "C",
+  student_id TEXT COLLATE "C",
+  registered_at TEXT COLLATE "C",
+  token TEXT UNIQUE,
+  status TEXT DEFAULT 'registered'
+);
+CREATE INDEX IF NOT EXISTS idx_reg_event_student ON registration (event_id, student_id);
+CREATE INDEX IF NOT EXISTS idx_reg_student_lower ON registration (lower(student_id), registered_at, reg_id);
+
+CREATE TABLE IF NOT EXISTS attendance (
+  att_id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+  event_id TEXT COLLATE "C",
+  student_id TEXT COLLATE "C",
+  attended_at TEXT,
+  present INTEGER DEFAULT 1
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_att_event_student ON attendance (event_id, student_id);
+CREATE INDEX IF NOT EXISTS idx_att_event ON attendance (event_id, att_id);
+CREATE INDEX IF NOT EXISTS idx_att_student_lower ON attendance (lower(student_id)) WHERE present = 1;
+
+CREATE TABLE IF NOT EXISTS feedback (
+  fb_id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+  event_id TEXT COLLATE "C",
+  student_id TEXT COLLATE "C",
+  rating INTEGER,
+  comment TEXT,
+  submitted_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_feedback_event ON feedback (event_id);
+-- one row per (event, student), newest kept; see feedback_queue.py
+UPDATE feedback SET student_id = lower(btrim(student_id)) WHERE student_id <> lower(btrim(student_id));
+DELETE FROM feedback f USING feedback g
+ WHERE f.event_id = g.event_id AND f.student_id = g.student_id AND f.fb_id < g.fb_id;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_feedback_event_student ON feedback (event_id, student_id);
+
+CREATE TABLE IF NOT EXISTS event_feature (
+  event_id TEXT COLLATE "C" NOT NULL REFERENCES event (event_id) ON DELETE CASCADE,
+  tag TEXT COLLATE "C" NOT NULL,
+  PRIMARY KEY (event_id, tag)
+);
+CREATE INDEX IF NOT EXISTS idx_event_feature_tag ON event_feature (tag, event_id);
+
+CREATE TABLE IF NOT EXISTS scan_log (
+  scan_key TEXT PRIMARY KEY,
+  device_id TEXT,
+  event_id TEXT,
+  student_id TEXT,
+  status TEXT NOT NULL,
+  scanned_at TEXT,
+  received_at TEXT
+);
+
+-- ---------------- archive (see archive.py) ----------------
+CREATE TABLE IF NOT EXISTS event_archive (
+  event_id TEXT COLLATE "C" NOT NULL,
+  title TEXT,
+  type TEXT COLLATE "C",
+  description TEXT,
+  starts_at TEXT COLLATE "C",
+  starts_at_ts BIGINT,
+  capacity INTEGER,
+  college_id TEXT COLLATE "C",
+  cancelled_flag INTEGER,
+  features TEXT,
+  created_at TEXT,
+  registered_count INTEGER,
+  present_count INTEGER,
+  feedback_count INTEGER,
+  rating_count INTEGER,
+  rating_sum INTEGER,
+  registrations INTEGER,
+  presents INTEGER,
+  archived_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_event_archive_event ON event_archive (event_id);
+CREATE INDEX IF NOT EXISTS idx_event_archive_college ON event_archive (college_id);
+
+CREATE TABLE IF NOT EXISTS registration_archive (
+  reg_id BIGINT PRIMARY KEY,
+  event_id TEXT COLLATE "C",
+  student_id TEXT COLLATE "C",
+  registered_at TEXT COLLATE "C",
+  token TEXT,
+  status TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_registration_archive_event ON registration_archive (event_id);
+CREATE INDEX IF NOT EXISTS idx_registration_archive_student ON registration_archive (lower(student_id));
+
+CREATE TABLE IF NOT EXISTS attendance_archive (
+  att_id BIGINT PRIMARY KEY,
+  event_id TEXT COLLATE "C",
+  student_id TEXT COLLATE "C",
+  attended_at TEXT,
+  present INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_attendance_archive_event ON attendance_archive (event_id);
+CREATE INDEX IF NOT EXISTS idx_attendance_archive_student ON attendance_archive (lower(student_id)) WHERE present = 1;
+
+CREATE TABLE IF NOT EXISTS feedback_archive (
+  fb_id BIGINT PRIMARY KEY,
+  event_id TEXT COLLATE "C",
+  student_id TEXT COLLATE "C",
+  rating INTEGER,
+  comment TEXT,
+  submitted_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_feedback_archive_event ON feedback_archive (event_id);
+
+-- ---------------- counters (see counters.py) ----------------
+CREATE OR REPLACE FUNCTION trg_registration_count() RETURNS trigger AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.status = 'registered' THEN
+    UPDATE event SET registered_count = registered_count - 1 WHERE event_id = OLD.event_id;
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.status = 'registered' THEN
+    UPDATE event SET registered_count = registered_count + 1 WHERE event_id = NEW.event_id;
+  END IF;
+  RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION trg_attendance_count() RETURNS trigger AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.present = 1 THEN
+    UPDATE event SET present_count = present_count - 1 WHERE event_id = OLD.event_id;
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.present = 1 THEN
+    UPDATE event SET present_count = present_count + 1 WHERE event_id = NEW.event_id;
+  END IF;
+  RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION trg_feedback_count() RETURNS trigger AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    UPDATE event SET feedback_count = feedback_count - 1,
+                     rating_count = rating_count - (OLD.rating IS NOT NULL)::int,
+                     rating_sum = rating_sum - COALESCE(OLD.rating, 0)
+    WHERE event_id = OLD.event_id;
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    UPDATE event SET feedback_count = feedback_count + 1,
+                     rating_count = rating_count + (NEW.rating IS NOT NULL)::int,
+                     rating_sum = rating_sum + COALESCE(NEW.rating, 0)
+    WHERE event_id = NEW.event_id;
+  END IF;
+  RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_registration_count ON registration;
+CREATE TRIGGER trg_registration_count AFTER INSERT OR DELETE OR UPDATE OF status, event_id ON registration
+  FOR EACH ROW EXECUTE FUNCTION trg_registration_count();
+DROP TRIGGER IF EXISTS trg_attendance_count ON attendance;
+CREATE TRIGGER trg_attendance_count AFTER INSERT OR DELETE OR UPDATE OF present, event_id ON attendance
+  FOR EACH ROW EXECUTE FUNCTION trg_attendance_count();
+DROP TRIGGER IF EXISTS trg_feedback_count ON feedback;
+CREATE TRIGGER trg_feedback_count AFTER INSERT OR DELETE OR UPDATE OF rating, event_id ON feedback
+  FOR EACH ROW EXECUTE FUNCTION trg_feedback_count();
+
+-- ---------------- full-text search (see search.py) ----------------
+-- weights: title A, type / features B, description D
+CREATE TABLE IF NOT EXISTS event_search (
+  event_id TEXT COLLATE "C" PRIMARY KEY REFERENCES event (event_id) ON DELETE CASCADE,
+  doc tsvector NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_event_search_doc ON event_search USING gin (doc);
+
+CREATE OR REPLACE FUNCTION event_search_doc(title TEXT, type TEXT, features TEXT, description TEXT)
+RETURNS tsvector AS $$
+  SELECT setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+         setweight(to_tsvector('simple', coalesce(type, '') || ' ' || coalesce(features, '')), 'B') ||
+         setweight(to_tsvector('simple', coalesce(description, '')), 'D')
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION trg_event_search() RETURNS trigger AS $$
+BEGIN
+  INSERT INTO event_search (event_id, doc)
+  VALUES (NEW.event_id, event_search_doc(NEW.title, NEW.type, NEW.features, NEW.description))
+  ON CONFLICT (event_id) DO UPDATE SET doc = excluded.doc;
+  RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_event_search ON event;
+CREATE TRIGGER trg_event_search AFTER INSERT OR UPDATE OF title, description, type, features ON event
+  FOR EACH ROW EXECUTE FUNCTION trg_event_search();
+
+-- backfill events written before the trigger existed
+INSERT INTO event_search (event_id, doc)
+SELECT event_id, event_search_doc(title, type, features, description) FROM event
+ON CONFLICT (event_id) DO NOTHING;
+
+-- ---------------- live counts (see live.py) ----------------
+-- NOTIFY event_live with the event id when its live counts change; delivered
+-- at commit, once per id per transaction, to every node's broker
+DROP TRIGGER IF EXISTS trg_event_change ON event;
+DROP FUNCTION IF EXISTS trg_event_change();
+DROP SEQUENCE IF EXISTS event_change_seq;
+
+CREATE OR REPLACE FUNCTION trg_event_live() RETURNS trigger AS $$
+BEGIN
+  IF TG_OP = 'DELETE' THEN
+    PERFORM pg_notify('event_live', OLD.event_id);
+  ELSIF TG_OP = 'INSERT' THEN
+    PERFORM pg_notify('event_live', NEW.event_id);
+  ELSIF (NEW.registered_count, NEW.present_count, NEW.cancelled_flag)
+        IS DISTINCT FROM (OLD.registered_count, OLD.present_count, OLD.cancelled_flag) THEN
+    PERFORM pg_notify('event_live', NEW.event_id);
+  END IF;
+  RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_event_live ON event;
+CREATE TRIGGER trg_event_live AFTER INSERT OR UPDATE OR DELETE ON event
+  FOR EACH ROW EXECUTE FUNCTION trg_event_live();
+
+-- ---------------- attendance delta sync (see attendance.py) ----------------
+-- one row per (event, student) whose attendance changed, stamped with the
+-- writing transaction's id; a reader only returns ids below the oldest
+-- transaction still running, so no commit can land behind its cursor
+CREATE TABLE IF NOT EXISTS attendance_change (
+  event_id TEXT COLLATE "C" NOT NULL,
+  student_id TEXT COLLATE "C" NOT NULL,
+  txid BIGINT NOT NULL,
+  PRIMARY KEY (event_id, student_id)
+);
+CREATE INDEX IF NOT EXISTS idx_attendance_change_event ON attendance_change (event_id, txid);
+
+CREATE OR REPLACE FUNCTION trg_attendance_change() RETURNS trigger AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.event_id IS NOT NULL AND OLD.student_id IS NOT NULL THEN
+    INSERT INTO attendance_change (event_id, student_id, txid)
+    VALUES (OLD.event_id, OLD.student_id, pg_current_xact_id()::text::bigint)
+    ON CONFLICT (event_id, student_id) DO UPDATE SET txid = excluded.txid;
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.event_id IS NOT NULL AND NEW.student_id IS NOT NULL THEN
+    INSERT INTO attendance_change (event_id, student_id, txid)
+    VALUES (NEW.event_id, NEW.student_id, pg_current_xact_id()::text::bigint)
+    ON CONFLICT (event_id, student_id) DO UPDATE SET txid = excluded.txid;
+  END IF;
+  RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_attendance_change ON attendance;
+CREATE TRIGGER trg_attendance_change
+  AFTER INSERT OR DELETE OR UPDATE OF event_id, student_id, attended_at, present ON attendance
+  FOR EACH ROW EXECUTE FUNCTION trg_attendance_change();
+
+-- rows checked in before the trigger existed
+INSERT INTO attendance_change (event_id, student_id, txid)
+SELECT event_id, student_id, pg_current_xact_id()::text::bigint FROM attendance
+WHERE event_id IS NOT NULL AND student_id IS NOT NULL
+ON CONFLICT (event_id, student_id) DO NOTHING;
@@ -0,0 +1,64 @@
+# backend/search.py
+# FTS5 full-text index over event title/description/type/features.
+# The index is kept in sync by triggers on event, so every writer
+# (events_collection POST, event_item PUT/DELETE, scripts) stays consistent.
+# It is an external-content table keyed by event.event_no, the INTEGER PRIMARY
+# KEY that VACUUM keeps stable: the text is read from event itself, and the
+# triggers add / remove index entries by event_no. The table and triggers come
+# from migrations (0004_event_search.py, 0014, 0018_event_no.py).
+#
+#   python search.py --db events.db   # migrate, then rebuild the index from event
+import argparse
+import re
+import sqlite3
+
+import migrate
+
+# reindex every event from the content table
+REBUILD_SQL = "INSERT INTO event_fts (event_fts) VALUES ('rebuild')"
+
+# bm25 column weights: title, description, type, features
+RANK_SQL = "bm25(event_fts, 10.0, 1.0, 4.0, 4.0)"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def index_present(conn):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='event_fts'").fetchone() is not None
+
+
+def rebuild(conn):
+    conn.execute(REBUILD_SQL)
+    conn.commit()
+
+
+def match_expression(text):
+    """
+    Turn free text into an FTS5 query: every word must match, each as a prefix
+    ("ml work" -> "ml"* AND "work"*). Returns None when there is nothing to search.
+    """
+    tokens = _TOKEN_RE.findall(text or "")
+    if not tokens:
+        return None
+    return " ".join('"%s"*' % t for t in tokens)
+
+
+def tsquery_expression(text):
+    """The same query for PostgreSQL to_tsquery: "ml work" -> ml:* & work:*."""
+    tokens = _TOKEN_RE.findall(text or "")
+    if not tokens:
+        return None
+    return " & ".join("%s:*" % t for t in tokens)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the event full-text index")
+    parser.add_argument("--db", default="events.db")
+    args = parser.parse_args()
+    migrate.migrate(args.db)
+    conn = sqlite3.connect(args.db)
+    if not index_present(conn):
+        raise SystemExit("this SQLite build has no FTS5")
+    rebuild(conn)
+    print("✅ event_fts rebuilt")
+    conn.close()
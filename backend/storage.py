@@ -0,0 +1,467 @@
+# backend/storage.py
+# Storage abstraction: app.py talks to a Storage object through repository
+# methods per entity (users, events, registrations, attendance, feedback,
+# reports, exports) instead of sending SQL itself. Two backends:
+#
+#   SQLiteStorage   (storage_sqlite.py)  one file, one writer node (default)
+#   PostgresStorage (storage_pg.py)      pooled psycopg; several app nodes
+#
+# open_storage() picks one from a URL: postgresql://... or a SQLite path, or
+# shards:<dir> for one SQLite file per college (storage_sharded.py).
+# The SQL shared by both backends lives here, written with "?" placeholders
+# (the PostgreSQL connection wrapper translates them); anything dialect
+# specific (search, seat claims, report snapshots, bulk check-in) is a hook
+# the backends implement.
+import datetime
+from contextlib import contextmanager
+
+import archive
+import attendance
+import export
+import feedback_queue
+import features as event_features
+import paging
+import timewindow
+
+
+class StorageError(Exception):
+    pass
+
+
+class IntegrityError(StorageError):
+    """A unique / NOT NULL constraint rejected the write (duplicate id, email, ...)."""
+
+
+class BusyError(StorageError):
+    """The database stayed locked / contended past the retry budget; answer 503 + Retry-After."""
+
+
+# output field -> SQL expression, for ?fields= projection
+EVENT_FIELDS = {
+    "event_id": "e.event_id", "title": "e.title", "type": "e.type", "description": "e.description",
+    "starts_at": "e.starts_at", "capacity": "e.capacity", "college_id": "e.college_id",
+    "cancelled_flag": "e.cancelled_flag", "features": "e.features", "registered_count": "e.registered_count",
+}
+
+REGISTRATION_FIELDS = {
+    "reg_id": "r.reg_id", "event_id": "r.event_id", "token": "r.token", "status": "r.status",
+    "registered_at": "r.registered_at", "event_title": "e.title", "event_starts_at": "e.starts_at",
+    "event_type": "e.type", "event_description": "e.description", "event_capacity": "e.capacity",
+}
+
+# listing order / keyset key: NULL starts_at sorts (and compares) as "" on both
+# backends; matches the idx_event_*start_key expression indexes
+START_KEY = "COALESCE(e.starts_at, '')"
+
+# columns of GET /events/<id>: the event row without internal columns
+EVENT_COLUMNS = ("event_id", "title", "type", "description", "starts_at", "capacity", "college_id",
+                 "cancelled_flag", "features", "created_at", "registered_count", "present_count",
+                 "feedback_count", "rating_count", "rating_sum")
+EVENT_WRITABLE = ("title", "type", "description", "starts_at", "capacity", "college_id", "cancelled_flag", "features")
+
+REPORTS = ("registrations", "attendance_percentage", "top-active-students", "avg_feedback")
+# columns of each report's rows (?format=columns, exports assembled from rows)
+REPORT_COLUMNS = {
+    "registrations": ("event_id", "title", "type", "registrations"),
+    "attendance_percentage": ("event_id", "title", "registrations", "presents", "attendance_pct"),
+    "avg_feedback": ("event_id", "title", "avg_rating", "feedback_count"),
+    "top-active-students": ("student_id", "name", "roll_no", "attended_events"),
+}
+EXPORTS = ("registrations", "attendance", "feedback") + tuple("reports/" + r for r in REPORTS)
+
+
+class Storage:
+    """
+    Base class. Backends provide connection() (a pooled DB-API connection
+    that takes "?" placeholders and returns rows readable by index or column
+    name), errors(), and the dialect hooks below; the repository methods are
+    written against those, so driver errors come out as IntegrityError /
+    BusyError.
+    """
+
+    dialect = None
+    search_enabled = False
+    sign_token = None  # gate.TokenSigner.sign: registration tokens are signed, not random
+    like = "LIKE"  # case-insensitive LIKE
+    # errors that mean the database (locked, down), not the statement: worth retrying as is
+    transient_errors = (BusyError,)
+
+    # ---------------- plumbing (per backend) ----------------
+    def connection(self):
+        """Context manager: a pooled connection, the same one for nested use on one thread."""
+        raise NotImplementedError
+
+    def errors(self):
+        """Context manager turning driver exceptions into IntegrityError / BusyError."""
+        raise NotImplementedError
+
+    def migrate(self, log=print):
+        """Apply pending schema changes; returns what was applied."""
+        raise NotImplementedError
+
+    def pending_migrations(self):
+        raise NotImplementedError
+
+    def load_capabilities(self):
+        """Look at the (migrated) schema for optional features such as search_enabled."""
+
+    def live_source(self):
+        """An object with version() and state() for live.LiveBroker."""
+        raise NotImplementedError
+
+    def stats(self):
+        raise NotImplementedError
+
+    def describe(self):
+        """Where the data lives, for /health (no credentials)."""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    # ---------------- plumbing (shared) ----------------
+    def query(self, sql, params=()):
+        """Rows of sql as a list of dicts."""
+        with self.errors(), self.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(sql, params)
+            return [dict(r) for r in cur.fetchall()]
+
+    def execute(self, sql, params=()):
+        """Run one write in its own transaction; returns the rowcount."""
+        with self.errors(), self.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(sql, params)
+            conn.commit()
+            return cur.rowcount
+
+    @contextmanager
+    def transaction(self):
+        """Cursor in a transaction: committed when the block exits, rolled back on error."""
+        with self.errors(), self.connection() as conn:
+            cur = conn.cursor()
+            try:
+                yield cur
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    def stream(self, sql, params=(), batch_size=1000):
+        """
+        Generator: the column names, then lists of row tuples. The connection
+        is held only while the generator runs.
+        """
+        with self.errors(), self.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(sql, params)
+            yield [d[0] for d in cur.description]
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield [tuple(r) for r in rows]
+
+    # ---------------- users ----------------
+    def user_by_email(self, email):
+        rows = self.query("SELECT * FROM users WHERE lower(email) = lower(?)", (email.lower(),))
+        return rows[0] if rows else None
+
+    def user_identity(self, user_id):
+        """(user_id, email, name, role) or None."""
+        rows = self.query("SELECT user_id, email, name, role FROM users WHERE user_id = ?", (user_id,))
+        return rows[0] if rows else None
+
+    def create_user(self, email, name, password_hash, role, created_at):
+        self.execute("INSERT INTO users (email,name,password_hash,role,created_at) VALUES (?,?,?,?,?)",
+                     (email, name, password_hash, role, created_at))
+        return self.user_by_email(email)
+
+    def set_password(self, email, password_hash):
+        return self.execute("UPDATE users SET password_hash = ? WHERE lower(email) = lower(?)", (password_hash, email))
+
+    def replace_password(self, user_id, new_hash, old_hash):
+        """Swap the hash only if it is still old_hash (a concurrent reset wins)."""
+        return self.execute("UPDATE users SET password_hash = ? WHERE user_id = ? AND password_hash = ?",
+                            (new_hash, user_id, old_hash))
+
+    # ---------------- events ----------------
+    def search_clause(self, text):
+        """(WHERE fragment on alias e, params) for a full-text match, or None without an index."""
+        return None
+
+    def rank_source(self, text):
+        """(subquery of event_id, score (lower is better), params) for ?sort=relevance."""
+        return None
+
+    def list_events(self, college_id=None, type=None, search=None, tags=(), match_all=True, ranked=False,
+                    fields=None, limit=None, cursor=None, facets=False, starts_from=None, starts_to=None):
+        """
+        GET /events. Returns (rows, next_cursor, facet counts or None); raises
+        paging.PagingError for a bad cursor. ranked orders by search relevance
+        (when there is a full-text match) instead of (starts_at, event_id).
+        starts_from / starts_to bound starts_at_ts (Unix seconds, inclusive).
+        """
+        fields = fields or list(EVENT_FIELDS)
+        rows, key_fields, facet_rows = self._event_page(college_id, type, search, tags, match_all, ranked, fields,
+                                                        limit, cursor, facets, starts_from, starts_to)
+        rows, next_cursor = paging.finish_page(rows, limit, key_fields)
+        return paging.project(rows, fields), next_cursor, facet_rows
+
+    def _event_page(self, college_id, type, search, tags, match_all, ranked, fields, limit, cursor, facets,
+                    starts_from, starts_to):
+        """
+        list_events() before trimming: up to limit + 1 rows carrying their
+        key fields, the key field names, and the facet rows.
+        """
+        match = self.search_clause(search) if search else None
+        ranked = bool(match) and ranked
+        # filters shared by the listing and the facet counts
+        where, params = [], []
+        if match:
+            where.append(match[0]); params.extend(match[1])
+        elif search:
+            where.append(f"e.title {self.like} ?"); params.append(f"%{search}%")
+        if college_id:
+            where.append("e.college_id = ?"); params.append(college_id)
+        if type:
+            where.append("e.type = ?"); params.append(type)
+        if tags:
+            clause, tag_params = event_features.filter_clause(tags, match_all)
+            where.append(clause); params.extend(tag_params)
+        if starts_from is not None:
+            where.append("e.starts_at_ts >= ?"); params.append(starts_from)
+        if starts_to is not None:
+            where.append("e.starts_at_ts <= ?"); params.append(starts_to)
+        filter_where, filter_params = list(where), list(params)
+
+        joins = ""
+        if ranked:
+            # the join carries the match itself, so drop the filter form
+            source, source_params = self.rank_source(search)
+            joins = f" JOIN ({source}) s ON s.event_id = e.event_id"
+            where.pop(0)
+            params = list(source_params) + params[len(match[1]):]
+        key_fields = ("score", "event_id") if ranked else ("starts_at", "event_id")
+        if cursor and ranked:
+            where.append("(s.score, e.event_id) > (?, ?)"); params.extend(paging.decode_cursor(cursor, 2))
+        elif cursor:
+            # a NULL starts_at pages as "" (START_KEY), so events without a start time can be paged past
+            start, event_id = paging.decode_cursor(cursor, 2)
+            where.append(f"({START_KEY}, e.event_id) > (?, ?)"); params.extend(("" if start is None else start, event_id))
+        sql = "SELECT " + paging.select_list(EVENT_FIELDS, fields, key_fields[1:] if ranked else key_fields)
+        if ranked:
+            sql += ", s.score AS score"
+        sql += " FROM event e" + joins
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY s.score ASC, e.event_id ASC" if ranked else f" ORDER BY {START_KEY} ASC, e.event_id ASC"
+        if limit is not None:
+            sql += " LIMIT ?"; params.append(limit + 1)
+        rows = self.query(sql, tuple(params))
+        facet_rows = self.query(event_features.facets_sql(filter_where), tuple(filter_params)) if facets else None
+        return rows, key_fields, facet_rows
+
+    def get_event(self, event_id):
+        rows = self.query("SELECT " + ", ".join(EVENT_COLUMNS) + " FROM event WHERE event_id = ?", (event_id,))
+        return rows[0] if rows else None
+
+    def event_college(self, event_id):
+        """(found, college_id) for cache invalidation."""
+        rows = self.query("SELECT college_id FROM event WHERE event_id = ?", (event_id,))
+        return (True, rows[0]["college_id"]) if rows else (False, None)
+
+    def create_event(self, event):
+        """Insert an event dict (EVENT_WRITABLE + event_id, created_at) and its tag rows."""
+        cols = ("event_id",) + EVENT_WRITABLE + ("created_at", "starts_at_ts")
+        values = tuple(_event_value(c, event.get(c)) for c in cols[:-1]) + (timewindow.to_epoch(event.get("starts_at")),)
+        with self.transaction() as cur:
+            cur.execute(f"INSERT INTO event ({','.join(cols)}) VALUES ({','.join('?' * len(cols))})", values)
+            event_features.set_event_tags(cur, event["event_id"], event.get("features"))
+
+    def update_event(self, event_id, updates):
+        """Set the given EVENT_WRITABLE columns; returns the number of rows updated (0 or 1)."""
+        cols = [c for c in EVENT_WRITABLE if c in updates]
+        values = [_event_value(c, updates[c]) for c in cols]
+        if "starts_at" in updates:
+            cols.append("starts_at_ts"); values.append(timewindow.to_epoch(updates["starts_at"]))
+        with self.transaction() as cur:
+            cur.execute("UPDATE event SET " + ", ".join(f"{c} = ?" for c in cols) + " WHERE event_id = ?",
+                        tuple(values) + (event_id,))
+            updated = cur.rowcount
+            if "features" in updates and updated:
+                event_features.set_event_tags(cur, event_id, updates["features"])
+        return updated
+
+    def delete_event(self, event_id):
+        return self.execute("DELETE FROM event WHERE event_id = ?", (event_id,))
+
+    # ---------------- registrations ----------------
+    def register(self, event_id, student_id, waitlist=False):
+        """
+        Claim a seat. Returns (outcome, token, status); outcome is one of
+        "registered", "waitlisted", "already", "not_found", "cancelled", "full".
+        """
+        raise NotImplementedError
+
+    def gate_roster(self, event_id):
+        """{reg_id: status} for every registration of event_id (gate.GateRosters)."""
+        rows = self.query("SELECT reg_id, status FROM registration WHERE event_id = ?", (event_id,))
+        return {r["reg_id"]: r["status"] for r in rows}
+
+    def registration_by_token(self, token):
+        rows = self.query("SELECT event_id, student_id FROM registration WHERE token = ? AND status = 'registered'",
+                          (token,))
+        return rows[0] if rows else None
+
+    def registrations_for_student(self, student_id, fields=None, limit=None, cursor=None):
+        """GET /registrations, newest first. Returns (rows, next_cursor)."""
+        fields = fields or list(REGISTRATION_FIELDS)
+        rows = self._registration_page(student_id, fields, limit, cursor)
+        rows, next_cursor = paging.finish_page(rows, limit, ("registered_at", "reg_id"))
+        return paging.project(rows, fields), next_cursor
+
+    def _registration_page(self, student_id, fields, limit, cursor):
+        """
+        registrations_for_student() before trimming: up to limit + 1 rows with
+        their keys, from the current and the archived (archive.py) registrations.
+        """
+        # case-insensitive match to handle r001 vs R001
+        where = ["lower(r.student_id) = lower(?)"]
+        params = [student_id]
+        if cursor:
+            where.append("(r.registered_at, r.reg_id) < (?, ?)"); params.extend(paging.decode_cursor(cursor, 2))
+        columns = paging.select_list(REGISTRATION_FIELDS, fields, ("registered_at", "reg_id"))
+        parts = [f"SELECT {columns} FROM {reg} r LEFT JOIN {ev} e ON r.event_id = e.event_id WHERE " +
+                 " AND ".join(where)
+                 for reg, ev in (("registration", "event"), ("registration_archive", "event_archive"))]
+        params = params * 2
+        sql = " UNION ALL ".join(parts) + " ORDER BY registered_at DESC, reg_id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"; params.append(limit + 1)
+        return self.query(sql, tuple(params))
+
+    # ---------------- attendance / feedback ----------------
+    def mark_attendance(self, event_id, student_id, now):
+        """Upsert a present row for (event_id, student_id)."""
+        self.execute(attendance.UPSERT_SQL, (event_id, student_id, now))
+
+    def ingest_attendance(self, tokens=(), event_id=None, student_ids=(), now=None, resolved=None):
+        """Bulk check-in; see attendance.ingest_batch. Returns (results, marked_event_ids)."""
+        raise NotImplementedError
+
+    def sync_scans(self, scans, device_id=None, now=None, resolved=None):
+        """Offline scan queue; see attendance.sync_scans. Returns (results, marked_event_ids)."""
+        raise NotImplementedError
+
+    def attendance_changes(self, event_id, since):
+        with self.errors(), self.connection() as conn:
+            return attendance.changes_since(conn, event_id, since, dialect=self.dialect)
+
+    def add_feedback(self, event_id, student_id, rating, comment, now):
+        """Upsert one student's feedback for an event (a resubmission replaces it)."""
+        self.execute(feedback_queue.UPSERT_SQL, (event_id, student_id, rating, comment, now))
+
+    def add_feedback_batch(self, rows):
+        """
+        Upsert (event_id, student_id, rating, comment, submitted_at) rows in one
+        transaction, for feedback_queue's flusher; returns their event ids.
+        """
+        with self.transaction() as cur:
+            cur.executemany(feedback_queue.UPSERT_SQL, rows)
+        return sorted({r[0] for r in rows})
+
+    # ---------------- reports ----------------
+    def report_sql(self, name, event_id=None, college_id=None):
+        """(sql, params) for one of REPORTS, every row (the export form)."""
+        raise NotImplementedError
+
+    def report(self, name, event_id=None, college_id=None, limit=None, fresh=False):
+        """
+        Rows for one of REPORTS. fresh=True recomputes from the base tables
+        where the backend would otherwise read precomputed snapshots.
+        """
+        raise NotImplementedError
+
+    def report_with_archive(self, name, event_id=None, college_id=None, limit=None):
+        """
+        A report over current and archived events (?archived=1). Archived
+        events contribute the aggregates frozen in event_archive; students
+        add their archived check-ins.
+        """
+        if name == "top-active-students":
+            rows = self.query(*self.report_sql(name, college_id=college_id))
+            extra = {r["student_key"]: r["attended_events"] for r in self.query(archive.ARCHIVED_STUDENTS_SQL)}
+            for r in rows:
+                r["attended_events"] += extra.get(r["student_id"].lower(), 0)
+            return archive.sort_report(name, rows)[:limit or 10]
+        where, params = ("WHERE e.event_id = ?", (event_id,)) if event_id else ("", ())
+        if college_id and name != "attendance_percentage":
+            where, params = "WHERE e.college_id = ?", (college_id,)
+        rows = self.report(name, event_id=event_id, college_id=college_id, fresh=True)
+        rows += self.query(archive.ARCHIVED_REPORT_SQL[name].format(where=where), params)
+        return archive.sort_report(name, rows)
+
+    def refresh_reports(self):
+        """
+        Fold a batch of pending changes into the report snapshots, taking the
+        write lock (reports.ReportFolder calls it; no-op where reports are
+        computed live). Returns the number of changes applied.
+        """
+        return 0
+
+    def reports_pending(self):
+        return 0
+
+    # ---------------- archive ----------------
+    def count_archivable(self, cutoff_ts):
+        return self.query("SELECT COUNT(*) AS n FROM event WHERE starts_at_ts < ?", (cutoff_ts,))[0]["n"]
+
+    def archive_events(self, cutoff_ts, batch=archive.BATCH_EVENTS):
+        """
+        Move events that started before cutoff_ts, with their registrations,
+        attendance and feedback, to the archive tables (archive.py), batch
+        events per transaction. Returns the number of rows moved per table.
+        """
+        totals = dict.fromkeys(("event",) + tuple(archive.CHILD_COLS), 0)
+        while True:
+            now = datetime.datetime.utcnow().isoformat()
+            with self.transaction() as cur:
+                cur.execute("SELECT event_id FROM event WHERE starts_at_ts < ? ORDER BY starts_at_ts LIMIT ?",
+                            (cutoff_ts, batch))
+                event_ids = [r[0] for r in cur.fetchall()]
+                moved = archive.archive_batch(cur, event_ids, now) if event_ids else {}
+            if not event_ids:
+                break
+            for table, n in moved.items():
+                totals[table] += n
+        self.refresh_reports()
+        return totals
+
+    # ---------------- exports ----------------
+    def export_sql(self, dataset, event_id=None, college_id=None):
+        if dataset.startswith("reports/"):
+            return self.report_sql(dataset[len("reports/"):], event_id=event_id, college_id=college_id)
+        return getattr(export, dataset + "_sql")(event_id, college_id)
+
+
+def _event_value(col, value):
+    if col == "cancelled_flag":
+        return 1 if value else 0
+    return value
+
+
+def open_storage(url, **options):
+    """
+    Storage for url: "postgresql://..." (or postgres://) for PostgreSQL,
+    "shards:<dir>" for per-college SQLite shards, anything else is a SQLite
+    database path. options go to the backend.
+    """
+    if url.startswith(("postgresql://", "postgres://")):
+        from storage_pg import PostgresStorage
+        return PostgresStorage(url, **{k: v for k, v in options.items() if k in PostgresStorage.OPTIONS})
+    if url.startswith("shards:"):
+        from storage_sharded import ShardedStorage
+        return ShardedStorage(url, **{k: v for k, v in options.items() if k in ShardedStorage.OPTIONS})
+    from storage_sqlite import SQLiteStorage
+    return SQLiteStorage(url, **{k: v for k, v in options.items() if k in SQLiteStorage.OPTIONS})
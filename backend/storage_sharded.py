@@ -0,0 +1,567 @@
+# backend/storage_sharded.py
+# Per-college sharding on SQLite: DATABASE_URL=shards:<dir>. Each college's
+# events, registrations, attendance and feedback live in their own database
+# file (<dir>/shard-NNNN.db, a full SQLiteStorage with every migration), so
+# writers for different colleges never contend for one file lock. Users,
+# students, colleges and the routing maps stay in <dir>/global.db:
+#
+#   college_shard  college_id -> shard_no (a shard is created with the first
+#                  event of its college; events without a college share "")
+#   event_shard    event_id -> college_id, for routes that only have an event id
+#
+# Requests with a college_id or event_id go to one shard; signed tokens name
+# their event (gate.peek). Listings, reports and exports without one fan out
+# to every shard on a thread pool and merge in the order the single-database
+# query would have produced. Row ids start at shard_no << SHARD_ID_BITS in
+# each shard so reg_id / att_id / fb_id stay unique across shards.
+#
+# The college_shard list is cached per process: this process refreshes it when
+# it adds a college, and every shard_map_ttl_s seconds for colleges added by
+# other workers (a college named in a request is always found, cache or not).
+import datetime
+import json
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import archive
+import export
+import gate
+import paging
+import reports
+from live import SQLiteLiveSource
+from storage import EVENT_FIELDS, EVENT_WRITABLE, REGISTRATION_FIELDS, REPORT_COLUMNS, IntegrityError, Storage
+from storage_sqlite import SQLiteStorage
+
+SHARD_ID_BITS = 40
+
+
+def _asc(value):
+    # the order of storage.START_KEY: a NULL key sorts as ""
+    return "" if value is None else value
+
+
+class _Export:
+    """export_sql() result: the dataset to assemble in stream() from the shards."""
+
+    def __init__(self, dataset, event_id, college_id):
+        self.dataset, self.event_id, self.college_id = dataset, event_id, college_id
+
+
+class ShardedLiveSource:
+    """Live counters over every shard; the cursor is per shard, and a new shard means re-read everything."""
+
+    def __init__(self, store):
+        self.store = store
+        self._sources = {}  # db file -> SQLiteLiveSource
+
+    def _current(self):
+        return [self._sources.setdefault(s.db_name, SQLiteLiveSource(s.db_name)) for s in self.store.shards()]
+
+    def changed(self, since):
+        since = since or {}
+        cursor, ids = {}, set()
+        for src in self._current():
+            cursor[src.db_name], changed = src.changed(since.get(src.db_name))
+            ids = None if ids is None or changed is None else ids | changed
+        return cursor, ids
+
+    def state(self, event_ids=None):
+        out = {}
+        for src in self._current():
+            out.update(src.state(event_ids))
+        return out
+
+
+class ShardedStorage(Storage):
+    OPTIONS = ("max_size", "busy_timeout_ms", "factory", "sign_token", "shard_pool_size", "fanout_workers",
+               "shard_map_ttl_s")
+    dialect = "sqlite"
+    transient_errors = SQLiteStorage.transient_errors
+
+    def __init__(self, url, max_size=16, busy_timeout_ms=5000, factory=None, sign_token=None, shard_pool_size=4,
+                 fanout_workers=8, shard_map_ttl_s=5.0):
+        self.root = url[len("shards:"):]
+        os.makedirs(self.root, exist_ok=True)
+        self.sign_token = sign_token
+        options = {"busy_timeout_ms": busy_timeout_ms, "sign_token": sign_token}
+        if factory is not None:
+            options["factory"] = factory
+        self._shard_options = dict(options, max_size=shard_pool_size)
+        self.global_store = SQLiteStorage(os.path.join(self.root, "global.db"), max_size=max_size, **options)
+        self.pool = self.global_store.pool
+        self._shards = {}  # college key -> SQLiteStorage
+        self._shard_keys = None  # college keys in shard_no order, loaded at _shard_keys_at
+        self._shard_keys_at = 0.0
+        self.shard_map_ttl_s = shard_map_ttl_s
+        self._lock = threading.Lock()
+        self._fanout_pool = ThreadPoolExecutor(max_workers=fanout_workers, thread_name_prefix="shard-fanout")
+
+    # ---------------- routing ----------------
+    def _open(self, college_key, create):
+        """The college's shard (created and migrated on first use when create), else None."""
+        with self._lock:
+            shard = self._shards.get(college_key)
+        if shard is not None:
+            return shard
+        select = "SELECT shard_no FROM college_shard WHERE college_id = ?"
+        rows = self.global_store.query(select, (college_key,))
+        if not rows:
+            if not create:
+                return None
+            self.global_store.execute("INSERT INTO college_shard (college_id, created_at) VALUES (?, ?) "
+                                      "ON CONFLICT (college_id) DO NOTHING",
+                                      (college_key, datetime.datetime.utcnow().isoformat()))
+            rows = self.global_store.query(select, (college_key,))
+        # new here, or added by another worker since the list was read
+        with self._lock:
+            if self._shard_keys is not None and college_key not in self._shard_keys:
+                self._shard_keys = None
+        shard_no = rows[0]["shard_no"]
+        shard = SQLiteStorage(os.path.join(self.root, f"shard-{shard_no:04d}.db"), **self._shard_options)
+        shard.migrate(log=lambda msg: None)
+        # every process seeds the same floor; only the first insert lands
+        for table in archive.CHILD_COLS:
+            shard.execute("INSERT INTO sqlite_sequence (name, seq) SELECT ?, ? "
+                          "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = ?)",
+                          (table, shard_no << SHARD_ID_BITS, table))
+        shard.load_capabilities()
+        with self._lock:
+            return self._shards.setdefault(college_key, shard)
+
+    def shards(self):
+        """Every shard, in shard_no order (from the cached map; see the header)."""
+        now = time.monotonic()
+        with self._lock:
+            keys = self._shard_keys
+            if keys is not None and now - self._shard_keys_at > self.shard_map_ttl_s:
+                keys = None
+        if keys is None:
+            keys = [r["college_id"] for r in
+                    self.global_store.query("SELECT college_id FROM college_shard ORDER BY shard_no")]
+            with self._lock:
+                self._shard_keys, self._shard_keys_at = keys, now
+        return [self._open(key, create=True) for key in keys]
+
+    def _college_store(self, college_id):
+        # a college without a shard has no events: the (empty) event tables of global.db answer
+        return self._open(college_id or "", create=False) or self.global_store
+
+    def _event_college(self, event_id):
+        rows = self.global_store.query("SELECT college_id FROM event_shard WHERE event_id = ?", (event_id,))
+        return rows[0]["college_id"] if rows else None
+
+    def _event_store(self, event_id):
+        college_key = self._event_college(event_id)
+        return self.global_store if college_key is None else self._college_store(college_key)
+
+    def _all_stores(self):
+        return self.shards() or [self.global_store]
+
+    def _fanout(self, fn, stores):
+        if len(stores) == 1:
+            return [fn(stores[0])]
+        return list(self._fanout_pool.map(fn, stores))
+
+    def _token_stores(self, tokens, resolved=None):
+        """{token: store}: from the roster's answer or the signed payload, else the shard that has the token."""
+        out, unsigned = {}, []
+        for token in tokens:
+            if not isinstance(token, str) or token in out:
+                continue
+            if resolved and resolved.get(token):
+                out[token] = self._event_store(resolved[token][0])
+                continue
+            claim = gate.peek(token)
+            if claim is not None:
+                out[token] = self._event_store(claim[1])
+            else:
+                unsigned.append(token)
+        if unsigned:
+            shards = self.shards()
+            found = self._fanout(lambda s: s.query("SELECT token FROM registration WHERE token IN "
+                                                   "(SELECT value FROM json_each(?))", (json.dumps(unsigned),)),
+                                 shards) if shards else []
+            for shard, rows in zip(shards, found):
+                for r in rows:
+                    out.setdefault(r["token"], shard)
+        return out
+
+    # ---------------- plumbing ----------------
+    def connection(self):
+        return self.global_store.connection()
+
+    def errors(self):
+        return self.global_store.errors()
+
+    def migrate(self, log=print):
+        applied = self.global_store.migrate(log=log)
+        for shard in self.shards():
+            applied += shard.migrate(log=log)
+        self.reconcile(log=log)
+        return applied
+
+    def pending_migrations(self):
+        pending = self.global_store.pending_migrations()
+        for shard in self.shards():
+            pending += shard.pending_migrations()
+        return pending
+
+    def load_capabilities(self):
+        for store in [self.global_store] + self.shards():
+            store.load_capabilities()
+        self.search_enabled = self.global_store.search_enabled
+
+    def live_source(self):
+        return ShardedLiveSource(self)
+
+    def stats(self):
+        out = self.global_store.stats()
+        shards = self.shards()
+        out["shards"] = len(shards)
+        for key in ("open", "in_use"):
+            out["shard_" + key] = sum(s.stats()[key] for s in shards)
+        return out
+
+    def describe(self):
+        return f"shards:{self.root}"
+
+    def close(self):
+        self._fanout_pool.shutdown(wait=False)
+        with self._lock:
+            shards = list(self._shards.values())
+        for store in shards + [self.global_store]:
+            store.close()
+
+    def stream(self, sql, params=(), batch_size=1000):
+        if not isinstance(sql, _Export):
+            yield from super().stream(sql, params, batch_size)
+            return
+        dataset, event_id, college_id = sql.dataset, sql.event_id, sql.college_id
+        if dataset.startswith("reports/"):
+            name = dataset[len("reports/"):]
+            if name == "top-active-students":
+                rows = self._top_students(college_id, None, fresh=False)
+            else:
+                rows = self.report(name, event_id=event_id, college_id=college_id)
+            cols = REPORT_COLUMNS[name]
+            yield list(cols)
+            for i in range(0, len(rows), batch_size):
+                yield [tuple(r[c] for c in cols) for r in rows[i:i + batch_size]]
+            return
+        if event_id:
+            stores = [self._event_store(event_id)]
+        else:
+            stores = [self._college_store(college_id)] if college_id else self._all_stores()
+        # shards in shard_no order keep the id order of the single-database export
+        sql, params = getattr(export, dataset + "_sql")(event_id, college_id)
+        for i, store in enumerate(stores):
+            batches = store.stream(sql, params, batch_size)
+            try:
+                cols = next(batches)
+                if i == 0:
+                    yield cols
+                for rows in batches:
+                    yield self._with_students(cols, rows) if dataset == "registrations" else rows
+            finally:
+                batches.close()
+
+    def _with_students(self, cols, rows):
+        """Fill student_name / roll_no from global.db (the shard's student table is empty)."""
+        sid, name, roll = cols.index("student_id"), cols.index("student_name"), cols.index("roll_no")
+        found = {r["student_id"].lower(): r for r in self.global_store.query(
+            "SELECT student_id, name, roll_no FROM student WHERE lower(student_id) IN (SELECT value FROM json_each(?))",
+            (json.dumps(sorted({row[sid].lower() for row in rows if row[sid] is not None})),))}
+        out = []
+        for row in rows:
+            row = list(row)
+            student = found.get(row[sid].lower()) if row[sid] is not None else None
+            row[name], row[roll] = (student["name"], student["roll_no"]) if student else (None, None)
+            out.append(tuple(row))
+        return out
+
+    # ---------------- events ----------------
+    def list_events(self, college_id=None, type=None, search=None, tags=(), match_all=True, ranked=False,
+                    fields=None, limit=None, cursor=None, facets=False, starts_from=None, starts_to=None):
+        if college_id:
+            return self._college_store(college_id).list_events(
+                college_id, type, search, tags, match_all, ranked, fields, limit, cursor, facets,
+                starts_from, starts_to)
+        fields = fields or list(EVENT_FIELDS)
+        pages = self._fanout(lambda s: s._event_page(None, type, search, tags, match_all, ranked, fields, limit,
+                                                     cursor, facets, starts_from, starts_to), self._all_stores())
+        key_fields = pages[0][1]
+        rows = sorted((r for page in pages for r in page[0]), key=lambda r: tuple(_asc(r[k]) for k in key_fields))
+        if limit is not None:
+            rows = rows[:limit + 1]
+        rows, next_cursor = paging.finish_page(rows, limit, key_fields)
+        facet_rows = None
+        if facets:
+            counts = Counter()
+            for page in pages:
+                for r in page[2]:
+                    counts[r["tag"]] += r["count"]
+            facet_rows = [{"tag": tag, "count": n} for tag, n in sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))]
+        return paging.project(rows, fields), next_cursor, facet_rows
+
+    def get_event(self, event_id):
+        return self._event_store(event_id).get_event(event_id)
+
+    def event_college(self, event_id):
+        college_key = self._event_college(event_id)
+        if college_key is None or self._event_store(event_id).get_event(event_id) is None:
+            return False, None
+        return True, college_key or None
+
+    def create_event(self, event):
+        event_id, college_key = event["event_id"], event.get("college_id") or ""
+        try:
+            self.global_store.execute("INSERT INTO event_shard (event_id, college_id) VALUES (?, ?)",
+                                      (event_id, college_key))
+        except IntegrityError:
+            # taken, unless the event is gone from its shard (archived, or a create that failed half way)
+            if self.get_event(event_id) is not None:
+                raise
+            self.global_store.execute("UPDATE event_shard SET college_id = ? WHERE event_id = ?",
+                                      (college_key, event_id))
+        self._open(college_key, create=True).create_event(event)
+
+    def update_event(self, event_id, updates):
+        college_key = self._event_college(event_id)
+        if college_key is None:
+            return 0
+        src = self._college_store(college_key)
+        new_key = (updates.get("college_id") or "") if "college_id" in updates else college_key
+        if new_key == college_key:
+            return src.update_event(event_id, updates)
+        row = src.query("SELECT * FROM event WHERE event_id = ?", (event_id,))
+        if not row:
+            return 0
+        self._move_event(src, self._open(new_key, create=True), dict(row[0], **updates), new_key)
+        return 1
+
+    def _move_event(self, src, dst, event, new_key):
+        """
+        Recreate the event in dst (the triggers rebuild its counters, tags and
+        search row from the copied rows), then drop it from src. Not atomic
+        across the two files: a crash in between leaves the event in both, and
+        event_shard points at the complete copy (src until the map update,
+        dst after it). reconcile() drops the other one.
+        """
+        event_id = event["event_id"]
+        dst.create_event({c: event.get(c) for c in ("event_id", "created_at") + EVENT_WRITABLE})
+        with dst.transaction() as cur:
+            for table, cols in archive.CHILD_COLS.items():
+                rows = src.query(f"SELECT {', '.join(cols)} FROM {table} WHERE event_id = ?", (event_id,))
+                cur.executemany(f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})",
+                                [tuple(r[c] for c in cols) for r in rows])
+        self.global_store.execute("UPDATE event_shard SET college_id = ? WHERE event_id = ?", (new_key, event_id))
+        with src.transaction() as cur:
+            for table in archive.CHILD_COLS:
+                cur.execute(f"DELETE FROM {table} WHERE event_id = ?", (event_id,))
+            cur.execute("DELETE FROM event WHERE event_id = ?", (event_id,))
+
+    def reconcile(self, log=print):
+        """
+        Orphan check for interrupted moves and deletes: an event in a shard
+        other than the one event_shard names is deleted there (with its rows)
+        when the mapped shard has it; an event in one shard only that the map
+        names elsewhere or not at all is remapped to that shard. Returns the
+        number of fixes; each is logged.
+        """
+        keys = [r["college_id"] for r in
+                self.global_store.query("SELECT college_id FROM college_shard ORDER BY shard_no")]
+        held = {}  # event_id -> [college keys whose shard has it]
+        for key, rows in zip(keys, self._fanout(lambda s: s.query("SELECT event_id FROM event"),
+                                                [self._open(key, create=True) for key in keys])):
+            for r in rows:
+                held.setdefault(r["event_id"], []).append(key)
+        mapped = {r["event_id"]: r["college_id"] for r in self.global_store.query(
+            "SELECT event_id, college_id FROM event_shard WHERE event_id IN (SELECT value FROM json_each(?))",
+            (json.dumps(list(held)),))}
+        fixed = 0
+        for event_id, holders in held.items():
+            key = mapped.get(event_id)
+            if key in holders:
+                for stale in holders:
+                    if stale == key:
+                        continue
+                    fixed += 1
+                    with self._open(stale, create=False).transaction() as cur:
+                        for table in archive.CHILD_COLS:
+                            cur.execute(f"DELETE FROM {table} WHERE event_id = ?", (event_id,))
+                        cur.execute("DELETE FROM event WHERE event_id = ?", (event_id,))
+                    log(f"shards: dropped orphan copy of event {event_id!r} from college {stale!r} "
+                        f"(mapped to {key!r})")
+            elif len(holders) == 1:
+                self.global_store.execute("INSERT INTO event_shard (event_id, college_id) VALUES (?, ?) "
+                                          "ON CONFLICT (event_id) DO UPDATE SET college_id = excluded.college_id",
+                                          (event_id, holders[0]))
+                log(f"shards: event {event_id!r} mapped to {key!r} but only in college {holders[0]!r}; remapped")
+                fixed += 1
+            else:
+                log(f"shards: event {event_id!r} is in colleges {holders!r}, mapped to {key!r}; left for review")
+        return fixed
+
+    def delete_event(self, event_id):
+        deleted = self._event_store(event_id).delete_event(event_id)
+        if deleted:
+            self.global_store.execute("DELETE FROM event_shard WHERE event_id = ?", (event_id,))
+        return deleted
+
+    # ---------------- registrations ----------------
+    def register(self, event_id, student_id, waitlist=False):
+        return self._event_store(event_id).register(event_id, student_id, waitlist=waitlist)
+
+    def gate_roster(self, event_id):
+        return self._event_store(event_id).gate_roster(event_id)
+
+    def registration_by_token(self, token):
+        store = self._token_stores([token]).get(token)
+        return store.registration_by_token(token) if store else None
+
+    def registrations_for_student(self, student_id, fields=None, limit=None, cursor=None):
+        fields = fields or list(REGISTRATION_FIELDS)
+        keys = ("registered_at", "reg_id")
+        pages = self._fanout(lambda s: s._registration_page(student_id, fields, limit, cursor), self._all_stores())
+        rows = sorted((r for page in pages for r in page), key=lambda r: tuple(_asc(r[k]) for k in keys),
+                      reverse=True)
+        if limit is not None:
+            rows = rows[:limit + 1]
+        rows, next_cursor = paging.finish_page(rows, limit, keys)
+        return paging.project(rows, fields), next_cursor
+
+    # ---------------- attendance / feedback ----------------
+    # rows for an event the map does not know go to global.db, which answers
+    # them the way a single database answers an unknown event id
+    def mark_attendance(self, event_id, student_id, now):
+        self._event_store(event_id).mark_attendance(event_id, student_id, now)
+
+    def ingest_attendance(self, tokens=(), event_id=None, student_ids=(), now=None, resolved=None):
+        routes = self._token_stores(tokens, resolved)
+        event_store = self._event_store(event_id) if student_ids else None
+        groups = {}  # id(store) -> (store, [token positions], [student positions])
+        for i, token in enumerate(tokens):
+            store = routes.get(token, self.global_store) if isinstance(token, str) else self.global_store
+            groups.setdefault(id(store), (store, [], []))[1].append(i)
+        if student_ids:
+            groups.setdefault(id(event_store), (event_store, [], []))[2].extend(range(len(student_ids)))
+        results = [None] * (len(tokens) + len(student_ids))
+        marked = set()
+        for store, token_pos, student_pos in groups.values():
+            out, event_ids = store.ingest_attendance(
+                tokens=[tokens[i] for i in token_pos], event_id=event_id if student_pos else None,
+                student_ids=[student_ids[i] for i in student_pos], now=now, resolved=resolved)
+            for pos, r in zip(token_pos + [len(tokens) + i for i in student_pos], out):
+                results[pos] = r
+            marked.update(event_ids)
+        return results, sorted(marked)
+
+    def sync_scans(self, scans, device_id=None, now=None, resolved=None):
+        routes = self._token_stores([s["token"] for s in scans if s.get("token")], resolved)
+        by_key, groups = {}, {}
+        for i, scan in enumerate(scans):
+            key = scan.get("key")
+            if not isinstance(key, str) or not key:
+                store = self.global_store
+            elif key in by_key:
+                # repeats of a key go where its first scan went, to be answered as replays
+                store = by_key[key]
+            elif scan.get("token"):
+                store = by_key[key] = routes.get(scan["token"], self.global_store)
+            else:
+                store = by_key[key] = self._event_store(scan.get("event_id"))
+            groups.setdefault(id(store), (store, []))[1].append(i)
+        results = [None] * len(scans)
+        marked = set()
+        for store, positions in groups.values():
+            out, event_ids = store.sync_scans([scans[i] for i in positions], device_id=device_id, now=now,
+                                              resolved=resolved)
+            for pos, r in zip(positions, out):
+                results[pos] = r
+            marked.update(event_ids)
+        return results, sorted(marked)
+
+    def attendance_changes(self, event_id, since):
+        return self._event_store(event_id).attendance_changes(event_id, since)
+
+    def add_feedback(self, event_id, student_id, rating, comment, now):
+        self._event_store(event_id).add_feedback(event_id, student_id, rating, comment, now)
+
+    def add_feedback_batch(self, rows):
+        groups = {}
+        for row in rows:
+            store = self._event_store(row[0])
+            groups.setdefault(id(store), (store, []))[1].append(row)
+        event_ids = set()
+        for store, group in groups.values():
+            event_ids.update(store.add_feedback_batch(group))
+        return sorted(event_ids)
+
+    # ---------------- reports ----------------
+    def _report_stores(self, name, event_id, college_id):
+        if name == "attendance_percentage":
+            return [self._event_store(event_id)] if event_id else self._all_stores()
+        return [self._college_store(college_id)] if college_id else self._all_stores()
+
+    def _merged(self, name, stores, fn):
+        pages = self._fanout(fn, stores)
+        return pages[0] if len(pages) == 1 else archive.sort_report(name, [r for page in pages for r in page])
+
+    def report_sql(self, name, event_id=None, college_id=None):
+        return _Export("reports/" + name, event_id, college_id), ()
+
+    def report(self, name, event_id=None, college_id=None, limit=None, fresh=False):
+        if name == "top-active-students":
+            return self._top_students(college_id, limit or 10, fresh)
+        return self._merged(name, self._report_stores(name, event_id, college_id),
+                            lambda s: s.report(name, event_id=event_id, college_id=college_id, fresh=fresh))
+
+    def report_with_archive(self, name, event_id=None, college_id=None, limit=None):
+        if name == "top-active-students":
+            return self._top_students(college_id, limit or 10, fresh=False, archived=True)
+        return self._merged(name, self._report_stores(name, event_id, college_id),
+                            lambda s: s.report_with_archive(name, event_id=event_id, college_id=college_id))
+
+    def _top_students(self, college_id, limit, fresh, archived=False):
+        """Attended-event counts summed over the shards, joined to global.db's students; limit None = all."""
+        def counts(shard):
+            if fresh:
+                rows = shard.query(reports.STUDENT_AGG_SQL)
+            else:
+                rows = shard.query("SELECT student_key, attended_events FROM report_student WHERE attended_events > 0")
+            return rows + (shard.query(archive.ARCHIVED_STUDENTS_SQL) if archived else [])
+
+        attended = Counter()
+        for rows in self._fanout(counts, self.shards()):
+            for r in rows:
+                attended[r["student_key"]] += r["attended_events"]
+        where, params = ("WHERE college_id = ?", (college_id,)) if college_id else ("", ())
+        students = self.global_store.query(f"SELECT student_id, name, roll_no FROM student {where}", params)
+        for s in students:
+            s["attended_events"] = attended.get(s["student_id"].lower(), 0)
+        rows = archive.sort_report("top-active-students", students)
+        return rows if limit is None else rows[:limit]
+
+    def refresh_reports(self):
+        return sum(self._fanout(lambda s: s.refresh_reports(), self._all_stores()))
+
+    def reports_pending(self):
+        return sum(s.reports_pending() for s in self._all_stores())
+
+    # ---------------- archive ----------------
+    def count_archivable(self, cutoff_ts):
+        return sum(s.count_archivable(cutoff_ts) for s in self._all_stores())
+
+    def archive_events(self, cutoff_ts, batch=archive.BATCH_EVENTS):
+        # event_shard keeps archived events: ?archived=1 reports by event id still route to their shard
+        totals = Counter()
+        for moved in self._fanout(lambda s: s.archive_events(cutoff_ts, batch=batch), self._all_stores()):
+            totals.update(moved)
+        return dict(totals)
+
+    # ---------------- exports ----------------
+    def export_sql(self, dataset, event_id=None, college_id=None):
+        return _Export(dataset, event_id, college_id), ()
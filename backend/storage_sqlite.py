@@ -0,0 +1,158 @@
+# backend/storage_sqlite.py
+# SQLite backend for storage.py: pooled WAL connections (db.py), versioned
+# migrations (migrate.py), the FTS5 index, trigger-maintained counters and the
+# report snapshots. Every node must share the one database file, so this is
+# the single-node deployment; see storage_pg.py for several nodes.
+import sqlite3
+from contextlib import contextmanager
+
+import attendance
+import migrate
+import registration
+import reports
+import search as event_search
+from db import ConnectionPool, is_busy_error, with_busy_retry
+from live import SQLiteLiveSource
+from storage import BusyError, IntegrityError, Storage
+
+
+class SQLiteStorage(Storage):
+    OPTIONS = ("max_size", "busy_timeout_ms", "factory", "sign_token")
+    dialect = "sqlite"
+    transient_errors = (BusyError, sqlite3.OperationalError)
+
+    def __init__(self, db_name, max_size=16, busy_timeout_ms=5000, factory=sqlite3.Connection, sign_token=None):
+        self.db_name = db_name
+        self.sign_token = sign_token
+        # factory: the sqlite3.Connection class to open (metrics.connection_class() times every statement)
+        self.pool = ConnectionPool(db_name, max_size=max_size, busy_timeout_ms=busy_timeout_ms, factory=factory)
+
+    # ---------------- plumbing ----------------
+    def connection(self):
+        return self.pool.connection()
+
+    @contextmanager
+    def errors(self):
+        try:
+            yield
+        except sqlite3.IntegrityError as e:
+            raise IntegrityError(str(e)) from e
+        except sqlite3.OperationalError as e:
+            if is_busy_error(e):
+                raise BusyError(str(e)) from e
+            raise
+
+    def migrate(self, log=print):
+        return migrate.migrate(self.db_name, log=log)
+
+    def pending_migrations(self):
+        with self.connection() as conn:
+            return migrate.pending(conn)
+
+    def load_capabilities(self):
+        with self.connection() as conn:
+            self.search_enabled = event_search.index_present(conn)
+
+    def live_source(self):
+        return SQLiteLiveSource(self.db_name)
+
+    def stats(self):
+        return self.pool.stats()
+
+    def describe(self):
+        return self.db_name
+
+    def close(self):
+        self.pool.close_all()
+
+    # ---------------- events ----------------
+    def search_clause(self, text):
+        match = event_search.match_expression(text) if self.search_enabled else None
+        if not match:
+            return None
+        return "e.event_no IN (SELECT rowid FROM event_fts WHERE event_fts MATCH ?)", [match]
+
+    def rank_source(self, text):
+        return (f"SELECT m.event_id, {event_search.RANK_SQL} AS score "
+                "FROM event_fts JOIN event m ON m.event_no = event_fts.rowid WHERE event_fts MATCH ?",
+                [event_search.match_expression(text)])
+
+    # ---------------- registrations / attendance ----------------
+    def register(self, event_id, student_id, waitlist=False):
+        with self.errors():
+            return registration.register(self.connection, event_id, student_id, waitlist=waitlist,
+                                         sign_token=self.sign_token)
+
+    def ingest_attendance(self, tokens=(), event_id=None, student_ids=(), now=None, resolved=None):
+        with self.errors():
+            return with_busy_retry(self.connection, lambda conn: attendance.ingest_batch(
+                conn, tokens=tokens, event_id=event_id, student_ids=student_ids, now=now, resolved=resolved))
+
+    def sync_scans(self, scans, device_id=None, now=None, resolved=None):
+        with self.errors():
+            return with_busy_retry(self.connection, lambda conn: attendance.sync_scans(
+                conn, scans, device_id=device_id, now=now, resolved=resolved))
+
+    # ---------------- reports ----------------
+    # attendance and top students read the report_* snapshots (reports.py), which
+    # a ReportFolder keeps current in the background; fresh=True recomputes from
+    # base tables
+    def report_sql(self, name, event_id=None, college_id=None):
+        if name == "registrations":
+            return reports.registrations_sql(college_id)
+        if name == "attendance_percentage":
+            return reports.attendance_sql(event_id)
+        if name == "top-active-students":
+            return reports.students_sql(college_id)
+        return reports.avg_feedback_sql(college_id)
+
+    def report(self, name, event_id=None, college_id=None, limit=None, fresh=False):
+        if name == "attendance_percentage":
+            return self.query(*reports.attendance_sql(event_id, live=fresh))
+        if name == "top-active-students":
+            return self._top_students(college_id, limit or 10, fresh)
+        return self.query(*self.report_sql(name, event_id, college_id))
+
+    def _top_students(self, college_id, limit, fresh):
+        college = ("AND s.college_id = ?", (college_id,)) if college_id else ("", ())
+        if fresh:
+            return self.query(f"""
+              SELECT s.student_id, s.name, s.roll_no,
+                     COALESCE(COUNT(a.att_id), 0) as attended_events
+              FROM student s
+              LEFT JOIN attendance a
+                ON s.student_id = a.student_id COLLATE NOCASE
+               AND a.present = 1
+              WHERE 1 {college[0]}
+              GROUP BY s.student_id
+              ORDER BY attended_events DESC
+              LIMIT ?
+            """, college[1] + (limit,))
+        # walk the snapshot down idx_report_student_attended (CROSS JOIN pins it as the
+        # outer loop and "+" keeps the college filter off the index, so LIMIT stops
+        # early), then pad with students who attended nothing
+        rows = self.query(f"""
+          SELECT s.student_id, s.name, s.roll_no, rs.attended_events
+          FROM report_student rs CROSS JOIN student s ON s.student_id = rs.student_key COLLATE NOCASE
+          WHERE rs.attended_events > 0 {"AND +s.college_id = ?" if college_id else ""}
+          ORDER BY rs.attended_events DESC
+          LIMIT ?
+        """, college[1] + (limit,))
+        if len(rows) < limit:
+            rows += self.query(f"""
+              SELECT s.student_id, s.name, s.roll_no, 0 as attended_events
+              FROM student s
+              WHERE NOT EXISTS (SELECT 1 FROM report_student rs
+                                WHERE rs.student_key = lower(s.student_id) AND rs.attended_events > 0)
+                    {college[0]}
+              LIMIT ?
+            """, college[1] + (limit - len(rows),))
+        return rows
+
+    def refresh_reports(self):
+        with self.errors():
+            return with_busy_retry(self.connection, reports.refresh)
+
+    def reports_pending(self):
+        with self.connection() as conn:
+            return reports.pending(conn)
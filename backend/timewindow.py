@@ -0,0 +1,77 @@
+# backend/timewindow.py
+# event.starts_at is whatever text the organiser sent. starts_at_ts holds the
+# same instant as integer Unix seconds (UTC; a value without an offset is
+# taken as UTC, like every timestamp the app writes), set by storage.py on
+# create/update and backfilled by migration 0010. GET /events?from=&to=&upcoming=1
+# filter on it through idx_event_starts_ts. starts_at stays the display value
+# and the listing order; text that cannot be parsed leaves starts_at_ts NULL,
+# so the event only drops out of time-window listings.
+import datetime
+
+# tried after ISO 8601 (with "T" or " ", optional seconds / fraction / offset / "Z")
+LEGACY_FORMATS = ("%Y/%m/%d %H:%M:%S", "%Y/%m/%d %H:%M", "%Y/%m/%d",
+                  "%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M", "%d/%m/%Y",
+                  "%d-%m-%Y %H:%M", "%d-%m-%Y", "%d %b %Y %H:%M", "%d %b %Y", "%b %d %Y %H:%M", "%b %d %Y")
+
+
+class TimeWindowError(ValueError):
+    pass
+
+
+def to_epoch(value):
+    """Unix seconds for a starts_at value (ISO 8601 or one of LEGACY_FORMATS), else None."""
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if not isinstance(value, str) or not value.strip():
+        return None
+    text = value.strip()
+    try:
+        ts = datetime.datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        ts = None
+        for fmt in LEGACY_FORMATS:
+            try:
+                ts = datetime.datetime.strptime(text, fmt)
+                break
+            except ValueError:
+                continue
+        if ts is None:
+            return None
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=datetime.timezone.utc)
+    return int(ts.timestamp())
+
+
+def parse_window(args, now=None):
+    """
+    (from_ts, to_ts) from ?from= / ?to= (timestamps or Unix seconds) and
+    ?upcoming=1 (from now); either end may be None. Raises TimeWindowError.
+    """
+    bounds = []
+    for name in ("from", "to"):
+        raw = args.get(name)
+        if raw in (None, ""):
+            bounds.append(None)
+            continue
+        ts = int(raw) if raw.lstrip("-").isdigit() else to_epoch(raw)
+        if ts is None:
+            raise TimeWindowError(f"{name} must be an ISO 8601 timestamp or Unix seconds")
+        bounds.append(ts)
+    start, end = bounds
+    if args.get("upcoming") in ("1", "true"):
+        now = int(now if now is not None else datetime.datetime.now(datetime.timezone.utc).timestamp())
+        start = now if start is None else max(start, now)
+    if start is not None and end is not None and start > end:
+        raise TimeWindowError("from is after to")
+    return start, end
+
+
+def backfill(conn):
+    """Set starts_at_ts for every event that has none; returns (parsed, unparseable)."""
+    rows = conn.execute("SELECT event_id, starts_at FROM event WHERE starts_at_ts IS NULL").fetchall()
+    values = [(to_epoch(r[1]), r[0]) for r in rows]
+    conn.executemany("UPDATE event SET starts_at_ts = ? WHERE event_id = ?", [v for v in values if v[0] is not None])
+    parsed = sum(1 for v in values if v[0] is not None)
+    return parsed, len(values) - parsed
@@ -21,23 +21,28 @@ import { useFocusEffect } from "@react-navigation/native";
 
 // API client (mobile version)
 import {
-  getEvents,
+  getEventsPage,
   registerForEvent,
-  getRegistrationsForStudent,
+  getRegistrationsPage,
   submitFeedback,
+  pollLive,
 } from "../services/api.rn";
 
 const EVENT_TYPES = ["All", "Workshop", "Seminar", "Drive", "Hackathon"];
+const PAGE_SIZE = 20;
 
 export default function HomeScreen({ navigation }) {
   const [events, setEvents] = useState([]);
-  const [filtered, setFiltered] = useState([]);
+  const [cursor, setCursor] = useState(null);
   const [loading, setLoading] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const query = useRef(null); // params of the list on screen; a newer search replaces it
 
   const [search, setSearch] = useState("");
   const [selectedType, setSelectedType] = useState("All");
 
   const [registrations, setRegistrations] = useState([]);
+  const [regsCursor, setRegsCursor] = useState(null);
   const [studentId, setStudentId] = useState(null); // read from AsyncStorage
   const [editingStudentId, setEditingStudentId] = useState(false);
 
@@ -51,36 +56,57 @@ export default function HomeScreen({ navigation }) {
   const [qrEventData, setQrEventData] = useState(null);
 
   // --- Fetch / load functions ---
+  // events are searched and filtered by the server and paged with its keyset cursor
   const fetchAll = useCallback(
     async (q = "", type = "All") => {
+      const params = { collegeId: "c1", limit: PAGE_SIZE };
+      if (q) params.search = q.trim();
+      if (type && type !== "All") params.type = type;
+      query.current = params;
       setLoading(true);
       try {
-        const params = {};
-        if (q) params.search = q;
-        if (type && type !== "All") params.type = type;
-        // getEvents (mobile) returns array of rows
-        const res = await getEvents({ collegeId: "c1", ...params });
-        // res might be an array already
-        const rows = Array.isArray(res) ? res : res.data || [];
-        setEvents(rows);
-        setFiltered(rows);
+        const { items, nextCursor } = await getEventsPage(params);
+        if (query.current !== params) return;
+        setEvents(items || []);
+        setCursor(nextCursor);
       } catch (err) {
-        console.error("getEvents error", err);
+        console.error("getEventsPage error", err);
         Alert.alert("Error", "Could not load events.");
       } finally {
-        setLoading(false);
+        if (query.current === params) setLoading(false);
       }
     },
     []
   );
 
+  const fetchMore = async () => {
+    if (!cursor || loading || loadingMore) return;
+    const params = query.current;
+    setLoadingMore(true);
+    try {
+      const { items, nextCursor } = await getEventsPage({ ...params, cursor });
+      if (query.current !== params) return;
+      setEvents((prev) => prev.concat(items || []));
+      setCursor(nextCursor);
+    } catch (err) {
+      console.error("getEventsPage error", err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  // the newest page of registrations; older ones load as the event list scrolls
   const fetchRegistrations = useCallback(
-    async (id) => {
+    async (id, after = "") => {
       if (!id) return;
       try {
-        const res = await getRegistrationsForStudent(id);
-        const rows = Array.isArray(res) ? res : res.data || [];
-        setRegistrations(rows);
+        const { items, nextCursor } = await getRegistrationsPage(id, {
+          limit: PAGE_SIZE,
+          cursor: after,
+          fields: ["event_id", "status"],
+        });
+        setRegistrations((prev) => (after ? prev.concat(items || []) : items || []));
+        setRegsCursor(nextCursor);
       } catch (err) {
         console.error("getRegistrations error", err);
       }
@@ -110,33 +136,64 @@ export default function HomeScreen({ navigation }) {
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, []);
 
-  // refresh when screen focused
+  // refresh when screen focused; search / type changes refetch through debouncedSearch
+  const filters = useRef({ search, selectedType });
+  filters.current = { search, selectedType };
   useFocusEffect(
     useCallback(() => {
-      fetchAll(search, selectedType);
+      fetchAll(filters.current.search, filters.current.selectedType);
       if (studentId) fetchRegistrations(studentId);
-    }, [fetchAll, fetchRegistrations, search, selectedType, studentId])
+    }, [fetchAll, fetchRegistrations, studentId])
   );
 
-  // Debounced filter — uses lodash.debounce
-  const debouncedSearch = useRef(
-    debounce((text, type, sourceEvents) => {
-      const q = (text || "").trim().toLowerCase();
-      const list = (sourceEvents || events) || [];
-      const filteredList = list.filter((ev) => {
-        const title = (ev.title || "").toLowerCase();
-        const desc = (ev.description || "").toLowerCase();
-        const matchesQ = q === "" || title.includes(q) || desc.includes(q);
-        const matchesType = type === "All" || ev.type === type;
-        return matchesQ && matchesType;
-      });
-      setFiltered(filteredList);
-    }, 300)
-  ).current;
+  // live seat counts: long-poll loop for the loaded events, merged in place
+  const listedIds = events.map((e) => e.event_id).filter(Boolean).join(",");
+  useEffect(() => {
+    if (!listedIds) return undefined;
+    let stopped = false;
+    const merge = (list, byId) =>
+      list.map((e) => (byId[e.event_id] && !byId[e.event_id].deleted
+        ? { ...e, registered_count: byId[e.event_id].registered_count, cancelled_flag: byId[e.event_id].cancelled_flag }
+        : e));
+    (async () => {
+      let since = "";
+      while (!stopped) {
+        try {
+          const res = await pollLive(listedIds.split(","), since);
+          since = res.since;
+          if (stopped || !res.events.length) continue;
+          const byId = {};
+          res.events.forEach((r) => (byId[r.event_id] = r));
+          setEvents((prev) => merge(prev, byId));
+        } catch (err) {
+          // offline or server restart: back off, then resnapshot
+          since = "";
+          await new Promise((r) => setTimeout(r, 5000));
+        }
+      }
+    })();
+    return () => {
+      stopped = true;
+    };
+  }, [listedIds]);
+
+  // Debounced search — uses lodash.debounce; refetches from the first page
+  const debouncedSearch = useRef(debounce((text, type) => fetchAll(text, type), 300)).current;
 
+  const firstFilters = useRef(true);
   useEffect(() => {
-    debouncedSearch(search, selectedType, events);
-  }, [search, selectedType, events]);
+    if (firstFilters.current) {
+      firstFilters.current = false; // the mount / focus load covers the initial filters
+      return;
+    }
+    debouncedSearch(search, selectedType);
+  }, [search, selectedType]);
+
+  // next page of events, and of registrations so older ones still mark their events
+  const onEndReached = () => {
+    fetchMore();
+    if (studentId && regsCursor) fetchRegistrations(studentId, regsCursor);
+  };
 
   const onRegister = async (eventId) => {
     if (!studentId) {
@@ -152,6 +209,11 @@ export default function HomeScreen({ navigation }) {
       await fetchRegistrations(studentId);
       await fetchAll(search, selectedType);
     } catch (err) {
+      if (err?.response?.status === 409) {
+        // registered on a page of registrations not loaded yet
+        setRegistrations((prev) => prev.concat([{ event_id: eventId, status: err.response.data?.status }]));
+        return;
+      }
       console.error("register error", err);
       const msg = err?.message || (err?.response?.data?.error) || "Registration failed";
       Toast.show({ type: "error", text1: "Registration failed", text2: String(msg) });
@@ -206,6 +268,7 @@ export default function HomeScreen({ navigation }) {
     setStudentId(null);
     setEditingStudentId(true);
     setRegistrations([]);
+    setRegsCursor(null);
     Toast.show({ type: "success", text1: "Cleared student id" });
   };
 
@@ -218,6 +281,9 @@ export default function HomeScreen({ navigation }) {
         <Text style={styles.title}>{item.title}</Text>
         <Text style={styles.meta}>{item.type} • {item.starts_at ? new Date(item.starts_at).toLocaleString() : item.date}</Text>
         <Text numberOfLines={2} style={styles.desc}>{item.description}</Text>
+        {item.capacity != null && (
+          <Text style={styles.meta}>Seats: {item.registered_count ?? 0}/{item.capacity}</Text>
+        )}
 
         <View style={styles.row}>
           <TouchableOpacity
@@ -241,7 +307,7 @@ export default function HomeScreen({ navigation }) {
   };
 
   // featured slice
-  const featured = (filtered || []).filter((e) => e.featured).slice(0, 3);
+  const featured = (events || []).filter((e) => e.featured).slice(0, 3);
 
   return (
     <SafeAreaView style={styles.container}>
@@ -287,11 +353,14 @@ export default function HomeScreen({ navigation }) {
         <ActivityIndicator />
       ) : (
         <FlatList
-          data={filtered}
+          data={events}
           keyExtractor={(i) => (i.event_id || i.id || "").toString()}
           renderItem={renderEvent}
           ItemSeparatorComponent={() => <View style={{ height: 10 }} />}
           ListEmptyComponent={<Text style={styles.empty}>No events found</Text>}
+          onEndReached={onEndReached}
+          onEndReachedThreshold={0.5}
+          ListFooterComponent={loadingMore ? <ActivityIndicator style={{ marginVertical: 12 }} /> : null}
         />
       )}
 
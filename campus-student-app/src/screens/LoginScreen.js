@@ -12,7 +12,7 @@ import {
   Platform,
 } from "react-native";
 import Toast from "react-native-toast-message";
-import { login, getEvents, whoami } from "../services/api.rn";
+import { login, getEventsPage, whoami } from "../services/api.rn";
 
 export default function LoginScreen({ onSignIn }) {
   // If you want a pre-filled value for quick testing, uncomment:
@@ -78,8 +78,9 @@ export default function LoginScreen({ onSignIn }) {
       const who = await whoami();
       console.log("[LoginScreen] whoami:", who);
 
-      const events = await getEvents();
-      console.log("[LoginScreen] getEvents result:", events);
+      // one row is enough to prove the events endpoint answers
+      const { items } = await getEventsPage({ limit: 1, fields: ["event_id"] });
+      console.log("[LoginScreen] getEventsPage result:", items);
 
       
       // Call the onSignIn callback to refresh auth state
@@ -175,6 +175,20 @@ export async function getEvents({ collegeId = "c1", type = "", search = "", feat
   return res.data;
 }
 
+// Paged variant: keyset pagination + field projection. Pass nextCursor back as
+// `cursor` for the next page (null on the last page).
+export async function getEventsPage({ collegeId = "c1", type = "", search = "", feature = "", limit = 50, cursor = "", fields = [] } = {}) {
+  const params = { limit };
+  if (collegeId) params.college_id = collegeId;
+  if (type) params.type = type;
+  if (search) params.search = search;
+  if (feature) params.feature = feature;
+  if (cursor) params.cursor = cursor;
+  if (fields.length) params.fields = fields.join(",");
+  const res = await client.get("/events", { params });
+  return { items: res.data, nextCursor: res.headers["x-next-cursor"] || null };
+}
+
 export async function registerForEvent(eventId, studentId) {
   const res = await client.post(`/events/${encodeURIComponent(eventId)}/register`, { student_id: studentId });
   return res.data;
@@ -185,6 +199,14 @@ export async function getRegistrationsForStudent(studentId) {
   return res.data;
 }
 
+export async function getRegistrationsPage(studentId, { limit = 50, cursor = "", fields = [] } = {}) {
+  const params = { student_id: studentId, limit };
+  if (cursor) params.cursor = cursor;
+  if (fields.length) params.fields = fields.join(",");
+  const res = await client.get("/registrations", { params });
+  return { items: res.data, nextCursor: res.headers["x-next-cursor"] || null };
+}
+
 export async function submitFeedback(eventId, studentId, rating = 5, comment = "") {
   const res = await client.post(`/feedback/${encodeURIComponent(eventId)}`, { student_id: studentId, rating, comment });
   return res.data;
@@ -199,6 +221,16 @@ export async function markAttendanceByToken(token) {
   return res.data;
 }
 
+// live seat counts: long-poll (React Native has no EventSource). Pass back the
+// returned `since`; an unknown cursor answers with a full snapshot.
+export async function pollLive(eventIds = [], since = "", timeout = 25) {
+  const res = await client.get("/live/events/poll", {
+    params: { event_id: eventIds.join(","), since, timeout },
+    timeout: (timeout + 10) * 1000,
+  });
+  return res.data;
+}
+
 // reports
 export async function getRegistrations(collegeId = "c1") {
   const res = await client.get("/reports/registrations", { params: { college_id: collegeId } });
@@ -5,9 +5,8 @@ import {
   getEvents,
   updateEvent,
   deleteEvent,
-  markAttendanceByToken,
-  markAttendance,
 } from "../services/api";
+import { enqueueScan, flushQueue, requeueRejected, startAutoFlush, subscribe } from "../services/scanQueue";
 import toast from "react-hot-toast";
 
 export default function Attendance() {
@@ -34,6 +33,8 @@ export default function Attendance() {
   const [manualEventId, setManualEventId] = useState("");
   const [manualStudentId, setManualStudentId] = useState("");
   const [marking, setMarking] = useState(false);
+  const [pendingScans, setPendingScans] = useState(0);
+  const [rejectedScans, setRejectedScans] = useState(0);
 
   // Edit state
   const [editingId, setEditingId] = useState(null);
@@ -59,6 +60,39 @@ export default function Attendance() {
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [filterType, featureFilter]);
 
+  // offline scan queue: report uploads as they land, keep the pending badge fresh
+  useEffect(() => {
+    const unsubscribe = subscribe((pending, rejected) => {
+      setPendingScans(pending);
+      setRejectedScans(rejected);
+    });
+    const stop = startAutoFlush(reportScans, () => {});
+    return () => { unsubscribe(); stop(); };
+  }, []);
+
+  function reportScans(results) {
+    const fresh = results.filter((r) => !r.replay);
+    const marked = fresh.filter((r) => r.status === "marked").length;
+    const dup = fresh.filter((r) => r.status === "duplicate").length;
+    const invalid = fresh.filter((r) => r.status === "invalid").length;
+    const rejected = fresh.filter((r) => r.status === "rejected").length;
+    if (marked) toast.success(`${marked} check-in${marked > 1 ? "s" : ""} synced`);
+    if (dup) toast(`${dup} already checked in`);
+    if (invalid) toast.error(`${invalid} scan${invalid > 1 ? "s" : ""} not recognised`);
+    if (rejected) toast.error(`${rejected} scan${rejected > 1 ? "s" : ""} rejected by the server`);
+  }
+
+  // Queue the scan locally, then try to upload right away; if we're offline
+  // it stays queued and the auto-flush picks it up later.
+  async function queueScan(scan) {
+    await enqueueScan(scan);
+    try {
+      reportScans(await flushQueue());
+    } catch (err) {
+      toast("Saved offline — will sync when back online");
+    }
+  }
+
   // debounce search
   useEffect(() => {
     if (searchRef.current) clearTimeout(searchRef.current);
@@ -140,9 +174,8 @@ export default function Attendance() {
   const handleMarkToken = async () => {
     if (!token) return toast.error("Enter token");
     try {
-      const res = await markAttendanceByToken(token);
-      toast.success(res.message || "Attendance marked");
       setToken("");
+      await queueScan({ token });
     } catch (err) {
       toast.error(err.message || "Attendance failed");
     }
@@ -154,9 +187,9 @@ export default function Attendance() {
     if (!manualStudentId || !manualStudentId.trim()) return toast.error("Enter student id");
     setMarking(true);
     try {
-      const res = await markAttendance(manualEventId, manualStudentId.trim());
-      toast.success(res.message || "Attendance marked");
+      const studentId = manualStudentId.trim();
       setManualStudentId("");
+      await queueScan({ eventId: manualEventId, studentId });
     } catch (err) {
       toast.error(err.message || "Attendance failed");
     } finally {
@@ -232,6 +265,18 @@ export default function Attendance() {
               <button onClick={handleMarkToken} className="bg-indigo-600 text-white px-4 py-2 rounded">Check-in</button>
             </div>
             <div className="text-xs text-gray-500 mt-2">Use the token shown to students after they register (QR).</div>
+            {pendingScans > 0 && (
+              <div className="text-xs text-amber-600 mt-2 flex items-center gap-2">
+                {pendingScans} scan{pendingScans > 1 ? "s" : ""} waiting to sync
+                <button onClick={() => flushQueue().then(reportScans).catch(() => toast.error("Still offline"))} className="underline">Sync now</button>
+              </div>
+            )}
+            {rejectedScans > 0 && (
+              <div className="text-xs text-red-600 mt-2 flex items-center gap-2">
+                {rejectedScans} scan{rejectedScans > 1 ? "s" : ""} rejected by the server
+                <button onClick={() => requeueRejected().then(flushQueue).then(reportScans).catch((err) => toast.error(err.message || "Sync failed"))} className="underline">Retry</button>
+              </div>
+            )}
           </div>
         </div>
       </div>
@@ -1,14 +1,48 @@
 // frontend/src/pages/Home.jsx
 import React, { useEffect, useState, useRef } from "react";
 import {
-  getEvents,
+  getEventsPage,
   registerForEvent,
-  getRegistrationsForStudent,
+  getRegistrationsPage,
   submitFeedback,
+  subscribeLive,
 } from "../services/api";
 import toast from "react-hot-toast";
 import { QRCodeCanvas } from "qrcode.react";
 
+const PAGE_SIZE = 24;
+
+// Bottom-of-list sentinel: asks for the next page when it scrolls into view,
+// with a button for browsers without IntersectionObserver.
+function LoadMore({ hasMore, loading, onMore }) {
+  const ref = useRef(null);
+  const onMoreRef = useRef(onMore);
+  onMoreRef.current = onMore;
+  useEffect(() => {
+    if (!hasMore || loading || !ref.current || typeof IntersectionObserver === "undefined") return undefined;
+    const observer = new IntersectionObserver(
+      (entries) => {
+        if (entries.some((e) => e.isIntersecting)) onMoreRef.current();
+      },
+      { rootMargin: "400px" }
+    );
+    observer.observe(ref.current);
+    return () => observer.disconnect();
+  }, [hasMore, loading]);
+  if (!hasMore) return null;
+  return (
+    <div ref={ref} className="text-center py-4">
+      {loading ? (
+        <span className="text-sm text-gray-500">Loading more…</span>
+      ) : (
+        <button onClick={onMore} className="bg-white border px-4 py-2 rounded-lg">
+          Load more
+        </button>
+      )}
+    </div>
+  );
+}
+
 function FeedbackModal({ open, event, studentId, onClose, onSubmitted }) {
   const [rating, setRating] = useState(5);
   const [comment, setComment] = useState("");
@@ -76,7 +110,10 @@ function FeedbackModal({ open, event, studentId, onClose, onSubmitted }) {
 
 export default function Home() {
   const [events, setEvents] = useState([]);
+  const [eventsCursor, setEventsCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const eventsQuery = useRef(null);
 
   const [search, setSearch] = useState("");
   const [typeFilter, setTypeFilter] = useState("");
@@ -89,23 +126,50 @@ export default function Home() {
   const [qrTokens, setQrTokens] = useState({});
 
   const [registrations, setRegistrations] = useState([]);
+  const [regsCursor, setRegsCursor] = useState(null);
   const [loadingRegs, setLoadingRegs] = useState(false);
+  const [loadingMoreRegs, setLoadingMoreRegs] = useState(false);
+  const regsStudent = useRef(null);
 
   // feedback modal
   const [fbOpen, setFbOpen] = useState(false);
   const [fbEvent, setFbEvent] = useState(null);
 
+  // first page for the current filters; a newer query makes older responses stale
   async function loadEvents({ searchText = search, type = typeFilter, feature = featureFilter } = {}) {
+    const query = { collegeId: "c1", type, search: searchText, feature, limit: PAGE_SIZE };
+    eventsQuery.current = query;
     setLoading(true);
     try {
-      const data = await getEvents({ collegeId: "c1", type, search: searchText, feature });
-      setEvents(data || []);
+      const { items, nextCursor } = await getEventsPage(query);
+      if (eventsQuery.current !== query) return;
+      setEvents(items || []);
+      setEventsCursor(nextCursor);
     } catch (err) {
-      console.error("getEvents error", err);
+      if (eventsQuery.current !== query) return;
+      console.error("getEventsPage error", err);
       toast.error("Could not load events");
       setEvents([]);
+      setEventsCursor(null);
     } finally {
-      setLoading(false);
+      if (eventsQuery.current === query) setLoading(false);
+    }
+  }
+
+  async function loadMoreEvents() {
+    if (!eventsCursor || loadingMore) return;
+    const query = eventsQuery.current;
+    setLoadingMore(true);
+    try {
+      const { items, nextCursor } = await getEventsPage({ ...query, cursor: eventsCursor });
+      if (eventsQuery.current !== query) return;
+      setEvents((prev) => prev.concat(items || []));
+      setEventsCursor(nextCursor);
+    } catch (err) {
+      console.error("getEventsPage error", err);
+      toast.error("Could not load more events");
+    } finally {
+      setLoadingMore(false);
     }
   }
 
@@ -121,29 +185,75 @@ export default function Home() {
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [typeFilter, featureFilter]);
 
+  // live seat counts for the listed events, merged in place instead of refetching
+  const listedIds = events.map((e) => e.event_id).join(",");
+  useEffect(() => {
+    if (!listedIds) return undefined;
+    return subscribeLive(listedIds.split(","), (rows) => {
+      const byId = {};
+      rows.forEach((r) => (byId[r.event_id] = r));
+      setEvents((prev) =>
+        prev
+          .filter((e) => !byId[e.event_id]?.deleted)
+          .map((e) =>
+            byId[e.event_id]
+              ? { ...e, registered_count: byId[e.event_id].registered_count, cancelled_flag: byId[e.event_id].cancelled_flag }
+              : e
+          )
+      );
+    });
+  }, [listedIds]);
+
   useEffect(() => {
     loadEvents();
     if (studentId) loadRegistrations(studentId);
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, []);
 
+  function mergeTokens(rows) {
+    const map = {};
+    (rows || []).forEach((r) => {
+      if (r.token) map[r.event_id] = r.token;
+    });
+    setQrTokens((prev) => ({ ...prev, ...map }));
+  }
+
   async function loadRegistrations(id) {
     if (!id) return;
+    regsStudent.current = id;
     setLoadingRegs(true);
     try {
-      const rows = await getRegistrationsForStudent(id);
-      setRegistrations(rows || []);
-      const map = {};
-      (rows || []).forEach((r) => {
-        if (r.token) map[r.event_id] = r.token;
-      });
-      setQrTokens((prev) => ({ ...prev, ...map }));
+      const { items, nextCursor } = await getRegistrationsPage(id, { limit: PAGE_SIZE });
+      if (regsStudent.current !== id) return;
+      setRegistrations(items || []);
+      setRegsCursor(nextCursor);
+      mergeTokens(items);
     } catch (err) {
+      if (regsStudent.current !== id) return;
       console.error("loadRegistrations", err);
       toast.error("Could not load your registrations");
       setRegistrations([]);
+      setRegsCursor(null);
     } finally {
-      setLoadingRegs(false);
+      if (regsStudent.current === id) setLoadingRegs(false);
+    }
+  }
+
+  async function loadMoreRegistrations() {
+    const id = regsStudent.current;
+    if (!id || !regsCursor || loadingMoreRegs) return;
+    setLoadingMoreRegs(true);
+    try {
+      const { items, nextCursor } = await getRegistrationsPage(id, { limit: PAGE_SIZE, cursor: regsCursor });
+      if (regsStudent.current !== id) return;
+      setRegistrations((prev) => prev.concat(items || []));
+      setRegsCursor(nextCursor);
+      mergeTokens(items);
+    } catch (err) {
+      console.error("loadMoreRegistrations", err);
+      toast.error("Could not load more registrations");
+    } finally {
+      setLoadingMoreRegs(false);
     }
   }
 
@@ -169,9 +279,13 @@ export default function Home() {
       const res = await registerForEvent(eventId, studentId);
       if (res.token) setQrTokens((prev) => ({ ...prev, [eventId]: res.token }));
       toast.success("Registered successfully");
-      loadRegistrations(studentId);
-      loadEvents();
+      loadRegistrations(studentId); // seat count arrives over the live stream
     } catch (err) {
+      // registered on a page of registrations not loaded yet: the 409 carries the token
+      if (err?.token) {
+        setQrTokens((prev) => ({ ...prev, [eventId]: err.token }));
+        return;
+      }
       console.error("registerForEvent err", err);
       toast.error(err?.message || "Registration failed");
     }
@@ -181,7 +295,9 @@ export default function Home() {
     localStorage.removeItem("studentId");
     setStudentId("");
     setEditingStudentId(true);
+    regsStudent.current = null;
     setRegistrations([]);
+    setRegsCursor(null);
     setQrTokens({});
   }
 
@@ -335,11 +451,15 @@ export default function Home() {
           ))}
         </div>
       )}
+      {!loading && <LoadMore hasMore={!!eventsCursor} loading={loadingMore} onMore={loadMoreEvents} />}
 
       <MyRegistrations
         studentIdFromApp={studentId && !editingStudentId ? studentId : null}
         registrations={registrations}
         loadingRegs={loadingRegs}
+        hasMore={!!regsCursor}
+        loadingMore={loadingMoreRegs}
+        onMore={loadMoreRegistrations}
         reload={() => {
           if (studentId) loadRegistrations(studentId);
         }}
@@ -360,45 +480,11 @@ export default function Home() {
 }
 
 /* ---------------- MyRegistrations component ---------------- */
-function MyRegistrations({ studentIdFromApp, registrations: registrationsProp = [], loadingRegs = false, reload }) {
-  const [studentId, setStudentId] = useState(studentIdFromApp || localStorage.getItem("studentId") || "");
-  const [regs, setRegs] = useState(registrationsProp || []);
-  const [loading, setLoading] = useState(loadingRegs);
-  const [error, setError] = useState(null);
-
-  useEffect(() => {
-    if (registrationsProp && registrationsProp.length) {
-      setRegs(registrationsProp);
-      setLoading(false);
-    } else if (!studentIdFromApp && studentId) {
-      loadRegs(studentId);
-    } else if (studentIdFromApp) {
-      loadRegs(studentIdFromApp);
-    }
-    // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, [studentIdFromApp]);
-
-  async function loadRegs(id) {
-    if (!id) return;
-    setError(null);
-    setLoading(true);
-    try {
-      const rows = await getRegistrationsForStudent(id);
-      setRegs(rows || []);
-    } catch (err) {
-      console.error("getRegistrationsForStudent", err);
-      setError(err.message || "Failed to load registrations");
-      setRegs([]);
-    } finally {
-      setLoading(false);
-    }
-  }
-
-  async function refresh() {
-    const id = studentIdFromApp || studentId || localStorage.getItem("studentId");
-    if (!id) return toast.error("Student id required");
-    await loadRegs(id);
-    if (typeof reload === "function") reload();
+// Shows the pages Home has loaded; scrolling to the end loads the next one.
+function MyRegistrations({ studentIdFromApp, registrations: regs = [], loadingRegs: loading = false, hasMore, loadingMore, onMore, reload }) {
+  function refresh() {
+    if (!studentIdFromApp) return toast.error("Student id required");
+    reload();
   }
 
   return (
@@ -412,9 +498,7 @@ function MyRegistrations({ studentIdFromApp, registrations: registrationsProp =
         </div>
       </div>
 
-      {!studentIdFromApp && !studentId && <div className="mb-4 text-sm text-gray-600">Enter your student id at the top of the page to view your registrations.</div>}
-
-      {error && <div className="text-red-600 mb-2">{error}</div>}
+      {!studentIdFromApp && <div className="mb-4 text-sm text-gray-600">Enter your student id at the top of the page to view your registrations.</div>}
 
       {loading ? (
         <div>Loading your registrations…</div>
@@ -445,6 +529,7 @@ function MyRegistrations({ studentIdFromApp, registrations: registrationsProp =
               </div>
             </div>
           ))}
+          <LoadMore hasMore={hasMore} loading={loadingMore} onMore={onMore} />
         </div>
       )}
     </section>
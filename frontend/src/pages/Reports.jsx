@@ -5,6 +5,7 @@ import {
   getAttendancePercentage,
   getTopActiveStudents,
   getAvgFeedback,
+  downloadExport,
 } from "../services/api";
 import {
   BarChart,
@@ -86,6 +87,20 @@ export default function Reports() {
       <div className="flex items-center justify-between">
         <h1 className="text-2xl font-bold">Admin Reports</h1>
         <div className="flex gap-2">
+          <select
+            className="bg-white border px-3 py-1 rounded shadow-sm"
+            value=""
+            onChange={(e) => e.target.value && downloadExport(e.target.value, "csv", { college_id: "c1" }).catch((err) => toast.error(err.message))}
+          >
+            <option value="">Export CSV…</option>
+            <option value="registrations">Registrations roster</option>
+            <option value="attendance">Attendance</option>
+            <option value="feedback">Feedback</option>
+            <option value="reports/registrations">Registrations report</option>
+            <option value="reports/attendance_percentage">Attendance report</option>
+            <option value="reports/top-active-students">Student activity</option>
+            <option value="reports/avg_feedback">Feedback report</option>
+          </select>
           <button onClick={loadAll} className="bg-white border px-3 py-1 rounded shadow-sm hover:bg-gray-50">Refresh</button>
         </div>
       </div>
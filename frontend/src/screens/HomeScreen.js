@@ -19,18 +19,21 @@ import Toast from "react-native-toast-message";
 
 // Import your existing API client functions (adapt if needed)
 import {
-  getEvents,
+  getEventsPage,
   registerForEvent,
-  getRegistrationsForStudent,
+  getRegistrationsPage,
   submitFeedback,
 } from "../services/api";
 
 const EVENT_TYPES = ["All", "Workshop", "Seminar", "Drive", "Hackathon"];
+const PAGE_SIZE = 20;
 
 export default function HomeScreen({ navigation }) {
   const [events, setEvents] = useState([]);
-  const [filtered, setFiltered] = useState([]);
+  const [cursor, setCursor] = useState(null);
   const [loading, setLoading] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const query = useRef(null);
 
   const [search, setSearch] = useState("");
   const [selectedType, setSelectedType] = useState("All");
@@ -46,28 +49,47 @@ export default function HomeScreen({ navigation }) {
   const [qrModalVisible, setQrModalVisible] = useState(false);
   const [qrEventData, setQrEventData] = useState(null);
 
-  // fetch events
-  const fetchAll = async (q = "", type = "All") => {
+  // first page of events for a search / type; the server filters, the list pages on scroll
+  const fetchFirstPage = async (q = "", type = "All") => {
+    const params = { search: q.trim(), type: type === "All" ? "" : type, limit: PAGE_SIZE };
+    query.current = params;
     setLoading(true);
     try {
-      // You can pass query params to backend if supported
-      const res = await getEvents({ q, type: type === "All" ? undefined : type });
-      setEvents(res.data || res);
-      setFiltered(res.data || res);
+      const { items, nextCursor } = await getEventsPage(params);
+      if (query.current !== params) return; // a newer search superseded this one
+      setEvents(items || []);
+      setCursor(nextCursor);
     } catch (err) {
-      console.error("getEvents error", err);
+      console.error("getEventsPage error", err);
       Alert.alert("Error", "Could not load events.");
     } finally {
-      setLoading(false);
+      if (query.current === params) setLoading(false);
     }
   };
 
-  // fetch registrations for student
+  const fetchNextPage = async () => {
+    if (!cursor || loading || loadingMore) return;
+    const params = query.current;
+    setLoadingMore(true);
+    try {
+      const { items, nextCursor } = await getEventsPage({ ...params, cursor });
+      if (query.current !== params) return;
+      setEvents((prev) => prev.concat(items || []));
+      setCursor(nextCursor);
+    } catch (err) {
+      console.error("getEventsPage error", err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  // registrations for student: the most recent page marks the listed events
+  // registered; an older one is picked up when registering returns 409
   const fetchRegistrations = async () => {
     try {
       if (!studentId) return;
-      const res = await getRegistrationsForStudent(studentId);
-      setRegistrations(res.data || res);
+      const { items } = await getRegistrationsPage(studentId, { limit: PAGE_SIZE, fields: ["event_id"] });
+      setRegistrations(items || []);
     } catch (err) {
       console.error("getRegistrations error", err);
     }
@@ -80,31 +102,25 @@ export default function HomeScreen({ navigation }) {
       // TODO: load studentId from auth context or async storage
       // setStudentId(await AsyncStorage.getItem('studentId'));
       setStudentId("student_123"); // placeholder
-      await fetchAll();
+      await fetchFirstPage();
       await fetchRegistrations();
     };
     init();
   }, []);
 
-  // Debounced filter — uses lodash.debounce
+  // Debounced search — uses lodash.debounce
   // Keep debounced reference stable
-  const debouncedSearch = useRef(
-    debounce((text, type) => {
-      // Filter locally for responsiveness; optionally call backend
-      const q = text.trim().toLowerCase();
-      const filteredList = events.filter((ev) => {
-        const matchesQ = q === "" || (ev.title || "").toLowerCase().includes(q) || (ev.description || "").toLowerCase().includes(q);
-        const matchesType = type === "All" || ev.type === type;
-        return matchesQ && matchesType;
-      });
-      setFiltered(filteredList);
-    }, 350)
-  ).current;
-
-  // fire when search or type changes
+  const debouncedSearch = useRef(debounce((text, type) => fetchFirstPage(text, type), 350)).current;
+
+  // refetch from the first page when search or type changes
+  const firstRun = useRef(true);
   useEffect(() => {
+    if (firstRun.current) {
+      firstRun.current = false; // init() loads the first page
+      return;
+    }
     debouncedSearch(search, selectedType);
-  }, [search, selectedType, events]);
+  }, [search, selectedType]);
 
   const onRegister = async (eventId) => {
     try {
@@ -113,6 +129,11 @@ export default function HomeScreen({ navigation }) {
       Toast.show({ type: "success", text1: "Registered", text2: "You've registered successfully." });
       await fetchRegistrations();
     } catch (err) {
+      if (err.status === 409) {
+        // registered before the page of registrations we loaded
+        setRegistrations((prev) => prev.concat([{ event_id: eventId }]));
+        return;
+      }
       console.error(err);
       Toast.show({ type: "error", text1: "Registration failed" });
     } finally {
@@ -148,7 +169,7 @@ export default function HomeScreen({ navigation }) {
   };
 
   const renderEvent = ({ item }) => {
-    const registered = registrations.some((r) => r.eventId === item.id);
+    const registered = registrations.some((r) => r.event_id === item.id);
     return (
       <View style={styles.card}>
         <Text style={styles.title}>{item.title}</Text>
@@ -176,7 +197,7 @@ export default function HomeScreen({ navigation }) {
     );
   };
 
-  const featured = filtered.filter((e) => e.featured).slice(0, 3);
+  const featured = events.filter((e) => e.featured).slice(0, 3);
 
   return (
     <SafeAreaView style={styles.container}>
@@ -222,11 +243,14 @@ export default function HomeScreen({ navigation }) {
         <ActivityIndicator />
       ) : (
         <FlatList
-          data={filtered}
+          data={events}
           keyExtractor={(i) => i.id.toString()}
           renderItem={renderEvent}
           ItemSeparatorComponent={() => <View style={{ height: 10 }} />}
           ListEmptyComponent={<Text style={styles.empty}>No events found</Text>}
+          onEndReached={fetchNextPage}
+          onEndReachedThreshold={0.5}
+          ListFooterComponent={loadingMore ? <ActivityIndicator style={{ marginVertical: 12 }} /> : null}
         />
       )}
 
@@ -72,6 +72,22 @@ export async function getEvents({ collegeId = "c1", type = "", search = "", feat
   return res.json();
 }
 
+// Paged variant: keyset pagination + field projection. Pass the returned
+// nextCursor back as `cursor` to fetch the next page (null on the last page).
+export async function getEventsPage({ collegeId = "c1", type = "", search = "", feature = "", limit = 50, cursor = "", fields = [] } = {}) {
+  const params = new URLSearchParams();
+  if (collegeId) params.set("college_id", collegeId);
+  if (type) params.set("type", type);
+  if (search) params.set("search", search);
+  if (feature) params.set("feature", feature);
+  params.set("limit", String(limit));
+  if (cursor) params.set("cursor", cursor);
+  if (fields.length) params.set("fields", fields.join(","));
+  const res = await fetch(`${API}/events?${params.toString()}`, { credentials: "include", headers: authHeaders() });
+  if (!res.ok) throw new Error("Failed to fetch events");
+  return { items: await res.json(), nextCursor: res.headers.get("X-Next-Cursor") };
+}
+
 export async function createEvent(payload) {
   const res = await fetch(`${API}/events`, {
     method: "POST",
@@ -116,7 +132,12 @@ export async function registerForEvent(eventId, studentId) {
     body: JSON.stringify({ student_id: studentId }),
   });
   const j = await safeJson(res);
-  if (!res.ok) throw new Error(j.error || "Registration failed");
+  if (!res.ok) {
+    const err = new Error(j.error || "Registration failed");
+    err.status = res.status;
+    err.token = j.token; // 409 "already registered" carries the existing token
+    throw err;
+  }
   return j;
 }
 
@@ -134,6 +155,23 @@ export async function getRegistrationsForStudent(studentId) {
   return res.json();
 }
 
+export async function getRegistrationsPage(studentId, { limit = 50, cursor = "", fields = [] } = {}) {
+  if (!studentId) throw new Error("studentId required");
+  const params = new URLSearchParams({ student_id: studentId, limit: String(limit) });
+  if (cursor) params.set("cursor", cursor);
+  if (fields.length) params.set("fields", fields.join(","));
+  const res = await fetch(`${API}/registrations?${params.toString()}`, {
+    method: "GET",
+    credentials: "include",
+    headers: authHeaders(),
+  });
+  if (!res.ok) {
+    let text = await res.text();
+    throw new Error(text || "Failed to fetch registrations");
+  }
+  return { items: await res.json(), nextCursor: res.headers.get("X-Next-Cursor") };
+}
+
 export async function submitFeedback(eventId, studentId, rating, comment) {
   if (!studentId) throw new Error("studentId required");
   const res = await fetch(`${API}/feedback/${encodeURIComponent(eventId)}`, {
@@ -173,6 +211,38 @@ export async function markAttendanceByToken(token) {
   return j;
 }
 
+// Offline scan queue upload: each scan carries a client-generated `key`, so
+// replays after a dropped response are answered from the server log. A
+// rejected upload throws an Error with the HTTP `status` (none when the
+// request never got an answer).
+export async function syncScans({ deviceId, scans, eventId = "", since = 0 }) {
+  const res = await fetch(`${API}/attendance/sync`, {
+    method: "POST",
+    credentials: "include",
+    headers: authHeaders(),
+    body: JSON.stringify({ device_id: deviceId, scans, event_id: eventId || undefined, since }),
+  });
+  const j = await safeJson(res);
+  if (!res.ok) {
+    const err = new Error(j.error || "Scan sync failed");
+    err.status = res.status;
+    throw err;
+  }
+  return j;
+}
+
+// ---------- LIVE COUNTS ----------
+// Server-Sent Events stream of seat / check-in counts. onUpdate(rows, isSnapshot)
+// gets {event_id, registered_count, present_count, cancelled_flag} per event
+// (or {event_id, deleted: true}). EventSource reconnects on its own. Returns close().
+export function subscribeLive(eventIds, onUpdate) {
+  const q = eventIds && eventIds.length ? `?event_id=${encodeURIComponent(eventIds.join(","))}` : "";
+  const es = new EventSource(`${API}/live/events${q}`, { withCredentials: true });
+  es.addEventListener("snapshot", (e) => onUpdate(JSON.parse(e.data).events, true));
+  es.addEventListener("delta", (e) => onUpdate(JSON.parse(e.data).events, false));
+  return () => es.close();
+}
+
 // ---------- REPORTS (ADMIN) ----------
 // exported names that your pages expect:
 export async function getRegistrations(collegeId = "c1") {
@@ -202,3 +272,21 @@ export async function getAvgFeedback(collegeId = "c1") {
   if (!res.ok) throw new Error("Failed to fetch feedback");
   return res.json();
 }
+
+// ---------- EXPORTS (ADMIN) ----------
+// dataset: "registrations" | "attendance" | "feedback" | "reports/<name>"
+// The server streams the file; we save it from a blob so the auth header is sent.
+export async function downloadExport(dataset, format = "csv", params = {}) {
+  const q = new URLSearchParams(Object.entries(params).filter(([, v]) => v)).toString();
+  const res = await fetch(`${API}/export/${dataset}.${format}${q ? `?${q}` : ""}`, {
+    credentials: "include",
+    headers: authHeaders(),
+  });
+  if (!res.ok) throw new Error((await safeJson(res)).error || "Export failed");
+  const url = URL.createObjectURL(await res.blob());
+  const a = document.createElement("a");
+  a.href = url;
+  a.download = `${dataset.replace("/", "-")}.${format}`;
+  a.click();
+  URL.revokeObjectURL(url);
+}
@@ -0,0 +1,204 @@
+// frontend/src/services/scanQueue.js
+// Offline-first queue for gate scans. Scans are written to IndexedDB first
+// (with the client's scan time and an idempotency key) and flushed to
+// /attendance/sync in batches, so a slow or dropped network never blocks the
+// scanner or loses a check-in. Replayed batches are de-duplicated server-side.
+// Uploads are retried only when the failure is temporary (no answer, 5xx,
+// 408, 429, or a login that expired); a batch the server refuses outright is
+// split until the refused scan is alone, and that scan moves to the
+// "rejected" store instead of blocking the scans queued behind it.
+import { syncScans } from "./api";
+
+const DB_NAME = "campus-scan-queue";
+const STORE = "scans";
+const REJECTED = "rejected";
+const BATCH_SIZE = 200;
+const FLUSH_INTERVAL_MS = 5000;
+
+let dbPromise = null;
+function db() {
+  if (!dbPromise) {
+    dbPromise = new Promise((resolve, reject) => {
+      const req = indexedDB.open(DB_NAME, 2);
+      req.onupgradeneeded = () => {
+        const conn = req.result;
+        if (!conn.objectStoreNames.contains(STORE)) {
+          conn.createObjectStore(STORE, { keyPath: "key" }).createIndex("queued_at", "queued_at");
+        }
+        if (!conn.objectStoreNames.contains(REJECTED)) conn.createObjectStore(REJECTED, { keyPath: "key" });
+      };
+      req.onsuccess = () => resolve(req.result);
+      req.onerror = () => reject(req.error);
+    });
+  }
+  return dbPromise;
+}
+
+async function withStore(mode, fn, name = STORE) {
+  const conn = await db();
+  return new Promise((resolve, reject) => {
+    const tx = conn.transaction(name, mode);
+    const result = fn(tx.objectStore(name));
+    tx.oncomplete = () => resolve(result && "result" in result ? result.result : result);
+    tx.onerror = () => reject(tx.error);
+  });
+}
+
+function newKey() {
+  if (crypto.randomUUID) return crypto.randomUUID();
+  return `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+}
+
+export function deviceId() {
+  let id = localStorage.getItem("scanDeviceId");
+  if (!id) {
+    id = newKey();
+    localStorage.setItem("scanDeviceId", id);
+  }
+  return id;
+}
+
+const listeners = new Set();
+async function notify() {
+  const n = await pendingCount().catch(() => 0);
+  const rejected = await rejectedCount().catch(() => 0);
+  listeners.forEach((fn) => fn(n, rejected));
+}
+
+// subscribe(fn) -> unsubscribe; fn receives the number of queued scans and
+// the number of scans the server rejected
+export function subscribe(fn) {
+  listeners.add(fn);
+  notify();
+  return () => listeners.delete(fn);
+}
+
+export function pendingCount() {
+  return withStore("readonly", (store) => store.count());
+}
+
+export function rejectedCount() {
+  return withStore("readonly", (store) => store.count(), REJECTED);
+}
+
+// scans the server rejected, each with the HTTP `status` and `error` it gave
+export function rejectedScans() {
+  return withStore("readonly", (store) => store.getAll(), REJECTED);
+}
+
+// Put every rejected scan back at its old place in the queue (e.g. after the
+// server or the scanned data was fixed); they go out on the next flush.
+export async function requeueRejected() {
+  const conn = await db();
+  await new Promise((resolve, reject) => {
+    const tx = conn.transaction([STORE, REJECTED], "readwrite");
+    const req = tx.objectStore(REJECTED).getAll();
+    req.onsuccess = () => {
+      req.result.forEach(({ status, error, rejected_at, ...scan }) => tx.objectStore(STORE).put(scan)); // eslint-disable-line no-unused-vars
+      tx.objectStore(REJECTED).clear();
+    };
+    tx.oncomplete = resolve;
+    tx.onerror = () => reject(tx.error);
+  });
+  notify();
+}
+
+// enqueueScan({ token }) or enqueueScan({ eventId, studentId })
+export async function enqueueScan(scan) {
+  const item = { key: newKey(), scanned_at: new Date().toISOString(), queued_at: Date.now() };
+  if (scan.token) item.token = scan.token;
+  else {
+    item.event_id = scan.eventId;
+    item.student_id = scan.studentId;
+  }
+  await withStore("readwrite", (store) => store.put(item));
+  notify();
+  return item;
+}
+
+function oldest(limit) {
+  return withStore("readonly", (store) => store.index("queued_at").getAll(null, limit));
+}
+
+function remove(keys) {
+  return withStore("readwrite", (store) => keys.forEach((k) => store.delete(k)));
+}
+
+// move one scan from the queue to the rejected store
+async function setAside(scan, err) {
+  const conn = await db();
+  return new Promise((resolve, reject) => {
+    const tx = conn.transaction([STORE, REJECTED], "readwrite");
+    tx.objectStore(REJECTED).put({ ...scan, status: err.status, error: err.message, rejected_at: Date.now() });
+    tx.objectStore(STORE).delete(scan.key);
+    tx.oncomplete = resolve;
+    tx.onerror = () => reject(tx.error);
+  });
+}
+
+// Worth sending again unchanged: no answer at all, a server-side failure,
+// rate limiting, or an expired login (every batch fails until the operator
+// signs in again, so setting them aside would only empty the queue).
+function retryable(err) {
+  return err.status === undefined || err.status >= 500 || [401, 403, 408, 429].includes(err.status);
+}
+
+async function upload(batch, results) {
+  const scans = batch.map(({ queued_at, ...scan }) => scan); // eslint-disable-line no-unused-vars
+  try {
+    const res = await syncScans({ deviceId: deviceId(), scans });
+    await remove(batch.map((s) => s.key));
+    results.push(...(res.results || []));
+  } catch (err) {
+    if (retryable(err)) throw err;
+    if (batch.length > 1) {
+      const half = Math.ceil(batch.length / 2);
+      await upload(batch.slice(0, half), results);
+      await upload(batch.slice(half), results);
+      return;
+    }
+    await setAside(batch[0], err);
+    results.push({ key: batch[0].key, status: "rejected", error: err.message });
+  }
+}
+
+let flushing = null;
+
+// Upload queued scans batch by batch. Resolves with the server's per-scan
+// results (plus {status: "rejected"} for scans set aside); on a temporary
+// failure the rest stay queued and are retried next flush.
+export function flushQueue() {
+  if (flushing) return flushing;
+  flushing = (async () => {
+    const results = [];
+    while (navigator.onLine !== false) {
+      const batch = await oldest(BATCH_SIZE);
+      if (!batch.length) break;
+      try {
+        await upload(batch, results);
+      } finally {
+        notify();
+      }
+    }
+    return results;
+  })().finally(() => {
+    flushing = null;
+  });
+  return flushing;
+}
+
+// Flush on an interval and whenever the browser comes back online.
+// onResults(results) is called after every flush that uploaded something.
+export function startAutoFlush(onResults = () => {}, onError = () => {}) {
+  const run = () =>
+    flushQueue()
+      .then((results) => results.length && onResults(results))
+      .catch(onError);
+  const timer = setInterval(run, FLUSH_INTERVAL_MS);
+  window.addEventListener("online", run);
+  run();
+  return () => {
+    clearInterval(timer);
+    window.removeEventListener("online", run);
+  };
+}